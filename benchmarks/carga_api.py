@@ -0,0 +1,152 @@
+"""
+Teste de carga da API HTTP do cadastro (cadastro/api.py).
+
+Sobe a API em um processo separado com um cadastro pré-carregado e dispara
+requisições de vários clientes asyncio com keep-alive e pipelining,
+reportando vazão (req/s) e latências p50/p99.
+
+Uso:
+    python -m benchmarks.carga_api [--pessoas 10000] [--conexoes 16]
+                                   [--pipeline 8] [--segundos 5]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import random
+import time
+from typing import List, Tuple
+
+from benchmarks.gerador import GeradorPessoas
+
+
+def subir_servidor(pessoas: int, porta: int, pronto) -> None:
+    """Processo filho: carrega o cadastro e serve a API"""
+    from models.pessoa import CadastroPessoas
+    from cadastro.api import ServidorCadastro
+
+    cadastro = CadastroPessoas()
+    for pessoa in GeradorPessoas(semente=42).pessoas(pessoas):
+        cadastro.adicionar(pessoa)
+
+    servidor = ServidorCadastro(cadastro, '127.0.0.1', porta)
+
+    async def executar() -> None:
+        await servidor.iniciar()
+        pronto.send(servidor.porta)
+        await servidor.servir_para_sempre()
+
+    asyncio.run(executar())
+
+
+def montar_requisicoes(cpfs: List[str], quantidade: int, rng: random.Random) -> List[bytes]:
+    """Gera uma mistura de requisições (maioria leituras pontuais)"""
+    requisicoes = []
+    for _ in range(quantidade):
+        sorteio = rng.random()
+        if sorteio < 0.80:
+            alvo = f'/pessoas/{rng.choice(cpfs)}'
+        elif sorteio < 0.90:
+            alvo = f"/pessoas?uf={rng.choice(['ES', 'RJ', 'SP'])}&sexo=NB"
+        else:
+            alvo = '/estatisticas'
+        requisicoes.append(f'GET {alvo} HTTP/1.1\r\nHost: localhost\r\n\r\n'.encode())
+    return requisicoes
+
+
+async def ler_resposta(reader: asyncio.StreamReader) -> int:
+    """Lê uma resposta completa e retorna o status"""
+    cabecalho = await reader.readuntil(b'\r\n\r\n')
+    linhas = cabecalho.decode('latin-1').split('\r\n')
+    status = int(linhas[0].split(' ')[1])
+    tamanho = 0
+    for linha in linhas[1:]:
+        if linha.lower().startswith('content-length:'):
+            tamanho = int(linha.split(':', 1)[1])
+    await reader.readexactly(tamanho)
+    return status
+
+
+async def cliente(porta: int, requisicoes: List[bytes], pipeline: int, fim: float,
+                  latencias: List[float], erros: List[int]) -> None:
+    """Um cliente keep-alive que envia lotes em pipeline até o tempo acabar"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', porta)
+    i = 0
+    try:
+        while time.perf_counter() < fim:
+            lote = [requisicoes[(i + k) % len(requisicoes)] for k in range(pipeline)]
+            i += pipeline
+            envio = time.perf_counter()
+            writer.write(b''.join(lote))
+            await writer.drain()
+            for _ in lote:
+                status = await ler_resposta(reader)
+                latencias.append(time.perf_counter() - envio)
+                if status >= 400 and status != 404:
+                    erros.append(status)
+    finally:
+        writer.close()
+
+
+def percentil(valores: List[float], q: float) -> float:
+    """Percentil nearest-rank de uma lista já ordenada"""
+    if not valores:
+        return 0.0
+    indice = max(0, min(len(valores) - 1, int(round(q * len(valores))) - 1))
+    return valores[indice]
+
+
+async def disparar(porta: int, cpfs: List[str], conexoes: int, pipeline: int,
+                   segundos: float) -> Tuple[List[float], List[int], float]:
+    """Executa a carga com todos os clientes em paralelo"""
+    rng = random.Random(7)
+    latencias: List[float] = []
+    erros: List[int] = []
+    inicio = time.perf_counter()
+    fim = inicio + segundos
+    await asyncio.gather(*(
+        cliente(porta, montar_requisicoes(cpfs, 1000, rng), pipeline, fim, latencias, erros)
+        for _ in range(conexoes)
+    ))
+    return latencias, erros, time.perf_counter() - inicio
+
+
+def main() -> None:
+    """Função Principal do teste de carga"""
+    parser = argparse.ArgumentParser(description='Teste de carga da API do cadastro')
+    parser.add_argument('--pessoas', type=int, default=10_000)
+    parser.add_argument('--conexoes', type=int, default=16)
+    parser.add_argument('--pipeline', type=int, default=8, help='requisições por lote')
+    parser.add_argument('--segundos', type=float, default=5.0)
+    args = parser.parse_args()
+
+    recebe, envia = multiprocessing.Pipe(duplex=False)
+    processo = multiprocessing.Process(target=subir_servidor, args=(args.pessoas, 0, envia), daemon=True)
+    processo.start()
+    porta = recebe.recv()
+
+    #os mesmos CPFs que o servidor gerou (mesma semente)
+    cpfs = [registro['cpf'] for registro in GeradorPessoas(semente=42).registros(args.pessoas)]
+
+    print('TESTE DE CARGA - API DO CADASTRO')
+    print('-' * 60)
+    print(f'Pessoas: {args.pessoas} | Conexões: {args.conexoes} | '
+          f'Pipeline: {args.pipeline} | Duração: {args.segundos}s')
+    print('-' * 60)
+
+    try:
+        latencias, erros, duracao = asyncio.run(
+            disparar(porta, cpfs, args.conexoes, args.pipeline, args.segundos)
+        )
+    finally:
+        processo.terminate()
+
+    latencias.sort()
+    print(f'Requisições: {len(latencias)} ({len(erros)} erro(s))')
+    print(f'Vazão: {len(latencias) / duracao:,.0f} req/s')
+    print(f'Latência p50: {percentil(latencias, 0.50) * 1000:.2f} ms')
+    print(f'Latência p99: {percentil(latencias, 0.99) * 1000:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Escalabilidade do CadastroParticionado com o número de partições (processos).
+
+Mede a vazão de buscas por nome (scatter-gather) e de estatísticas para
+1, 2, 4, ... partições, comparando com um CadastroPessoas em um único processo.
+
+Uso:
+    python -m benchmarks.escala_particoes [--pessoas 200000] [--buscas 50]
+                                          [--particoes 1 2 4]
+"""
+
+import argparse
+import time
+from typing import Callable, List
+
+from benchmarks.gerador import GeradorPessoas
+from models.pessoa import Pessoa, CadastroPessoas
+from models.particionado import CadastroParticionado
+
+#termos raros: o custo dominante é a varredura, não a cópia dos resultados
+TERMOS = ['ariel cos', 'ana sil', 'xyz', 'robin per', 'daniel li', 'qwe']
+
+
+def medir(funcao: Callable[[], object], repeticoes: int) -> float:
+    """Operações por segundo de `funcao`"""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return repeticoes / (time.perf_counter() - inicio)
+
+
+def main() -> None:
+    """Função Principal do benchmark de partições"""
+    parser = argparse.ArgumentParser(description='Escalabilidade do cadastro particionado')
+    parser.add_argument('--pessoas', type=int, default=200_000)
+    parser.add_argument('--buscas', type=int, default=50)
+    parser.add_argument('--particoes', type=int, nargs='+', default=[1, 2, 4])
+    args = parser.parse_args()
+
+    pessoas: List[Pessoa] = list(GeradorPessoas(semente=42).pessoas(args.pessoas))
+    termos = iter(TERMOS * args.buscas)
+
+    print('ESCALABILIDADE DO CADASTRO PARTICIONADO')
+    print('-' * 60)
+    print(f'Pessoas: {args.pessoas} | Buscas por rodada: {args.buscas}')
+    print('-' * 60)
+
+    local = CadastroPessoas()
+    for pessoa in pessoas:
+        local.adicionar(pessoa)
+    base = medir(lambda: local.buscar_por_nome(next(termos)), args.buscas)
+    print(f'Processo único : {base:8.1f} buscas/s | '
+          f'{medir(local.estatisticas, args.buscas):8.1f} estatísticas/s')
+
+    for particoes in args.particoes:
+        with CadastroParticionado(particoes) as cadastro:
+            cadastro.adicionar_lote(pessoas)
+            vazao = medir(lambda: cadastro.buscar_por_nome(next(termos)), args.buscas)
+            estat = medir(cadastro.estatisticas, args.buscas)
+        print(f'{particoes:>2} partição(ões): {vazao:8.1f} buscas/s | '
+              f'{estat:8.1f} estatísticas/s | speedup buscas {vazao / base:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,343 @@
+"""
+Gerador determinístico de pessoas sintéticas para testes de carga e benchmarks.
+
+Gera em lotes, coluna por coluna (`random.choices` com pesos acumulados),
+com distribuições aproximadas da população brasileira para nomes,
+sexo/gênero, idade, DDD e domínio de email. Os dígitos verificadores dos
+CPFs saem de tabelas pré-calculadas por bloco de 3 dígitos, sem laço por
+dígito. Com a mesma semente a sequência gerada é sempre a mesma.
+
+Desempenho: em Python puro (o projeto não depende de numpy, então não há
+cálculo vetorizado dos dígitos verificadores) o gerador produz na ordem de
+100 mil registros/s e 60 mil objetos Pessoa/s, uma ordem de grandeza abaixo
+da meta de milhões de registros por segundo. A montagem dos dicionários e
+das strings, registro a registro, é o que limita.
+
+Uso:
+    python -m benchmarks.gerador [-n 1000000] [--semente 42]
+                                 [--formato csv|jsonl] [--saida pessoas.csv]
+
+A saída segue os formatos aceitos por `python main.py import`.
+"""
+
+import argparse
+import json
+import sys
+import time
+import unicodedata
+from datetime import datetime
+from random import Random
+from typing import Any, Dict, Iterator, List, Sequence, TextIO, Tuple
+
+from models.pessoa import Pessoa
+
+#Registros gerados por lote (fixo, para a sequência não depender do consumidor)
+LOTE = 10_000
+
+#Nomes mais frequentes no Censo 2010 (IBGE), com pesos aproximados
+NOMES_FEMININOS = (
+    ('Maria', 117), ('Ana', 32), ('Francisca', 7), ('Antônia', 6), ('Adriana', 6),
+    ('Juliana', 6), ('Márcia', 5), ('Fernanda', 5), ('Patrícia', 5), ('Aline', 5),
+    ('Sandra', 4), ('Camila', 4), ('Amanda', 4), ('Bruna', 4), ('Jéssica', 4),
+    ('Letícia', 4), ('Júlia', 4), ('Luciana', 4), ('Vanessa', 4), ('Mariana', 4),
+)
+NOMES_MASCULINOS = (
+    ('José', 57), ('João', 30), ('Antônio', 24), ('Francisco', 15), ('Carlos', 15),
+    ('Paulo', 14), ('Pedro', 13), ('Lucas', 12), ('Luiz', 11), ('Marcos', 11),
+    ('Luís', 9), ('Gabriel', 9), ('Rafael', 8), ('Daniel', 7), ('Marcelo', 7),
+    ('Bruno', 7), ('Eduardo', 7), ('Felipe', 6), ('Raimundo', 6), ('Rodrigo', 6),
+)
+NOMES_NEUTROS = (
+    ('Ariel', 3), ('Alex', 3), ('Cris', 2), ('Dani', 2), ('Jordan', 1), ('Robin', 1),
+)
+SOBRENOMES = (
+    ('Silva', 100), ('Santos', 70), ('Oliveira', 45), ('Souza', 44), ('Rodrigues', 32),
+    ('Ferreira', 31), ('Alves', 30), ('Pereira', 29), ('Lima', 28), ('Gomes', 26),
+    ('Costa', 25), ('Ribeiro', 24), ('Martins', 22), ('Carvalho', 21), ('Almeida', 20),
+    ('Lopes', 18), ('Soares', 17), ('Fernandes', 17), ('Vieira', 16), ('Barbosa', 15),
+)
+
+#Código de sexo/gênero e entradas como digitadas no cadastro (com pesos)
+SEXOS = (
+    ('F', 505, ('F', 'Feminino', 'Mulher')),
+    ('M', 480, ('M', 'Masculino', 'Homem')),
+    ('NB', 6, ('NB', 'Não Binário')),
+    ('O', 3, ('O', 'Outro')),
+    ('', 6, ('',)),
+)
+
+#Faixas de idade (mínima, máxima, peso) aproximando a pirâmide etária
+FAIXAS_IDADE = ((0, 17, 24), (18, 29, 19), (30, 44, 23), (45, 59, 18), (60, 79, 13), (80, 100, 3))
+
+#DDDs com pesos aproximados pela população atendida
+DDDS = (
+    ('11', 210), ('21', 110), ('31', 60), ('61', 45), ('71', 40), ('81', 40), ('41', 35),
+    ('51', 35), ('85', 35), ('27', 25), ('62', 25), ('91', 22), ('92', 22), ('48', 20),
+    ('19', 30), ('13', 18), ('83', 15), ('84', 15), ('98', 15), ('65', 12), ('67', 12),
+    ('82', 12), ('79', 10), ('86', 10), ('95', 3), ('96', 4), ('68', 4), ('69', 8),
+)
+DOMINIOS_EMAIL = (
+    ('gmail.com', 55), ('hotmail.com', 20), ('outlook.com', 8), ('yahoo.com.br', 7),
+    ('uol.com.br', 4), ('bol.com.br', 3), ('icloud.com', 3),
+)
+PROBABILIDADE_EMAIL = 0.7
+PROBABILIDADE_TELEFONE = 0.8
+PROBABILIDADE_CELULAR = 0.85
+
+
+def _acumular(pares: Sequence[Tuple[Any, float]]) -> Tuple[List[Any], List[float]]:
+    """Valores e pesos acumulados, para `Random.choices(cum_weights=...)`"""
+    valores, acumulados, total = [], [], 0
+    for valor, peso in pares:
+        total += peso
+        valores.append(valor)
+        acumulados.append(total)
+    return valores, acumulados
+
+
+def _sortear(rng: Random, tabela: Tuple[List[Any], List[float]], k: int) -> List[Any]:
+    """`k` valores de uma tabela de `_acumular`"""
+    return rng.choices(tabela[0], cum_weights=tabela[1], k=k)
+
+
+def _sem_acento(texto: str) -> str:
+    return unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode('ascii').lower()
+
+
+def _tabelas_digitos() -> Tuple[List[List[int]], List[List[int]]]:
+    """
+    Somas ponderadas do CPF por bloco de 3 dígitos, já reduzidas módulo 11
+
+    Returns:
+        tuple: (pesos do 1º dígito, pesos do 2º dígito); cada um com uma
+        tabela de 1000 entradas por bloco
+
+    """
+    primeiro, segundo = [], []
+    for bloco in range(3):
+        tabela1, tabela2 = [], []
+        for valor in range(1000):
+            digitos = (valor // 100, valor // 10 % 10, valor % 10)
+            posicao = bloco * 3
+            tabela1.append(sum(d * (10 - posicao - i) for i, d in enumerate(digitos)) % 11)
+            tabela2.append(sum(d * (11 - posicao - i) for i, d in enumerate(digitos)) % 11)
+        primeiro.append(tabela1)
+        segundo.append(tabela2)
+    return primeiro, segundo
+
+
+_PESOS1, _PESOS2 = _tabelas_digitos()
+#Resto da soma (0 a 30 após somar três blocos e o 1º dígito) -> dígito verificador
+_DIGITO = [0 if resto % 11 < 2 else 11 - resto % 11 for resto in range(64)]
+
+
+def cpfs_de_bases(bases: Sequence[int]) -> List[str]:
+    """
+    Completa bases de 9 dígitos com os dígitos verificadores
+
+    Args:
+        bases: Inteiros de 0 a 999.999.999 (os 9 primeiros dígitos)
+
+    Returns:
+        list: CPFs com 11 dígitos, sem formatação
+
+    """
+    a1, b1, c1 = _PESOS1
+    a2, b2, c2 = _PESOS2
+    digito = _DIGITO
+    cpfs = []
+    for base in bases:
+        a, b, c = base // 1_000_000, base // 1000 % 1000, base % 1000
+        d1 = digito[a1[a] + b1[b] + c1[c]]
+        d2 = digito[(a2[a] + b2[b] + c2[c] + 2 * d1) % 11]
+        cpfs.append(f'{base:09d}{d1}{d2}')
+    return cpfs
+
+
+class GeradorPessoas:
+    """
+    Gerador reprodutível de registros de pessoas.
+
+    Uso:
+        gerador = GeradorPessoas(semente=42)
+        for registro in gerador.registros(1_000_000):
+            ...
+
+    """
+
+    def __init__(self, semente: int = 42, cpfs_unicos: bool = True):
+        """
+        Args:
+            semente: Semente do gerador aleatório
+            cpfs_unicos: Se True, nunca repete um CPF (guarda as bases já usadas)
+
+        """
+        self.rng = Random(semente)
+        self.cpfs_unicos = cpfs_unicos
+        self._bases_usadas = set()
+        ano_atual = datetime.now().year
+
+        #(código, entrada digitada), com o peso do código dividido entre as entradas
+        self._sexos = _acumular([((codigo, entrada), peso / len(entradas))
+                                 for codigo, peso, entradas in SEXOS for entrada in entradas])
+        self._nomes = {
+            'F': _acumular(NOMES_FEMININOS),
+            'M': _acumular(NOMES_MASCULINOS),
+            'NB': _acumular(NOMES_NEUTROS + NOMES_FEMININOS[:5] + NOMES_MASCULINOS[:5]),
+        }
+        self._sobrenomes = _acumular(SOBRENOMES)
+        #ano de nascimento, com o peso da faixa dividido entre as idades dela
+        self._anos = _acumular([(ano_atual - idade, peso / (maximo - minimo + 1))
+                                for minimo, maximo, peso in FAIXAS_IDADE
+                                for idade in range(minimo, maximo + 1)])
+        self._ddds = _acumular(DDDS)
+        self._dominios = _acumular(DOMINIOS_EMAIL)
+        self._ascii = {nome: _sem_acento(nome)
+                       for nome, _ in NOMES_FEMININOS + NOMES_MASCULINOS + NOMES_NEUTROS + SOBRENOMES}
+
+    def _bases_cpf(self, quantidade: int) -> List[int]:
+        """Bases de 9 dígitos, sem as de dígitos todos iguais (e sem repetição, se pedido)"""
+        bases = []
+        usadas = self._bases_usadas
+        sortear = self.rng.random
+        while len(bases) < quantidade:
+            for base in [int(sortear() * 999_999_999) + 1 for _ in range(quantidade - len(bases))]:
+                if base % 111_111_111 == 0:
+                    continue
+                if self.cpfs_unicos:
+                    if base in usadas:
+                        continue
+                    usadas.add(base)
+                bases.append(base)
+        return bases
+
+    def _lote(self) -> List[Dict[str, Any]]:
+        """Gera um lote de LOTE registros, uma coluna de cada vez"""
+        rng, k = self.rng, LOTE
+        sortear = rng.random
+
+        sexos = _sortear(rng, self._sexos, k)
+        nomes = {tabela: _sortear(rng, pesos, k) for tabela, pesos in self._nomes.items()}
+        cpfs = cpfs_de_bases(self._bases_cpf(k))
+        sobrenomes = _sortear(rng, self._sobrenomes, k)
+        segundos = _sortear(rng, self._sobrenomes, k)
+        anos = _sortear(rng, self._anos, k)
+        ddds = _sortear(rng, self._ddds, k)
+        dominios = _sortear(rng, self._dominios, k)
+        sorteios_nome = [sortear() for _ in range(k)]
+        sorteios_email = [sortear() for _ in range(k)]
+        sorteios_telefone = [sortear() for _ in range(k)]
+        numeros = [sortear() for _ in range(k)]
+        ascii_ = self._ascii
+
+        registros = []
+        for i in range(k):
+            codigo, entrada = sexos[i]
+            nome = nomes[codigo if codigo in nomes else 'NB'][i]
+            sobrenome = sobrenomes[i]
+            #metade das pessoas com dois sobrenomes
+            if sorteios_nome[i] < 0.5:
+                nome_completo = f'{nome} {segundos[i]} {sobrenome}'
+            else:
+                nome_completo = f'{nome} {sobrenome}'
+
+            #um sorteio de 12 dígitos dá os números do email e do telefone
+            numero = int(numeros[i] * 10**12)
+            email = None
+            if sorteios_email[i] < PROBABILIDADE_EMAIL:
+                email = f'{ascii_[nome]}.{ascii_[sobrenome]}{numero % 1000}@{dominios[i]}'
+            telefone = None
+            if sorteios_telefone[i] < PROBABILIDADE_TELEFONE:
+                sufixo = numero // 1000 % 10000
+                if numero // 10**10 < PROBABILIDADE_CELULAR * 100:
+                    telefone = f'({ddds[i]}) 9{6000 + numero // 10**7 % 4000}-{sufixo:04d}'
+                else:
+                    telefone = f'({ddds[i]}) {2000 + numero // 10**7 % 4000}-{sufixo:04d}'
+
+            registros.append({
+                'nome': nome_completo,
+                'cpf': cpfs[i],
+                'ano_nascimento': anos[i],
+                'sexo': entrada,
+                'email': email,
+                'telefone': telefone,
+            })
+        return registros
+
+    def registros(self, quantidade: int) -> Iterator[Dict[str, Any]]:
+        """
+        Registros como dicionários (campos de `cadastro.cli.CAMPOS`)
+
+        Args:
+            quantidade: Número de registros
+
+        """
+        #lotes sempre completos: os primeiros N registros não dependem da quantidade pedida
+        while quantidade > 0:
+            lote = self._lote()
+            yield from lote[:quantidade]
+            quantidade -= len(lote)
+
+    def pessoas(self, quantidade: int) -> Iterator[Pessoa]:
+        """Mesmos registros de `registros`, como objetos Pessoa"""
+        for registro in self.registros(quantidade):
+            yield Pessoa(**registro)
+
+
+def escrever(registros: Iterator[Dict[str, Any]], saida: TextIO, formato: str = 'csv') -> int:
+    """
+    Escreve registros em um formato de importação
+
+    Args:
+        registros: Registros de `GeradorPessoas.registros`
+        saida: Arquivo de texto aberto para escrita
+        formato: 'csv' (com cabeçalho) ou 'jsonl'
+
+    Returns:
+        int: Número de registros escritos
+
+    Raises:
+        ValueError: Se o formato não for suportado
+
+    """
+    from cadastro.cli import CAMPOS
+
+    total = 0
+    if formato == 'csv':
+        import csv
+        escritor = csv.DictWriter(saida, fieldnames=CAMPOS, lineterminator='\n')
+        escritor.writeheader()
+        for registro in registros:
+            escritor.writerow(registro)
+            total += 1
+    elif formato == 'jsonl':
+        for registro in registros:
+            saida.write(json.dumps(registro, ensure_ascii=False) + '\n')
+            total += 1
+    else:
+        raise ValueError(f'Formato não suportado: {formato}')
+    return total
+
+
+def main() -> None:
+    """Função Principal do gerador"""
+    parser = argparse.ArgumentParser(description='Gerador de pessoas sintéticas')
+    parser.add_argument('-n', '--quantidade', type=int, default=1_000_000)
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--formato', choices=['csv', 'jsonl'], default='csv')
+    parser.add_argument('--saida', default='-', help="arquivo de saída ('-' para stdout)")
+    args = parser.parse_args()
+
+    gerador = GeradorPessoas(args.semente)
+    inicio = time.perf_counter()
+    if args.saida == '-':
+        total = escrever(gerador.registros(args.quantidade), sys.stdout, args.formato)
+    else:
+        with open(args.saida, 'w', encoding='utf-8', newline='') as arquivo:
+            total = escrever(gerador.registros(args.quantidade), arquivo, args.formato)
+    duracao = time.perf_counter() - inicio
+    print(f'[OK] {total} registros em {duracao:.2f}s ({total / duracao:,.0f}/s)', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+"""
+Teste de estresse do CadastroPessoas em modo concorrente.
+
+Várias threads executam uma carga mista (buscas por CPF, email e nome,
+filtros, listagem, percurso de `pessoas`, estatísticas, inclusões e
+remoções) sobre o mesmo cadastro e o script mede a vazão
+(operações/segundo) e verifica a consistência dos índices ao final.
+
+Uso:
+    python -m benchmarks.stress_concorrencia [--pessoas 20000] [--operacoes 20000]
+                                             [--threads 1 2 4 8] [--escritas 0.1]
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+from typing import Dict, List
+
+from benchmarks.gerador import GeradorPessoas
+from models.pessoa import CadastroPessoas
+from models.tokens_nome import dobrar
+
+#Termos de busca por nome (palavra inteira, prefixo e nome composto)
+TERMOS = ['silva', 'ana', 'mar', 'jose santos', 'xyz']
+SEXOS = ['F', 'M', 'NB', 'O', '']
+DDDS = ['11', '21', '27', '31', '61']
+
+
+def trabalhador(cadastro: CadastroPessoas, cpfs: List[str], operacoes: int,
+                taxa_escrita: float, semente: int, erros: List[BaseException]) -> None:
+    """Executa a carga mista em uma thread"""
+    rng = random.Random(semente)
+    novas = GeradorPessoas(semente=rng.randrange(2**32)).pessoas(operacoes)
+    try:
+        for _ in range(operacoes):
+            sorteio = rng.random()
+            if sorteio < taxa_escrita / 2:
+                cadastro.adicionar(next(novas))
+            elif sorteio < taxa_escrita:
+                cadastro.remover_por_cpf(rng.choice(cpfs))
+            elif sorteio < 0.4:
+                cadastro.buscar_por_cpf(rng.choice(cpfs))
+            elif sorteio < 0.55:
+                cadastro.buscar_por_nome(rng.choice(TERMOS))
+            elif sorteio < 0.65:
+                cadastro.filtrar_por_uf(rng.choice(['ES', 'RJ', 'SP']))
+            elif sorteio < 0.75:
+                cadastro.filtrar_por_sexo(rng.choice(SEXOS))
+            elif sorteio < 0.8:
+                cadastro.filtrar_por_ddd(rng.choice(DDDS))
+            elif sorteio < 0.9:
+                cadastro.buscar_por_email(f'pessoa{rng.randrange(10**9)}@email.com')
+            elif sorteio < 0.98:
+                cadastro.filtrar_por_regiao(rng.randint(1, 10))
+            elif sorteio < 0.985:
+                cadastro.listar_todos()
+            elif sorteio < 0.99:
+                #percorre a visão enquanto outras threads incluem e removem
+                sum(pessoa.ano_nascimento for pessoa in cadastro.pessoas)
+            else:
+                cadastro.estatisticas()
+    except BaseException as e: #registra qualquer falha para o relatório
+        erros.append(e)
+
+
+def verificar_consistencia(cadastro: CadastroPessoas) -> None:
+    """
+    Confere se índices e sketches batem com a lista de pessoas
+
+    Raises:
+        AssertionError: Se houver divergência
+
+    """
+    pessoas = cadastro.pessoas
+    total = len(pessoas)
+    estat = cadastro.estatisticas()
+    assert estat['total_pessoas'] == total
+    assert sum(estat['distribuicao_sexo'].values()) == total
+    assert sum(estat['distribuicao_regiao_fiscal'].values()) == total
+    assert len(cadastro.histograma_anos()) == total
+
+    #filtros e buscas devolvem exatamente as pessoas do cadastro
+    for codigo, quantidade in estat['distribuicao_sexo'].items():
+        assert len(cadastro.filtrar_por_sexo(codigo)) == quantidade
+    assert sum(len(cadastro.filtrar_por_regiao(regiao)) for regiao in range(1, 11)) == total
+    assert sum(len(cadastro.filtrar_por_uf(uf)) for uf in estat['distribuicao_uf']) == \
+        sum(estat['distribuicao_uf'].values())
+    if total:
+        assert len(cadastro.listar_todos().split('\n\n')) == total
+    assert {id(p) for p in cadastro.buscar_por_nome('')} == {id(p) for p in pessoas}
+    for termo in TERMOS:
+        esperado = {id(p) for p in pessoas if termo in dobrar(p.nome)}
+        assert {id(p) for p in cadastro.buscar_por_nome(termo)} == esperado, termo
+
+
+def executar(pessoas: int, operacoes: int, threads: int, taxa_escrita: float) -> Dict[str, float]:
+    """Executa uma rodada com `threads` threads e retorna as métricas"""
+    cadastro = CadastroPessoas(concorrente=True)
+    iniciais = list(GeradorPessoas(semente=42).pessoas(pessoas))
+    for pessoa in iniciais:
+        cadastro.adicionar(pessoa)
+    cpfs = [p.cpf for p in iniciais]
+
+    erros: List[BaseException] = []
+    por_thread = operacoes // threads
+    grupo = [
+        threading.Thread(target=trabalhador,
+                         args=(cadastro, cpfs, por_thread, taxa_escrita, semente, erros))
+        for semente in range(threads)
+    ]
+
+    inicio = time.perf_counter()
+    for thread in grupo:
+        thread.start()
+    for thread in grupo:
+        thread.join()
+    duracao = time.perf_counter() - inicio
+
+    if erros:
+        raise erros[0]
+    verificar_consistencia(cadastro)
+
+    return {
+        'threads': threads,
+        'operacoes': por_thread * threads,
+        'segundos': duracao,
+        'ops_por_segundo': por_thread * threads / duracao,
+    }
+
+
+def main() -> None:
+    """Função Principal do teste de estresse"""
+    parser = argparse.ArgumentParser(description='Estresse concorrente do CadastroPessoas')
+    parser.add_argument('--pessoas', type=int, default=20_000, help='pessoas pré-carregadas')
+    parser.add_argument('--operacoes', type=int, default=20_000, help='operações por rodada')
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--escritas', type=float, default=0.1, help='fração de escritas (0 a 1)')
+    args = parser.parse_args()
+
+    print('TESTE DE ESTRESSE - CADASTRO CONCORRENTE')
+    print('-' * 60)
+    print(f'Pessoas iniciais: {args.pessoas} | Operações: {args.operacoes} '
+          f'| Escritas: {args.escritas:.0%}')
+    print('-' * 60)
+
+    for threads in args.threads:
+        try:
+            resultado = executar(args.pessoas, args.operacoes, threads, args.escritas)
+        except AssertionError:
+            print(f'[FALHA] Índices inconsistentes com {threads} thread(s)')
+            sys.exit(1)
+        print(f"{threads:>2} thread(s): {resultado['ops_por_segundo']:>10,.0f} ops/s "
+              f"({resultado['segundos']:.2f}s) - consistência OK")
+
+
+if __name__ == '__main__':
+    main()
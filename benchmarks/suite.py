@@ -0,0 +1,347 @@
+"""
+Suíte de benchmarks dos caminhos críticos do cadastro e dos validadores.
+
+Para cada tamanho de cadastro mede `CadastroPessoas.adicionar`,
+`buscar_por_cpf`, `buscar_por_nome`, `filtrar_por_sexo`, `estatisticas`,
+`listar_todos` e `exportar_dados`; os validadores (`validar_cpf`,
+`validar_nome`, `validar_nomes_lote`, `ValidadorGenero.validar`) não
+dependem do tamanho e são medidos uma vez. Os dados são gerados com
+semente fixa.
+
+Os resultados (nanossegundos por operação, melhor e mediana das repetições)
+saem em JSON e são comparados com um baseline salvo: o script termina com
+código 1 se alguma medida piorar além da tolerância. Como os tempos absolutos
+dependem da máquina, cada repetição é dividida pela de uma operação de
+referência (Python puro) medida logo antes dela, e a comparação usa a mediana
+dessas razões. Uma medida só é regressão se piorar também ao ser medida de
+novo (`--confirmacoes`).
+
+O baseline não é versionado: grave-o com `--salvar-baseline`; sem baseline,
+o script termina com código 2.
+
+Uso:
+    python -m benchmarks.suite [--tamanhos 1000 100000 1000000 10000000]
+                               [--repeticoes 9] [--saida resultados.json]
+                               [--baseline benchmarks/baseline.json] [--tolerancia 0.25]
+                               [--confirmacoes 1] [--salvar-baseline]
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from benchmarks.gerador import GeradorPessoas
+from models.pessoa import CadastroPessoas
+from validacao.cpf import validar_cpf
+from validacao.nome import validar_nome, validar_nomes_lote
+from validacao.sexo import ValidadorGenero
+
+TAMANHOS_PADRAO = [1_000, 100_000, 1_000_000, 10_000_000]
+BASELINE_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+SEMENTE = 42
+
+#Operações por repetição medidas em um cadastro de 100 mil pessoas; operações
+#que percorrem o cadastro são reduzidas proporcionalmente em cadastros maiores
+OPERACOES = {
+    'buscar_por_cpf': 10_000,
+    'buscar_por_nome': 20,
+    'filtrar_por_sexo': 20,
+    'estatisticas': 50,
+    'listar_todos': 2,
+    'exportar_dados': 1,
+}
+LINEARES = {'buscar_por_nome', 'filtrar_por_sexo', 'listar_todos', 'exportar_dados'}
+OPERACOES_VALIDADORES = 20_000
+
+TERMOS = ['silva', 'ana sil', 'costa', 'xyz', 'hugo', 'pereira']
+SEXOS = ['M', 'F', 'NB', 'O', 'X', '']
+ENTRADAS_GENERO = ['M', 'Feminino', 'Não Binário', 'nb', 'Outro', '', 'male', 'Prefiro não dizer']
+
+#Operação que normaliza as demais (não depende do código do cadastro)
+OPERACOES_REFERENCIA = 50_000
+#Duração mínima de cada medição (o lote é repetido até alcançá-la)
+TEMPO_MINIMO_NS = 20_000_000
+
+
+def _lote_referencia() -> Callable[[], None]:
+    """Operação de referência: dicionário e strings em Python puro"""
+    chaves = [f'{i:011d}' for i in range(OPERACOES_REFERENCIA)]
+
+    def lote() -> None:
+        contagens: Dict[str, int] = {}
+        for chave in chaves:
+            contagens[chave[-2:]] = contagens.get(chave[-2:], 0) + 1
+
+    return lote
+
+
+REFERENCIA = _lote_referencia()
+
+
+def _tempo(lote: Callable[[], Any], operacoes: int) -> float:
+    """
+    Nanossegundos por operação de `lote`
+
+    Repete o lote até somar TEMPO_MINIMO_NS: lotes de microssegundos (cadastros
+    pequenos) medidos uma única vez são dominados pelo ruído.
+
+    """
+    gc.collect()
+    execucoes = 0
+    inicio = time.perf_counter_ns()
+    while True:
+        lote()
+        execucoes += 1
+        decorrido = time.perf_counter_ns() - inicio
+        if decorrido >= TEMPO_MINIMO_NS:
+            return decorrido / (operacoes * execucoes)
+
+
+def cronometrar(lote: Callable[[], Any], operacoes: int, repeticoes: int) -> Dict[str, Any]:
+    """
+    Mede `lote` (que executa `operacoes` operações) `repeticoes` vezes
+
+    Antes de cada repetição mede a operação de referência, para que a razão
+    entre as duas não dependa da máquina nem de oscilações da carga dela.
+
+    Returns:
+        dict: operações, melhor e mediana em nanossegundos por operação, e
+        'relativo' (mediana das razões repetição / referência medida junto)
+
+    """
+    tempos = []
+    relativos = []
+    for _ in range(repeticoes):
+        referencia = _tempo(REFERENCIA, OPERACOES_REFERENCIA)
+        tempo = _tempo(lote, operacoes)
+        tempos.append(tempo)
+        relativos.append(tempo / referencia)
+    return {
+        'operacoes': operacoes,
+        'ns_por_op': round(min(tempos), 1),
+        'mediana_ns_por_op': round(statistics.median(tempos), 1),
+        'relativo': round(statistics.median(relativos), 4),
+    }
+
+
+def medir_cadastro(tamanho: int, repeticoes: int) -> Dict[str, Dict[str, Any]]:
+    """Mede as operações do CadastroPessoas em um cadastro de `tamanho` pessoas"""
+    rng = random.Random(SEMENTE)
+    pessoas = list(GeradorPessoas(SEMENTE).pessoas(tamanho))
+    cpfs = [rng.choice(pessoas).cpf for _ in range(OPERACOES['buscar_por_cpf'])]
+
+    resultados = {}
+    cadastro = CadastroPessoas()
+
+    def adicionar_todos() -> None:
+        nonlocal cadastro
+        cadastro = CadastroPessoas()
+        for pessoa in pessoas:
+            cadastro.adicionar(pessoa)
+
+    #construir o cadastro várias vezes só compensa nos tamanhos pequenos
+    resultados['adicionar'] = cronometrar(adicionar_todos, tamanho, repeticoes if tamanho <= 100_000 else 1)
+
+    def operacoes(nome: str) -> int:
+        if nome in LINEARES:
+            return max(1, OPERACOES[nome] * 100_000 // max(tamanho, 100_000))
+        return OPERACOES[nome]
+
+    n = operacoes('buscar_por_cpf')
+    resultados['buscar_por_cpf'] = cronometrar(
+        lambda: [cadastro.buscar_por_cpf(cpf) for cpf in cpfs[:n]], n, repeticoes)
+
+    n = operacoes('buscar_por_nome')
+    resultados['buscar_por_nome'] = cronometrar(
+        lambda: [cadastro.buscar_por_nome(TERMOS[i % len(TERMOS)]) for i in range(n)], n, repeticoes)
+
+    n = operacoes('filtrar_por_sexo')
+    resultados['filtrar_por_sexo'] = cronometrar(
+        lambda: [cadastro.filtrar_por_sexo(SEXOS[i % len(SEXOS)]) for i in range(n)], n, repeticoes)
+
+    n = operacoes('estatisticas')
+    resultados['estatisticas'] = cronometrar(
+        lambda: [cadastro.estatisticas() for _ in range(n)], n, repeticoes)
+
+    n = operacoes('listar_todos')
+    resultados['listar_todos'] = cronometrar(
+        lambda: [cadastro.listar_todos() for _ in range(n)], n, repeticoes)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivo = os.path.join(pasta, 'exportacao.txt')
+        n = operacoes('exportar_dados')
+        resultados['exportar_dados'] = cronometrar(
+            lambda: [cadastro.exportar_dados(arquivo) for _ in range(n)], n, repeticoes)
+
+    return resultados
+
+
+def medir_validadores(repeticoes: int) -> Dict[str, Dict[str, Any]]:
+    """Mede os validadores (independentes do tamanho do cadastro)"""
+    pessoas = list(GeradorPessoas(SEMENTE).pessoas(OPERACOES_VALIDADORES))
+    cpfs = [p.cpf_formatado for p in pessoas]
+    nomes = [p.nome for p in pessoas]
+    generos = [ENTRADAS_GENERO[i % len(ENTRADAS_GENERO)] for i in range(OPERACOES_VALIDADORES)]
+
+    return {
+        'validar_cpf': cronometrar(lambda: [validar_cpf(c) for c in cpfs], len(cpfs), repeticoes),
+        'validar_nome': cronometrar(lambda: [validar_nome(n) for n in nomes], len(nomes), repeticoes),
+        'validar_nomes_lote': cronometrar(lambda: validar_nomes_lote(nomes), len(nomes), repeticoes),
+        'ValidadorGenero.validar': cronometrar(
+            lambda: [ValidadorGenero.validar(g) for g in generos], len(generos), repeticoes),
+    }
+
+
+def executar(tamanhos: List[int], repeticoes: int, validadores: bool = True) -> Dict[str, Any]:
+    """
+    Executa a suíte completa (ou só os tamanhos informados, sem os validadores)
+
+    Returns:
+        dict: {'meta': {...}, 'resultados': {'operacao@tamanho' ou 'validador': medida}}
+
+    """
+    resultados = {}
+    if validadores:
+        for nome, medida in medir_validadores(repeticoes).items():
+            resultados[nome] = medida
+            print(f'{nome:<32} {medida["ns_por_op"]:>14,.0f} ns/op', file=sys.stderr)
+    for tamanho in tamanhos:
+        for nome, medida in medir_cadastro(tamanho, repeticoes).items():
+            chave = f'{nome}@{tamanho}'
+            resultados[chave] = medida
+            print(f'{chave:<32} {medida["ns_por_op"]:>14,.0f} ns/op', file=sys.stderr)
+
+    return {
+        'meta': {
+            'data': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'semente': SEMENTE,
+            'repeticoes': repeticoes,
+            'tamanhos': tamanhos,
+        },
+        'resultados': resultados,
+    }
+
+
+def comparar(atual: Dict[str, Any], baseline: Dict[str, Any], tolerancia: float) -> List[Dict[str, Any]]:
+    """
+    Compara os resultados com um baseline, relativos à operação de referência
+
+    Args:
+        atual: Saída de `executar`
+        baseline: Saída de `executar` salva anteriormente (em qualquer máquina)
+        tolerancia: Piora relativa aceita (0.25 = 25% mais lento)
+
+    Returns:
+        list: Uma linha por medida presente nos dois, com 'razao'
+        (relativo atual / relativo do baseline) e 'regressao'
+
+    Raises:
+        ValueError: Se o baseline não tiver as medidas relativas
+
+    """
+    if any('relativo' not in medida for medida in baseline['resultados'].values()):
+        raise ValueError('Baseline sem medidas relativas; grave outro com --salvar-baseline')
+    linhas = []
+    for chave, medida in atual['resultados'].items():
+        anterior = baseline['resultados'].get(chave)
+        if not anterior:
+            continue
+        razao = medida['relativo'] / anterior['relativo']
+        linhas.append({
+            'medida': chave,
+            'baseline_ns': anterior['ns_por_op'],
+            'atual_ns': medida['ns_por_op'],
+            'razao': round(razao, 3),
+            'regressao': razao > 1 + tolerancia,
+        })
+    return linhas
+
+
+def confirmar(linhas: List[Dict[str, Any]], baseline: Dict[str, Any], tolerancia: float,
+              repeticoes: int) -> None:
+    """
+    Mede de novo as medidas com regressão; só continuam regressão as que pioram outra vez
+
+    Atualiza 'razao' e 'regressao' das linhas (a razão fica a menor das medições).
+
+    """
+    suspeitas = {linha['medida']: linha for linha in linhas if linha['regressao']}
+    tamanhos = sorted({int(chave.split('@')[1]) for chave in suspeitas if '@' in chave})
+    validadores = any('@' not in chave for chave in suspeitas)
+    print(f'\nConfirmando {len(suspeitas)} regressão(ões)...', file=sys.stderr)
+    nova = executar(tamanhos, repeticoes, validadores)
+    for linha in comparar(nova, baseline, tolerancia):
+        suspeita = suspeitas.get(linha['medida'])
+        if suspeita is not None:
+            suspeita['razao'] = min(suspeita['razao'], linha['razao'])
+            suspeita['regressao'] = linha['regressao']
+
+
+def main() -> None:
+    """Função Principal da suíte de benchmarks"""
+    parser = argparse.ArgumentParser(description='Benchmarks dos caminhos críticos do cadastro')
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=TAMANHOS_PADRAO)
+    parser.add_argument('--repeticoes', type=int, default=9)
+    parser.add_argument('--saida', help='arquivo JSON dos resultados (padrão: stdout)')
+    parser.add_argument('--baseline', default=BASELINE_PADRAO, help='baseline para comparação')
+    parser.add_argument('--tolerancia', type=float, default=0.25, help='piora relativa aceita')
+    parser.add_argument('--confirmacoes', type=int, default=1,
+                        help='novas medições exigidas para confirmar uma regressão')
+    parser.add_argument('--salvar-baseline', action='store_true',
+                        help='grava os resultados como baseline')
+    args = parser.parse_args()
+
+    if not args.salvar_baseline and not os.path.exists(args.baseline):
+        print(f'[ERRO] Baseline não encontrado: {args.baseline} (grave um com --salvar-baseline)',
+              file=sys.stderr)
+        sys.exit(2)
+
+    resultado = executar(args.tamanhos, args.repeticoes)
+
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(texto + '\n')
+    else:
+        print(texto)
+
+    if args.salvar_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(texto + '\n')
+        print(f'[OK] Baseline salvo em {args.baseline}', file=sys.stderr)
+        return
+
+    with open(args.baseline, encoding='utf-8') as arquivo:
+        baseline = json.load(arquivo)
+    try:
+        linhas = comparar(resultado, baseline, args.tolerancia)
+    except ValueError as e:
+        print(f'[ERRO] {e}', file=sys.stderr)
+        sys.exit(2)
+    for _ in range(args.confirmacoes):
+        if not any(linha['regressao'] for linha in linhas):
+            break
+        confirmar(linhas, baseline, args.tolerancia, args.repeticoes)
+
+    print('\nCOMPARAÇÃO COM O BASELINE', file=sys.stderr)
+    print('-' * 60, file=sys.stderr)
+    for linha in linhas:
+        marca = 'REGRESSÃO' if linha['regressao'] else 'ok'
+        print(f"{linha['medida']:<32} {linha['razao']:>6.2f}x  {marca}", file=sys.stderr)
+    if any(linha['regressao'] for linha in linhas):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,366 @@
+"""
+API HTTP/JSON do sistema de Ficha Cadastral (asyncio, apenas biblioteca padrão)
+Expõe o CadastroPessoas para outros sistemas, com keep-alive e pipelining HTTP/1.1.
+
+Rotas:
+    POST   /pessoas              Cadastra uma pessoa (JSON no corpo)
+    GET    /pessoas/{cpf}        Busca por CPF
+    DELETE /pessoas/{cpf}        Remove por CPF
+    GET    /pessoas?filtros      Busca/filtra: nome, sexo, uf, ddd, regiao, email, telefone
+    GET    /estatisticas         Estatísticas do cadastro
+    GET    /exportar             Todas as pessoas (a partir de um snapshot)
+
+Uso:
+    python -m cadastro.api [--host 127.0.0.1] [--porta 8080] [--exemplos]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+from http import HTTPStatus
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from models.pessoa import Pessoa, CadastroPessoas
+from validacao.cpf import validar_cpf, limpar_cpf
+from validacao.idade import validar_ano_nascimento
+from validacao.nome import validar_nome
+
+#Tamanho máximo aceito para o corpo de uma requisição
+TAMANHO_MAXIMO_CORPO = 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+#Filtros aceitos em GET /pessoas
+FILTROS = ('nome', 'sexo', 'uf', 'ddd', 'regiao', 'email', 'telefone')
+
+
+class ErroHTTP(Exception):
+    """Erro que deve virar uma resposta HTTP com o status indicado"""
+
+    def __init__(self, status: HTTPStatus, mensagem: str):
+        super().__init__(mensagem)
+        self.status = status
+        self.mensagem = mensagem
+
+
+class ServidorCadastro:
+    """Servidor HTTP/1.1 assíncrono sobre um CadastroPessoas"""
+
+    def __init__(self, cadastro: CadastroPessoas, host: str = '127.0.0.1', porta: int = 8080):
+        """
+        Inicializa o servidor (não começa a escutar)
+
+        Args:
+            cadastro: Cadastro exposto pela API
+            host: Endereço de escuta
+            porta: Porta TCP (0 escolhe uma porta livre)
+
+        """
+        self.cadastro = cadastro
+        self.host = host
+        self.porta = porta
+        self._servidor: Optional[asyncio.AbstractServer] = None
+
+    async def iniciar(self) -> None:
+        """Começa a escutar conexões"""
+        self._servidor = await asyncio.start_server(self._atender_conexao, self.host, self.porta)
+        self.porta = self._servidor.sockets[0].getsockname()[1]
+
+    async def servir_para_sempre(self) -> None:
+        """Inicia (se preciso) e atende conexões até ser cancelado"""
+        if self._servidor is None:
+            await self.iniciar()
+        async with self._servidor:
+            await self._servidor.serve_forever()
+
+    async def encerrar(self) -> None:
+        """Para de aceitar conexões"""
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+
+    async def _atender_conexao(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Atende uma conexão até o cliente fechar ou pedir `Connection: close`
+
+        Requisições em pipeline já estão no buffer do `reader` e são
+        respondidas em ordem, sem esperar o cliente.
+
+        """
+        try:
+            while True:
+                try:
+                    cabecalho = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(self._resposta(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                                                {'erro': 'Cabeçalho muito grande'}, manter=False))
+                    break
+
+                try:
+                    metodo, alvo, versao, cabecalhos = self._analisar_cabecalho(cabecalho)
+                except ErroHTTP as e:
+                    writer.write(self._resposta(e.status, {'erro': e.mensagem}, manter=False))
+                    break
+
+                manter = self._manter_conexao(versao, cabecalhos)
+                try:
+                    corpo = await self._ler_corpo(reader, cabecalhos)
+                except ErroHTTP as e:
+                    #corpo não lido: o resto do fluxo não está mais alinhado com as requisições
+                    writer.write(self._resposta(e.status, {'erro': e.mensagem}, manter=False))
+                    break
+                except asyncio.IncompleteReadError:
+                    break
+
+                try:
+                    status, dados = self.despachar(metodo, alvo, corpo)
+                except ErroHTTP as e:
+                    status, dados = e.status, {'erro': e.mensagem}
+                except Exception:
+                    #falha inesperada em uma rota: responde 500 e segue com as próximas requisições
+                    logger.exception('Erro ao atender %s %s', metodo, alvo)
+                    status, dados = HTTPStatus.INTERNAL_SERVER_ERROR, {'erro': 'Erro interno do servidor'}
+
+                #drain só bloqueia se o buffer de saída passar do limite
+                writer.write(self._resposta(status, dados, manter))
+                await writer.drain()
+                if not manter:
+                    break
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _analisar_cabecalho(bruto: bytes) -> Tuple[str, str, str, Dict[str, str]]:
+        """Separa linha de requisição e cabeçalhos"""
+        try:
+            linhas = bruto.decode('latin-1').split('\r\n')
+            metodo, alvo, versao = linhas[0].split(' ')
+        except ValueError:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, 'Linha de requisição inválida')
+
+        cabecalhos = {}
+        for linha in linhas[1:]:
+            if not linha:
+                continue
+            nome, _, valor = linha.partition(':')
+            cabecalhos[nome.strip().lower()] = valor.strip()
+        return metodo.upper(), alvo, versao, cabecalhos
+
+    @staticmethod
+    def _manter_conexao(versao: str, cabecalhos: Dict[str, str]) -> bool:
+        """Keep-alive: padrão no HTTP/1.1, opcional no HTTP/1.0"""
+        conexao = cabecalhos.get('connection', '').lower()
+        if versao == 'HTTP/1.0':
+            return conexao == 'keep-alive'
+        return conexao != 'close'
+
+    @staticmethod
+    async def _ler_corpo(reader: asyncio.StreamReader, cabecalhos: Dict[str, str]) -> bytes:
+        """Lê o corpo indicado por Content-Length (sem suporte a chunked)"""
+        if 'transfer-encoding' in cabecalhos:
+            raise ErroHTTP(HTTPStatus.NOT_IMPLEMENTED, 'Transfer-Encoding não suportado')
+        try:
+            tamanho = int(cabecalhos.get('content-length', '0'))
+        except ValueError:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, 'Content-Length inválido')
+        if tamanho > TAMANHO_MAXIMO_CORPO:
+            raise ErroHTTP(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, 'Corpo muito grande')
+        if tamanho <= 0:
+            return b''
+        return await reader.readexactly(tamanho)
+
+    @staticmethod
+    def _resposta(status: HTTPStatus, dados: Any, manter: bool) -> bytes:
+        """Monta a resposta HTTP com corpo JSON"""
+        corpo = json.dumps(dados, ensure_ascii=False).encode('utf-8')
+        cabecalho = (
+            f'HTTP/1.1 {status.value} {status.phrase}\r\n'
+            f'Content-Type: application/json; charset=utf-8\r\n'
+            f'Content-Length: {len(corpo)}\r\n'
+            f"Connection: {'keep-alive' if manter else 'close'}\r\n\r\n"
+        )
+        return cabecalho.encode('latin-1') + corpo
+
+    def despachar(self, metodo: str, alvo: str, corpo: bytes) -> Tuple[HTTPStatus, Any]:
+        """
+        Executa a rota correspondente à requisição
+
+        Args:
+            metodo: Método HTTP (GET, POST, ...)
+            alvo: Caminho com query string
+            corpo: Corpo da requisição
+
+        Returns:
+            tuple: (status, dados serializáveis em JSON)
+
+        Raises:
+            ErroHTTP: Para requisições inválidas ou rotas inexistentes
+
+        """
+        url = urlsplit(alvo)
+        partes = [unquote(p) for p in url.path.split('/') if p]
+        consulta = {chave: valores[-1] for chave, valores in parse_qs(url.query).items()}
+
+        if partes == ['pessoas']:
+            if metodo == 'POST':
+                return self._criar_pessoa(corpo)
+            if metodo == 'GET':
+                return HTTPStatus.OK, [p.to_dict() for p in self._filtrar(consulta)]
+        elif len(partes) == 2 and partes[0] == 'pessoas':
+            if metodo == 'GET':
+                pessoa = self.cadastro.buscar_por_cpf(partes[1])
+                if pessoa is None:
+                    raise ErroHTTP(HTTPStatus.NOT_FOUND, f'CPF não encontrado: {partes[1]}')
+                return HTTPStatus.OK, pessoa.to_dict()
+            if metodo == 'DELETE':
+                if not self.cadastro.remover_por_cpf(partes[1]):
+                    raise ErroHTTP(HTTPStatus.NOT_FOUND, f'CPF não encontrado: {partes[1]}')
+                return HTTPStatus.OK, {'removido': limpar_cpf(partes[1])}
+        elif partes == ['estatisticas'] and metodo == 'GET':
+            return HTTPStatus.OK, self.cadastro.estatisticas()
+        elif partes == ['exportar'] and metodo == 'GET':
+            return HTTPStatus.OK, [p.to_dict() for p in self.cadastro.snapshot()]
+        else:
+            raise ErroHTTP(HTTPStatus.NOT_FOUND, f'Rota não encontrada: {url.path}')
+
+        raise ErroHTTP(HTTPStatus.METHOD_NOT_ALLOWED, f'Método não permitido: {metodo}')
+
+    def _criar_pessoa(self, corpo: bytes) -> Tuple[HTTPStatus, Any]:
+        """POST /pessoas: valida o JSON e cadastra a pessoa"""
+        try:
+            dados = json.loads(corpo or b'{}')
+        except ValueError:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, 'JSON inválido')
+        if not isinstance(dados, dict):
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, 'Esperado um objeto JSON')
+
+        faltando = [campo for campo in ('nome', 'cpf', 'ano_nascimento') if not dados.get(campo)]
+        if faltando:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, f"Campos obrigatórios: {', '.join(faltando)}")
+
+        try:
+            pessoa = Pessoa.from_dict(self._validar_campos(dados))
+            if self.cadastro.buscar_por_cpf(pessoa.cpf) is not None:
+                raise ErroHTTP(HTTPStatus.CONFLICT, f'CPF já cadastrado: {pessoa.cpf_formatado}')
+            self.cadastro.adicionar(pessoa)
+        except ValueError as e:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, str(e))
+        return HTTPStatus.CREATED, pessoa.to_dict()
+
+    @staticmethod
+    def _validar_campos(dados: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Confere os tipos dos campos de POST /pessoas e aplica os validadores
+
+        Aceita também o formato de `Pessoa.to_dict` (sexo em `sexo_dados`).
+
+        Returns:
+            dict: Campos para `Pessoa.from_dict` (nome formatado, ano inteiro)
+
+        Raises:
+            ValueError: Se algum campo tiver tipo errado ou for inválido
+
+        """
+        for campo in ('nome', 'cpf', 'sexo', 'email', 'telefone', 'data_cadastro'):
+            if dados.get(campo) is not None and not isinstance(dados[campo], str):
+                raise ValueError(f'Campo {campo} deve ser texto')
+        ano = dados['ano_nascimento']
+        if isinstance(ano, bool) or not isinstance(ano, (int, str)):
+            raise ValueError('Campo ano_nascimento deve ser um número inteiro')
+
+        sexo = dados.get('sexo')
+        if 'sexo_dados' in dados:
+            sexo_dados = dados['sexo_dados']
+            if not isinstance(sexo_dados, dict):
+                raise ValueError('Campo sexo_dados deve ser um objeto')
+            sexo = sexo_dados.get('entrada_original', sexo_dados.get('display'))
+            if sexo is not None and not isinstance(sexo, str):
+                raise ValueError('Campo sexo_dados.entrada_original deve ser texto')
+
+        validar_cpf(dados['cpf'])
+        campos = {
+            'nome': validar_nome(dados['nome']),
+            'cpf': dados['cpf'],
+            'ano_nascimento': validar_ano_nascimento(str(ano)),
+            'sexo': sexo,
+            'email': dados.get('email'),
+            'telefone': dados.get('telefone'),
+        }
+        if dados.get('data_cadastro'):
+            campos['data_cadastro'] = dados['data_cadastro']
+        return campos
+
+    def _filtrar(self, consulta: Dict[str, str]) -> List[Pessoa]:
+        """GET /pessoas: aplica os filtros informados (interseção)"""
+        desconhecidos = set(consulta) - set(FILTROS)
+        if desconhecidos:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, f"Filtros inválidos: {', '.join(sorted(desconhecidos))}")
+
+        c = self.cadastro
+        buscas = {
+            'nome': c.buscar_por_nome,
+            'sexo': c.filtrar_por_sexo,
+            'uf': lambda valor: c.filtrar_por_uf(*valor.split(',')),
+            'ddd': c.filtrar_por_ddd,
+            'email': c.buscar_por_email,
+            'telefone': c.buscar_por_telefone,
+        }
+
+        resultado: Optional[List[Pessoa]] = None
+        for filtro, valor in consulta.items():
+            if filtro == 'regiao':
+                try:
+                    encontrados = c.filtrar_por_regiao(*(int(r) for r in valor.split(',')))
+                except ValueError:
+                    raise ErroHTTP(HTTPStatus.BAD_REQUEST, 'Região deve ser um número de 1 a 10')
+            else:
+                encontrados = buscas[filtro](valor)
+
+            if resultado is None:
+                resultado = encontrados
+            else:
+                ids = {id(p) for p in encontrados}
+                resultado = [p for p in resultado if id(p) in ids]
+
+        if resultado is None:
+            return list(c.pessoas)
+        return resultado
+
+
+def main() -> None:
+    """Função Principal: sobe a API"""
+    parser = argparse.ArgumentParser(description='API HTTP do Sistema de Ficha Cadastral')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8080)
+    parser.add_argument('--exemplos', action='store_true', help='carrega pessoas de exemplo')
+    args = parser.parse_args()
+
+    cadastro = CadastroPessoas()
+    if args.exemplos:
+        cadastro.adicionar(Pessoa('Vinicius Barcellos de Andrade', '12546460781', 1988, 'M',
+                                  telefone='(27) 98866-4060'))
+        cadastro.adicionar(Pessoa('Livia Vidoto Monteiro Gomes', '98765432100', 1985, 'F',
+                                  email='liviavmg@gmail.com', telefone='(21) 99876-5432'))
+
+    servidor = ServidorCadastro(cadastro, args.host, args.porta)
+
+    async def executar() -> None:
+        await servidor.iniciar()
+        print(f'[OK] API do cadastro em http://{servidor.host}:{servidor.porta}')
+        await servidor.servir_para_sempre()
+
+    try:
+        asyncio.run(executar())
+    except KeyboardInterrupt:
+        print('\nAPI encerrada pelo usuário.')
+
+
+if __name__ == '__main__':
+    main()
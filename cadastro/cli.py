@@ -0,0 +1,498 @@
+"""
+Interface de linha de comando não interativa do Sistema de Ficha Cadastral.
+
+Os dados ficam em um arquivo JSONL (uma pessoa por linha, no formato de
+`Pessoa.to_dict`). Cada subcomando importa só o que usa, para a primeira
+saída sair rápido em scripts e pipelines.
+
+Uso:
+    python main.py [--dados cadastro.jsonl] <subcomando> ...
+
+    import ARQUIVO [--formato csv|jsonl] [--falsos-positivos TAXA]
+                                            importa pessoas válidas (ARQUIVO '-' = stdin)
+    validate ARQUIVO [--formato csv|jsonl]  só valida, sem gravar
+    get CPF                                 mostra uma pessoa (JSON)
+    search [TERMO] [--ano AAAA] [--limite N]
+                                            busca por nome e/ou ano (JSONL)
+    index [--falsos-positivos TAXA]         reconstrói os índices persistidos
+    stats                                   estatísticas (JSON)
+    memory [--projetar N]                   memória do cadastro carregado (JSON)
+    dedup [--limiar X] [--janela N] [--limite N]
+                                            grupos de possíveis duplicados (JSONL)
+    export ARQUIVO [--formato txt|csv|jsonl]
+
+`import` e `index` gravam os índices de CPF, ano e nome em `<dados>.idx`
+e um filtro de Bloom dos CPFs em `<dados>.bloom` (ver cadastro.indice_persistido);
+`import` indexa só as linhas que incluiu, no delta `<dados>.idx.delta`, e
+inclui os CPFs delas no filtro;
+`get` e `search` usam os índices quando estão em dia com o arquivo de dados e,
+caso contrário, percorrem o arquivo. `import` só consulta o índice de CPF
+quando o filtro diz que o CPF talvez já exista.
+`import` e `validate` terminam com a telemetria das regras de validação
+(chamadas, rejeições por motivo e tempo acumulado) na saída de erro;
+`dedup` termina com o resumo da detecção (blocos, comparações, grupos).
+
+Códigos de saída: 0 sucesso, 1 não encontrado ou registros rejeitados, 2 uso incorreto.
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from validacao.telemetria import TelemetriaValidacao
+
+#Campos aceitos na importação, na ordem das colunas CSV
+CAMPOS = ('nome', 'cpf', 'ano_nascimento', 'sexo', 'email', 'telefone')
+ARQUIVO_PADRAO = 'cadastro.jsonl'
+
+
+def _formato(caminho: str, formato: Optional[str]) -> str:
+    """Formato explícito ou deduzido da extensão do arquivo"""
+    if formato:
+        return formato
+    return 'csv' if caminho.lower().endswith('.csv') else 'jsonl'
+
+
+def ler_registros(caminho: str, formato: Optional[str] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Lê registros de um arquivo CSV (com cabeçalho) ou JSONL
+
+    Args:
+        caminho: Caminho do arquivo ('-' para a entrada padrão)
+        formato: 'csv' ou 'jsonl' (padrão: pela extensão)
+
+    Yields:
+        tuple: (número da linha, registro); registros JSONL inválidos vêm como
+        {'_erro': mensagem}
+
+    """
+    formato = _formato(caminho, formato)
+    arquivo = sys.stdin if caminho == '-' else open(caminho, encoding='utf-8', newline='')
+    try:
+        if formato == 'csv':
+            import csv
+            for linha, registro in enumerate(csv.DictReader(arquivo), start=2):
+                yield linha, {campo: (valor or None) for campo, valor in registro.items()}
+        else:
+            for linha, texto in enumerate(arquivo, start=1):
+                if not texto.strip():
+                    continue
+                try:
+                    registro = json.loads(texto)
+                except ValueError:
+                    registro = {'_erro': 'JSON inválido'}
+                if not isinstance(registro, dict):
+                    registro = {'_erro': 'Esperado um objeto JSON'}
+                yield linha, registro
+    finally:
+        if arquivo is not sys.stdin:
+            arquivo.close()
+
+
+def validar_registro(registro: Dict[str, Any], telemetria: Optional['TelemetriaValidacao'] = None) -> Dict[str, Any]:
+    """
+    Valida e normaliza um registro de importação
+
+    Args:
+        registro: Dicionário com os campos de CAMPOS
+        telemetria: Se informada, conta chamadas, rejeições e tempo de cada
+            regra (e também mede a normalização do sexo, que nunca rejeita)
+
+    Returns:
+        dict: Campos validados (nome e CPF formatados, ano inteiro)
+
+    Raises:
+        ValueError: Na primeira regra violada (ou se um campo tiver tipo errado)
+
+    """
+    from validacao.nome import validar_nome
+    from validacao.cpf import validar_cpf
+    from validacao.idade import validar_ano_nascimento
+    from validacao.contato import validar_email, validar_telefone
+    from validacao.sexo import ValidadorGenero
+    from validacao.telemetria import medir
+
+    if '_erro' in registro:
+        if telemetria:
+            telemetria.rejeitar('leitura', registro['_erro'])
+        raise ValueError(registro['_erro'])
+    try:
+        registro = _conferir_tipos(registro)
+    except ValueError as e:
+        if telemetria:
+            telemetria.rejeitar('tipos', str(e))
+        raise
+
+    email = (registro.get('email') or '').strip() or None
+    if email:
+        medir(telemetria, 'email', validar_email, email)
+    telefone = (registro.get('telefone') or '').strip() or None
+    if telefone:
+        medir(telemetria, 'telefone', validar_telefone, telefone)
+
+    sexo = registro.get('sexo')
+    if telemetria:
+        ValidadorGenero.validar(sexo, telemetria)
+
+    nome = medir(telemetria, 'nome', validar_nome, registro.get('nome') or '')
+    cpf = validar_cpf(registro.get('cpf') or '', telemetria)
+    return {
+        'nome': nome,
+        'cpf': cpf,
+        'ano_nascimento': medir(telemetria, 'ano_nascimento', validar_ano_nascimento,
+                                str(registro.get('ano_nascimento') or '')),
+        'sexo': sexo,
+        'email': email,
+        'telefone': telefone,
+    }
+
+
+def _conferir_tipos(registro: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Campos de CAMPOS com os tipos esperados (sexo de `sexo_dados`, se houver)
+
+    Raises:
+        ValueError: Se um campo de texto não for texto ou o ano não for inteiro/texto
+
+    """
+    campos = {campo: registro.get(campo) for campo in CAMPOS}
+    if isinstance(registro.get('sexo_dados'), dict):
+        campos['sexo'] = registro['sexo_dados'].get('entrada_original', campos['sexo'])
+    for campo in ('nome', 'cpf', 'sexo', 'email', 'telefone'):
+        if campos[campo] is not None and not isinstance(campos[campo], str):
+            raise ValueError(f'Campo {campo} deve ser texto: {campos[campo]!r}')
+    ano = campos['ano_nascimento']
+    if isinstance(ano, bool) or not isinstance(ano, (int, str, type(None))):
+        raise ValueError(f'Campo ano_nascimento deve ser um número inteiro: {ano!r}')
+    return campos
+
+
+def _ler_dados(caminho: str) -> Iterator[Dict[str, Any]]:
+    """Registros gravados no arquivo de dados (vazio se ele não existir)"""
+    if not os.path.exists(caminho):
+        return
+    with open(caminho, encoding='utf-8') as arquivo:
+        for texto in arquivo:
+            if texto.strip():
+                yield json.loads(texto)
+
+
+def _saida(dados: Any) -> None:
+    print(json.dumps(dados, ensure_ascii=False))
+
+
+def _registro_atual(dados: Dict[str, Any]) -> Dict[str, Any]:
+    """Registro gravado com a idade recalculada para hoje"""
+    from datetime import date
+    return {**dados, 'idade': date.today().year - dados['ano_nascimento']}
+
+
+#Subcomandos
+
+def cmd_validate(args: argparse.Namespace) -> int:
+    """Valida um arquivo de importação sem gravar nada"""
+    from validacao.telemetria import TelemetriaValidacao
+
+    telemetria = TelemetriaValidacao()
+    validos = invalidos = 0
+    for linha, registro in ler_registros(args.arquivo, args.formato):
+        try:
+            validar_registro(registro, telemetria)
+            validos += 1
+        except ValueError as e:
+            invalidos += 1
+            print(f'linha {linha}: {e}', file=sys.stderr)
+    print(telemetria.relatorio_texto(), file=sys.stderr)
+    _saida({'validos': validos, 'invalidos': invalidos})
+    return 1 if invalidos else 0
+
+
+def cmd_import(args: argparse.Namespace) -> int:
+    """Importa os registros válidos e sem CPF repetido para o arquivo de dados"""
+    from models.pessoa import Pessoa
+    from validacao.cpf import limpar_cpf
+    from cadastro.indice_persistido import IndicePersistido, atualizar_indice
+    from validacao.telemetria import TelemetriaValidacao
+
+    telemetria = TelemetriaValidacao()
+    indice = IndicePersistido.abrir(args.dados)
+    #CPFs já conferidos: os importados agora e, sem índice em dia, todos os do arquivo
+    cpfs = set()
+    if indice is None:
+        cpfs = {limpar_cpf(dados['cpf']) for dados in _ler_dados(args.dados)}
+
+    importados = rejeitados = 0
+    try:
+        with open(args.dados, 'a', encoding='utf-8') as destino:
+            for linha, registro in ler_registros(args.arquivo, args.formato):
+                try:
+                    campos = validar_registro(registro, telemetria)
+                    cpf = limpar_cpf(campos['cpf'])
+                    #o índice só procura os CPFs que o filtro de Bloom diz que talvez existam
+                    if cpf in cpfs or (indice is not None and indice.contem_cpf(cpf)):
+                        telemetria.rejeitar('cpf.duplicado', 'CPF já cadastrado')
+                        raise ValueError(f"CPF já cadastrado: {campos['cpf']}")
+                except ValueError as e:
+                    rejeitados += 1
+                    print(f'linha {linha}: {e}', file=sys.stderr)
+                    continue
+                cpfs.add(cpf)
+                destino.write(json.dumps(Pessoa(**campos).to_dict(), ensure_ascii=False) + '\n')
+                importados += 1
+        #indexa só as linhas incluídas agora, e inclui os CPFs delas no filtro
+        #(ou reconstrói tudo, se não havia índice em dia)
+        atualizar_indice(args.dados, indice, taxa_falsos_positivos=args.falsos_positivos)
+    finally:
+        if indice is not None:
+            indice.fechar()
+    print(telemetria.relatorio_texto(), file=sys.stderr)
+    if indice is not None and indice.filtro is not None:
+        print(f'Filtro de Bloom de CPFs: {indice.filtro.negativos:,} novos sem consultar o índice, '
+              f'{indice.filtro.positivos:,} consultas ao índice ({indice.falsos_positivos:,} falsos positivos)',
+              file=sys.stderr)
+    _saida({'importados': importados, 'rejeitados': rejeitados})
+    return 1 if rejeitados else 0
+
+
+def cmd_get(args: argparse.Namespace) -> int:
+    """Mostra a pessoa com o CPF informado"""
+    from validacao.cpf import limpar_cpf
+    from cadastro.indice_persistido import IndicePersistido, ler_linha
+
+    indice = IndicePersistido.abrir(args.dados)
+    if indice is not None:
+        with indice:
+            offset = indice.offset_cpf(args.cpf)
+        if offset is not None:
+            with open(args.dados, 'rb') as arquivo:
+                _saida(_registro_atual(ler_linha(arquivo, offset)))
+            return 0
+    else:
+        alvo = limpar_cpf(args.cpf)
+        for dados in _ler_dados(args.dados):
+            if limpar_cpf(dados['cpf']) == alvo:
+                _saida(_registro_atual(dados))
+                return 0
+    print(f'CPF não encontrado: {args.cpf}', file=sys.stderr)
+    return 1
+
+
+def cmd_search(args: argparse.Namespace) -> int:
+    """Busca pessoas pelo nome (ou parte dele) e/ou ano de nascimento, uma por linha"""
+    from cadastro.indice_persistido import IndicePersistido, ler_linha
+    from models.tokens_nome import dobrar
+
+    termo = dobrar(args.termo)
+
+    def registros() -> Iterator[Dict[str, Any]]:
+        indice = IndicePersistido.abrir(args.dados)
+        if indice is None:
+            yield from _ler_dados(args.dados)
+            return
+        with indice:
+            candidatos = None
+            if termo.strip():
+                candidatos = indice.offsets_nome(termo)
+            if args.ano is not None:
+                por_ano = indice.offsets_ano(args.ano)
+                candidatos = por_ano if candidatos is None else sorted(set(candidatos) & set(por_ano))
+        if candidatos is None:
+            yield from _ler_dados(args.dados)
+            return
+        with open(args.dados, 'rb') as arquivo:
+            for offset in candidatos:
+                yield ler_linha(arquivo, offset)
+
+    encontrados = 0
+    for dados in registros():
+        if termo in dobrar(dados['nome']) and args.ano in (None, dados['ano_nascimento']):
+            _saida(_registro_atual(dados))
+            encontrados += 1
+            if args.limite and encontrados >= args.limite:
+                break
+    return 0 if encontrados else 1
+
+
+def cmd_index(args: argparse.Namespace) -> int:
+    """Reconstrói os índices persistidos do arquivo de dados"""
+    from cadastro.indice_persistido import caminho_indice, construir_indice
+
+    linhas = construir_indice(args.dados, taxa_falsos_positivos=args.falsos_positivos)
+    _saida({'linhas': linhas, 'indice': os.path.abspath(caminho_indice(args.dados))})
+    return 0
+
+
+def cmd_stats(args: argparse.Namespace) -> int:
+    """Estatísticas do arquivo de dados (formato de CadastroPessoas.estatisticas)"""
+    from models.agregados import AgregadosCadastro
+
+    agregados = AgregadosCadastro()
+    for dados in _ler_dados(args.dados):
+        agregados.registrar(dados['nome'], dados['cpf'], dados['ano_nascimento'], dados['sexo'],
+                            dados.get('email'), dados.get('telefone'))
+    _saida(agregados.estatisticas())
+    return 0
+
+
+def cmd_memory(args: argparse.Namespace) -> int:
+    """Carrega o arquivo de dados em um CadastroPessoas e mede sua memória"""
+    from models.pessoa import Pessoa, CadastroPessoas
+    from models.memoria import medir_alocacoes, perfil_memoria, projetar_memoria
+
+    def carregar() -> CadastroPessoas:
+        cadastro = CadastroPessoas()
+        for dados in _ler_dados(args.dados):
+            cadastro.adicionar(Pessoa.from_dict(dados))
+        return cadastro
+
+    cadastro, alocacoes = medir_alocacoes(carregar)
+    perfil = perfil_memoria(cadastro)
+    resultado = {**perfil, 'tracemalloc': alocacoes}
+    if args.projetar and perfil['registros']:
+        resultado['projecao'] = projetar_memoria(perfil, args.projetar)
+    _saida(resultado)
+    return 0
+
+
+def cmd_dedup(args: argparse.Namespace) -> int:
+    """Procura duplicados no arquivo de dados, do grupo mais provável para o menos"""
+    from models.pessoa import Pessoa
+    from models.duplicados import DetectorDuplicados
+
+    def resumo(pessoa: Pessoa) -> Dict[str, Any]:
+        return {'nome': pessoa.nome, 'cpf': pessoa.cpf_formatado, 'ano_nascimento': pessoa.ano_nascimento,
+                'email': pessoa.email, 'telefone': pessoa.telefone}
+
+    detector = DetectorDuplicados(args.limiar, args.janela)
+    grupos = detector.detectar(Pessoa.from_dict(dados) for dados in _ler_dados(args.dados))
+    for grupo in grupos[:args.limite or None]:
+        _saida({
+            'pontuacao': grupo['pontuacao'],
+            'pessoas': [resumo(pessoa) for pessoa in grupo['pessoas']],
+            'pares': [{'cpfs': [a.cpf_formatado, b.cpf_formatado], 'pontuacao': pontuacao, 'motivos': motivos}
+                      for a, b, pontuacao, motivos in grupo['pares']],
+        })
+    print(json.dumps(detector.estatisticas), file=sys.stderr)
+    return 0
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    """Exporta o arquivo de dados como relatório de texto, CSV ou JSONL"""
+    formato = args.formato or os.path.splitext(args.arquivo)[1].lstrip('.').lower() or 'txt'
+    registros = [_registro_atual(dados) for dados in _ler_dados(args.dados)]
+
+    if formato == 'txt':
+        from models.pessoa import Pessoa
+        from models.snapshot import CadastroSnapshot
+        total = CadastroSnapshot([Pessoa.from_dict(dados) for dados in registros]).exportar_dados(args.arquivo)
+    elif formato == 'csv':
+        import csv
+        with open(args.arquivo, 'w', encoding='utf-8', newline='') as arquivo:
+            escritor = csv.DictWriter(arquivo, fieldnames=CAMPOS, extrasaction='ignore')
+            escritor.writeheader()
+            escritor.writerows({**dados, 'sexo': dados['sexo_dados']['entrada_original']}
+                               for dados in registros)
+        total = len(registros)
+    elif formato == 'jsonl':
+        with open(args.arquivo, 'w', encoding='utf-8') as arquivo:
+            for dados in registros:
+                arquivo.write(json.dumps(dados, ensure_ascii=False) + '\n')
+        total = len(registros)
+    else:
+        print(f'Formato de exportação inválido: {formato}', file=sys.stderr)
+        return 2
+
+    _saida({'exportados': total, 'arquivo': os.path.abspath(args.arquivo)})
+    return 0
+
+
+def _taxa(texto: str) -> float:
+    """Taxa entre 0 e 1 (exclusive) para o argparse"""
+    try:
+        taxa = float(texto)
+    except ValueError:
+        taxa = -1.0
+    if not 0 < taxa < 1:
+        raise argparse.ArgumentTypeError(f'taxa deve estar entre 0 e 1 (exclusive): {texto}')
+    return taxa
+
+
+def _argumento_filtro(comando: argparse.ArgumentParser) -> None:
+    """Opção da taxa de falsos positivos do filtro de Bloom de CPFs"""
+    comando.add_argument('--falsos-positivos', type=_taxa, default=0.01, metavar='TAXA',
+                         help='taxa de falsos positivos do filtro de CPFs (padrão: 0.01)')
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    """Monta o parser dos subcomandos"""
+    parser = argparse.ArgumentParser(prog='main.py', description='Ficha Cadastral (modo não interativo)')
+    parser.add_argument('--dados', default=os.environ.get('FICHA_DADOS', ARQUIVO_PADRAO),
+                        help=f'arquivo JSONL do cadastro (padrão: $FICHA_DADOS ou {ARQUIVO_PADRAO})')
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    for nome, funcao in (('import', cmd_import), ('validate', cmd_validate)):
+        comando = sub.add_parser(nome, help=funcao.__doc__)
+        comando.add_argument('arquivo', help="CSV ou JSONL ('-' para stdin)")
+        comando.add_argument('--formato', choices=['csv', 'jsonl'])
+        if funcao is cmd_import:
+            _argumento_filtro(comando)
+        comando.set_defaults(funcao=funcao)
+
+    comando = sub.add_parser('get', help=cmd_get.__doc__)
+    comando.add_argument('cpf')
+    comando.set_defaults(funcao=cmd_get)
+
+    comando = sub.add_parser('search', help=cmd_search.__doc__)
+    comando.add_argument('termo', nargs='?', default='')
+    comando.add_argument('--ano', type=int, help='ano de nascimento')
+    comando.add_argument('--limite', type=int, default=0, help='máximo de resultados (0 = todos)')
+    comando.set_defaults(funcao=cmd_search)
+
+    comando = sub.add_parser('index', help=cmd_index.__doc__)
+    _argumento_filtro(comando)
+    comando.set_defaults(funcao=cmd_index)
+
+    comando = sub.add_parser('stats', help=cmd_stats.__doc__)
+    comando.set_defaults(funcao=cmd_stats)
+
+    comando = sub.add_parser('memory', help=cmd_memory.__doc__)
+    comando.add_argument('--projetar', type=int, metavar='N', help='projeta a memória para N registros')
+    comando.set_defaults(funcao=cmd_memory)
+
+    comando = sub.add_parser('dedup', help=cmd_dedup.__doc__)
+    comando.add_argument('--limiar', type=float, default=0.85, help='pontuação mínima de um par (0 a 1)')
+    comando.add_argument('--janela', type=int, default=10, help='vizinhos comparados nos blocos grandes')
+    comando.add_argument('--limite', type=int, default=0, help='máximo de grupos (0 = todos)')
+    comando.set_defaults(funcao=cmd_dedup)
+
+    comando = sub.add_parser('export', help=cmd_export.__doc__)
+    comando.add_argument('arquivo')
+    comando.add_argument('--formato', choices=['txt', 'csv', 'jsonl'])
+    comando.set_defaults(funcao=cmd_export)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Função Principal da linha de comando"""
+    args = criar_parser().parse_args(argv)
+    try:
+        return args.funcao(args)
+    except FileNotFoundError as e:
+        print(f'[ERRO] Arquivo não encontrado: {e.filename}', file=sys.stderr)
+        return 2
+    except ValueError as e:
+        #ex.: índice corrompido; `index` o reconstrói
+        print(f'[ERRO] {e}', file=sys.stderr)
+        return 2
+    except BrokenPipeError:
+        #saída fechada antes do fim (ex.: `| head`)
+        sys.stderr.close()
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
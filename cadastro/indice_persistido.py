@@ -0,0 +1,593 @@
+"""
+Índices persistidos do arquivo de dados JSONL da linha de comando.
+
+Os índices de CPF, ano de nascimento e nome (tokens) são gravados ao lado
+do arquivo de dados (`<dados>.idx`) em formato binário versionado; na
+abertura o arquivo é mapeado em memória (mmap) e cada seção só é validada
+(CRC32) e interpretada no primeiro uso, então reiniciar não reconstrói nada.
+
+Layout:
+
+    cabeçalho   magic 'FCIX', versão, nº de seções, linhas, tamanho e mtime do arquivo de dados
+    seções      (nome, offset, bytes, crc32) de cada seção
+    dados       vetores int64 alinhados em 8 bytes e texto UTF-8
+
+Os valores dos índices são offsets (em bytes) das linhas no arquivo de dados.
+Listas por chave usam o formato CSR: `inicios[i]:inicios[i + 1]` delimita
+os offsets da i-ésima chave. Os sufixos dos tokens ficam ordenados
+(`suf_posi`/`suf_toke`), então a busca por trecho do nome é uma busca binária.
+
+Linhas incluídas no fim do arquivo depois do índice (importação) vão para
+um delta, `<dados>.idx.delta`: cabeçalho com o carimbo do índice base e do
+arquivo de dados, seguido de uma linha JSON `[offset, cpf, ano, tokens]`
+por registro. Atualizar custa O(linhas novas); quando o delta passa de uma
+fração do índice base, os dois são reconstruídos juntos (`atualizar_indice`).
+
+Junto com o índice é gravado `<dados>.bloom`, um filtro de Bloom dos CPFs
+(tamanho e mtime do arquivo de dados + models.sketches.FiltroBloom), com
+folga para crescer. `IndicePersistido.contem_cpf` só procura no índice os
+CPFs que o filtro diz que talvez existam, e `atualizar_indice` inclui no
+filtro os CPFs das linhas novas e o regrava com o carimbo novo; o filtro só
+é recriado com o índice base ou quando passa da capacidade.
+"""
+
+import json
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from bisect import bisect_left
+from itertools import chain
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from models.sketches import FiltroBloom
+from models.tokens_nome import dobrar
+from validacao.cpf import limpar_cpf
+
+MAGIC = b'FCIX'
+VERSAO_FORMATO = 3
+EXTENSAO = '.idx'
+
+EXTENSAO_DELTA = '.delta'
+MAGIC_DELTA = b'FCID'
+#magic, formato, linhas, tamanho e mtime do índice base, tamanho e mtime dos dados
+CABECALHO_DELTA = struct.Struct('<4sHxxQQQQQ')
+#O delta é incorporado ao índice base quando passa de max(mínimo, linhas do base / fração)
+DELTA_MINIMO = 1024
+FRACAO_DELTA = 8
+
+EXTENSAO_FILTRO = '.bloom'
+CABECALHO_FILTRO = struct.Struct('<QQ') #tamanho e mtime do arquivo de dados
+#Taxa de falsos positivos padrão e folga do filtro (capacidade = linhas × folga)
+TAXA_FILTRO = 0.01
+FOLGA_FILTRO = 2
+CAPACIDADE_MINIMA_FILTRO = 1024
+
+CABECALHO = struct.Struct('<4sHHQQQ') #magic, formato, seções, linhas, tamanho e mtime dos dados
+SECAO = struct.Struct('<8sQQI4x') #nome, offset, bytes, crc32
+
+#Nome da seção -> formato do array
+SECOES = {
+    'cpf_chav': 'q', 'cpf_offs': 'q',
+    'ano_chav': 'q', 'ano_inic': 'q', 'ano_offs': 'q',
+    'tok_text': 'B', 'tok_desl': 'q', 'tok_inic': 'q', 'tok_offs': 'q',
+    'suf_posi': 'q', 'suf_toke': 'q',
+}
+
+
+def caminho_indice(caminho_dados: str) -> str:
+    """Caminho do arquivo de índices de um arquivo de dados"""
+    return caminho_dados + EXTENSAO
+
+
+def caminho_delta(caminho_dados: str) -> str:
+    """Caminho do delta do índice (linhas incluídas depois do índice base)"""
+    return caminho_indice(caminho_dados) + EXTENSAO_DELTA
+
+
+def caminho_filtro(caminho_dados: str) -> str:
+    """Caminho do filtro de Bloom de CPFs de um arquivo de dados"""
+    return caminho_dados + EXTENSAO_FILTRO
+
+
+def tokens_nome(nome: str) -> List[str]:
+    """Palavras do nome em minúsculas e sem acentos, sem repetição"""
+    return sorted(set(dobrar(nome).split()))
+
+
+def _linhas(caminho_dados: str, inicio: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """(offset, registro) de cada linha do arquivo de dados, a partir do byte `inicio`"""
+    with open(caminho_dados, 'rb') as arquivo:
+        arquivo.seek(inicio)
+        offset = inicio
+        for linha in arquivo:
+            if linha.strip():
+                yield offset, json.loads(linha)
+            offset += len(linha)
+
+
+def _entrada(offset: int, dados: Dict[str, Any]) -> Tuple[int, Optional[int], int, List[str]]:
+    """(offset, CPF como inteiro ou None, ano, tokens do nome) de um registro"""
+    cpf = limpar_cpf(dados['cpf'])
+    return offset, int(cpf) if len(cpf) == 11 else None, dados['ano_nascimento'], tokens_nome(dados['nome'])
+
+
+def _csr(grupos: Dict[Any, List[int]]) -> Tuple[List[Any], array, array]:
+    """Chaves ordenadas, inícios e offsets concatenados de um dicionário de listas"""
+    chaves = sorted(grupos)
+    inicios = array('q', [0])
+    offsets = array('q')
+    for chave in chaves:
+        offsets.extend(grupos[chave])
+        inicios.append(len(offsets))
+    return chaves, inicios, offsets
+
+
+def _sufixos(chaves_token: List[str], texto: bytes, deslocamentos: array) -> Tuple[array, array]:
+    """Início de cada sufixo dos tokens no texto e o token dele, em ordem de sufixo"""
+    sufixos = []
+    for i in range(len(chaves_token)):
+        fim = deslocamentos[i + 1]
+        for posicao in range(deslocamentos[i], fim):
+            #só inícios de caractere: um trecho UTF-8 válido não começa no meio de um
+            if texto[posicao] & 0xC0 != 0x80:
+                sufixos.append((texto[posicao:fim], posicao, i))
+    sufixos.sort()
+    return array('q', (posicao for _, posicao, _ in sufixos)), array('q', (i for _, _, i in sufixos))
+
+
+def construir_indice(caminho_dados: str, destino: Optional[str] = None,
+                     taxa_falsos_positivos: float = TAXA_FILTRO) -> int:
+    """
+    Constrói e grava os índices de um arquivo de dados, e o filtro de CPFs
+
+    Os arquivos são escritos em temporários e renomeados, então leitores
+    nunca veem um índice pela metade. Um delta anterior deixa de valer.
+
+    Args:
+        caminho_dados: Arquivo JSONL do cadastro
+        destino: Caminho do índice (padrão: `<dados>.idx`)
+        taxa_falsos_positivos: Taxa do filtro de Bloom (`<dados>.bloom`)
+
+    Returns:
+        int: Número de linhas indexadas
+
+    """
+    destino = destino or caminho_indice(caminho_dados)
+    cpfs: List[Tuple[int, int]] = []
+    anos: Dict[int, List[int]] = {}
+    tokens: Dict[str, List[int]] = {}
+    linhas = 0
+    for offset, dados in _linhas(caminho_dados):
+        linhas += 1
+        _, cpf, ano, tokens_linha = _entrada(offset, dados)
+        if cpf is not None:
+            cpfs.append((cpf, offset))
+        anos.setdefault(ano, []).append(offset)
+        for token in tokens_linha:
+            tokens.setdefault(token, []).append(offset)
+    cpfs.sort()
+
+    chaves_ano, ano_inic, ano_offs = _csr(anos)
+    chaves_token, tok_inic, tok_offs = _csr(tokens)
+    tok_desl = array('q', [0])
+    texto = bytearray()
+    for token in chaves_token:
+        texto += token.encode('utf-8')
+        tok_desl.append(len(texto))
+    suf_posi, suf_toke = _sufixos(chaves_token, bytes(texto), tok_desl)
+
+    secoes = {
+        'cpf_chav': array('q', (cpf for cpf, _ in cpfs)),
+        'cpf_offs': array('q', (offset for _, offset in cpfs)),
+        'ano_chav': array('q', chaves_ano),
+        'ano_inic': ano_inic,
+        'ano_offs': ano_offs,
+        'tok_text': texto,
+        'tok_desl': tok_desl,
+        'tok_inic': tok_inic,
+        'tok_offs': tok_offs,
+        'suf_posi': suf_posi,
+        'suf_toke': suf_toke,
+    }
+
+    estado = os.stat(caminho_dados)
+    posicao = CABECALHO.size + SECAO.size * len(SECOES)
+    tabela = []
+    corpo = []
+    for nome in SECOES:
+        dados = memoryview(secoes[nome]).cast('B')
+        preenchimento = -posicao % 8
+        corpo.append(b'\0' * preenchimento)
+        posicao += preenchimento
+        tabela.append(SECAO.pack(nome.encode('ascii'), posicao, len(dados), zlib.crc32(dados)))
+        corpo.append(dados)
+        posicao += len(dados)
+
+    temporario = f'{destino}.{os.getpid()}.tmp'
+    with open(temporario, 'wb') as arquivo:
+        arquivo.write(CABECALHO.pack(MAGIC, VERSAO_FORMATO, len(SECOES), linhas,
+                                     estado.st_size, estado.st_mtime_ns))
+        for entrada in tabela:
+            arquivo.write(entrada)
+        for parte in corpo:
+            arquivo.write(parte)
+    os.replace(temporario, destino)
+    if destino == caminho_indice(caminho_dados):
+        try:
+            os.remove(caminho_delta(caminho_dados))
+        except FileNotFoundError:
+            pass
+
+    _gravar_filtro(caminho_dados, _novo_filtro((cpf for cpf, _ in cpfs), linhas, taxa_falsos_positivos), estado)
+    return linhas
+
+
+def atualizar_indice(caminho_dados: str, indice: Optional['IndicePersistido'],
+                     taxa_falsos_positivos: float = TAXA_FILTRO) -> int:
+    """
+    Indexa as linhas incluídas no fim do arquivo de dados depois de `indice`
+
+    As linhas novas vão para o delta e os CPFs delas para o filtro de Bloom
+    do índice, sem reler o arquivo todo; se não houver índice em dia
+    (`indice` None) ou o delta ficar grande, reconstrói tudo.
+
+    Args:
+        caminho_dados: Arquivo JSONL do cadastro
+        indice: Índice aberto (em dia) antes das inclusões, ou None
+        taxa_falsos_positivos: Taxa do filtro de Bloom, se ele for recriado
+
+    Returns:
+        int: Número de linhas indexadas (base + delta)
+
+    """
+    if indice is None:
+        return construir_indice(caminho_dados, taxa_falsos_positivos=taxa_falsos_positivos)
+    novas = [_entrada(offset, dados) for offset, dados in _linhas(caminho_dados, indice.tamanho_coberto)]
+    linhas_delta = indice.linhas_delta + len(novas)
+    if linhas_delta > max(DELTA_MINIMO, indice.linhas_base // FRACAO_DELTA):
+        return construir_indice(caminho_dados, taxa_falsos_positivos=taxa_falsos_positivos)
+
+    estado = os.stat(caminho_dados)
+    caminho = caminho_delta(caminho_dados)
+    cabecalho = CABECALHO_DELTA.pack(MAGIC_DELTA, VERSAO_FORMATO, linhas_delta,
+                                     indice.tamanho_dados, indice.mtime_dados,
+                                     estado.st_size, estado.st_mtime_ns)
+    corpo = ''.join(json.dumps(entrada, ensure_ascii=False) + '\n' for entrada in novas).encode('utf-8')
+    if indice.linhas_delta:
+        #inclui as entradas e só então o carimbo: se parar no meio, o delta fica desatualizado
+        with open(caminho, 'r+b') as arquivo:
+            arquivo.seek(indice.fim_delta)
+            arquivo.write(corpo)
+            arquivo.truncate()
+            arquivo.seek(0)
+            arquivo.write(cabecalho)
+    else:
+        _gravar(caminho, cabecalho + corpo)
+
+    cpfs_novos = [cpf for _, cpf, _, _ in novas if cpf is not None]
+    filtro = indice.filtro
+    if filtro is None or filtro.quantidade + len(cpfs_novos) > filtro.capacidade:
+        #sem filtro em dia, ou cheio (a taxa real subiria): recria com folga
+        filtro = _novo_filtro(chain(indice.cpfs(), cpfs_novos), indice.linhas_base + linhas_delta,
+                              filtro.taxa_falsos_positivos if filtro else taxa_falsos_positivos)
+    else:
+        for cpf in cpfs_novos:
+            filtro.adicionar(f'{cpf:011d}')
+    _gravar_filtro(caminho_dados, filtro, estado)
+    return indice.linhas_base + linhas_delta
+
+
+def _novo_filtro(cpfs: Iterable[int], linhas: int, taxa_falsos_positivos: float) -> FiltroBloom:
+    """Filtro de Bloom dos CPFs, com folga para o arquivo crescer"""
+    filtro = FiltroBloom(max(CAPACIDADE_MINIMA_FILTRO, linhas * FOLGA_FILTRO), taxa_falsos_positivos)
+    for cpf in cpfs:
+        filtro.adicionar(f'{cpf:011d}')
+    return filtro
+
+
+def _gravar_filtro(caminho_dados: str, filtro: FiltroBloom, estado: os.stat_result) -> None:
+    """Grava o filtro de Bloom dos CPFs com o carimbo do arquivo de dados"""
+    _gravar(caminho_filtro(caminho_dados),
+            CABECALHO_FILTRO.pack(estado.st_size, estado.st_mtime_ns) + filtro.para_bytes())
+
+
+def _gravar(caminho: str, dados: bytes) -> None:
+    """Grava um arquivo de uma vez (temporário + rename)"""
+    temporario = f'{caminho}.{os.getpid()}.tmp'
+    with open(temporario, 'wb') as arquivo:
+        arquivo.write(dados)
+    os.replace(temporario, caminho)
+
+
+def abrir_filtro(caminho_dados: str) -> Optional[FiltroBloom]:
+    """
+    Filtro de Bloom dos CPFs de um arquivo de dados, se existir e estiver em dia
+
+    Returns:
+        FiltroBloom ou None (sem filtro, desatualizado ou inválido)
+
+    """
+    try:
+        estado = os.stat(caminho_dados)
+        with open(caminho_filtro(caminho_dados), 'rb') as arquivo:
+            dados = arquivo.read()
+        carimbo = CABECALHO_FILTRO.unpack_from(dados, 0)
+        if carimbo != (estado.st_size, estado.st_mtime_ns):
+            return None
+        return FiltroBloom.de_bytes(dados[CABECALHO_FILTRO.size:])
+    except (OSError, struct.error, ValueError):
+        return None
+
+
+def _faixa(quantidade: int, alvo: bytes, chave: Callable[[int], bytes]) -> Tuple[int, int]:
+    """
+    Faixa [primeiro, último) das posições cuja chave é igual a `alvo`
+
+    Busca binária sobre as posições 0..quantidade-1, com `chave` em ordem
+    crescente (o `key=` de bisect só existe a partir do Python 3.10).
+
+    """
+    inicio, fim = 0, quantidade
+    while inicio < fim:
+        meio = (inicio + fim) // 2
+        if chave(meio) < alvo:
+            inicio = meio + 1
+        else:
+            fim = meio
+    primeiro, fim = inicio, quantidade
+    while inicio < fim:
+        meio = (inicio + fim) // 2
+        if chave(meio) <= alvo:
+            inicio = meio + 1
+        else:
+            fim = meio
+    return primeiro, inicio
+
+
+class IndicePersistido:
+    """
+    Índices de um arquivo de dados, mapeados em memória e lidos sob demanda.
+
+    Use `IndicePersistido.abrir`, que devolve None se o índice não existir,
+    for de outra versão ou estiver desatualizado em relação aos dados. As
+    consultas juntam o índice base e o delta (lido no primeiro uso); offsets
+    do delta vêm depois dos do base, então a ordem de arquivo se mantém.
+    O filtro de Bloom dos CPFs (`filtro`, None se não estiver em dia) é
+    aberto junto e mantido por `atualizar_indice`.
+
+    """
+
+    def __init__(self, caminho: str):
+        """
+        Mapeia o arquivo de índices e lê o cabeçalho
+
+        Raises:
+            ValueError: Se o arquivo não estiver no formato esperado
+
+        """
+        with open(caminho, 'rb') as arquivo:
+            self._mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mapa)
+        self._cache: Dict[str, memoryview] = {}
+        try:
+            magic, formato, quantidade, self.linhas_base, self.tamanho_dados, self.mtime_dados = \
+                CABECALHO.unpack_from(self._buffer, 0)
+            if magic != MAGIC or formato != VERSAO_FORMATO:
+                raise ValueError('Índice em formato incompatível')
+            self._secoes = {}
+            for i in range(quantidade):
+                nome, offset, tamanho, crc = SECAO.unpack_from(self._buffer, CABECALHO.size + i * SECAO.size)
+                self._secoes[nome.rstrip(b'\0').decode('ascii')] = (offset, tamanho, crc)
+        except (struct.error, ValueError):
+            self.fechar()
+            raise ValueError(f'Índice inválido: {caminho}')
+        #delta: nenhum até `_anexar_delta`
+        self.linhas_delta = 0
+        self.tamanho_coberto = self.tamanho_dados
+        self._caminho_delta: Optional[str] = None
+        self._delta: Optional[Tuple[Dict[int, int], Dict[int, List[int]], Dict[str, List[int]]]] = None
+        self._fim_delta = CABECALHO_DELTA.size
+        self.filtro: Optional[FiltroBloom] = None
+        #CPFs que o filtro deixou passar e não estavam no índice
+        self.falsos_positivos = 0
+
+    @classmethod
+    def abrir(cls, caminho_dados: str) -> Optional['IndicePersistido']:
+        """
+        Abre o índice de um arquivo de dados, se ele existir e estiver em dia
+
+        Returns:
+            IndicePersistido ou None
+
+        """
+        try:
+            estado = os.stat(caminho_dados)
+            indice = cls(caminho_indice(caminho_dados))
+        except (OSError, ValueError):
+            return None
+        atual = (estado.st_size, estado.st_mtime_ns)
+        if (indice.tamanho_dados, indice.mtime_dados) != atual and not indice._anexar_delta(
+                caminho_delta(caminho_dados), atual):
+            indice.fechar()
+            return None
+        indice.filtro = abrir_filtro(caminho_dados)
+        return indice
+
+    def _anexar_delta(self, caminho: str, estado_dados: Tuple[int, int]) -> bool:
+        """
+        Usa o delta se ele partir deste índice base e cobrir o arquivo de dados
+
+        Returns:
+            bool: True se o delta foi anexado
+
+        """
+        try:
+            with open(caminho, 'rb') as arquivo:
+                magic, formato, linhas, tamanho_base, mtime_base, tamanho, mtime = \
+                    CABECALHO_DELTA.unpack(arquivo.read(CABECALHO_DELTA.size))
+        except (OSError, struct.error):
+            return False
+        if (magic != MAGIC_DELTA or formato != VERSAO_FORMATO
+                or (tamanho_base, mtime_base) != (self.tamanho_dados, self.mtime_dados)
+                or (tamanho, mtime) != estado_dados):
+            return False
+        self.linhas_delta = linhas
+        self.tamanho_coberto = tamanho
+        self._caminho_delta = caminho
+        return True
+
+    def _dados_delta(self) -> Tuple[Dict[int, int], Dict[int, List[int]], Dict[str, List[int]]]:
+        """Delta lido (na primeira vez): CPF -> offset, ano -> offsets e token -> offsets"""
+        if self._delta is None:
+            cpfs: Dict[int, int] = {}
+            anos: Dict[int, List[int]] = {}
+            tokens: Dict[str, List[int]] = {}
+            if self._caminho_delta is not None:
+                with open(self._caminho_delta, 'rb') as arquivo:
+                    arquivo.seek(CABECALHO_DELTA.size)
+                    for _ in range(self.linhas_delta):
+                        linha = arquivo.readline()
+                        self._fim_delta += len(linha)
+                        offset, cpf, ano, tokens_linha = json.loads(linha)
+                        if cpf is not None:
+                            cpfs.setdefault(cpf, offset)
+                        anos.setdefault(ano, []).append(offset)
+                        for token in tokens_linha:
+                            tokens.setdefault(token, []).append(offset)
+            self._delta = (cpfs, anos, tokens)
+        return self._delta
+
+    @property
+    def linhas(self) -> int:
+        """Linhas indexadas (base + delta)"""
+        return self.linhas_base + self.linhas_delta
+
+    @property
+    def fim_delta(self) -> int:
+        """Byte do delta logo após a última entrada válida"""
+        self._dados_delta()
+        return self._fim_delta
+
+    def _secao(self, nome: str) -> memoryview:
+        """
+        Seção já interpretada; na primeira vez confere o CRC32
+
+        Raises:
+            ValueError: Se a seção estiver corrompida
+
+        """
+        if nome not in self._cache:
+            offset, tamanho, crc = self._secoes[nome]
+            bruto = self._buffer[offset:offset + tamanho]
+            valida = zlib.crc32(bruto) == crc
+            if valida:
+                self._cache[nome] = bruto.cast(SECOES[nome])
+            #libera já a fatia, senão o mmap não fecha enquanto a exceção existir
+            bruto.release()
+            if not valida:
+                raise ValueError(f'Índice corrompido (seção {nome})')
+        return self._cache[nome]
+
+    def cpfs(self) -> Iterator[int]:
+        """CPFs indexados como inteiros (os do base em ordem crescente, depois os do delta)"""
+        return chain(self._secao('cpf_chav'), self._dados_delta()[0])
+
+    def offset_cpf(self, cpf: str) -> Optional[int]:
+        """Offset da linha com o CPF (busca binária no base, depois o delta), ou None"""
+        cpf_limpo = limpar_cpf(cpf)
+        if len(cpf_limpo) != 11:
+            return None
+        chaves = self._secao('cpf_chav')
+        alvo = int(cpf_limpo)
+        i = bisect_left(chaves, alvo)
+        if i < len(chaves) and chaves[i] == alvo:
+            return self._secao('cpf_offs')[i]
+        return self._dados_delta()[0].get(alvo)
+
+    def contem_cpf(self, cpf: str) -> bool:
+        """
+        True se o CPF está indexado
+
+        Com o filtro de Bloom, CPFs que com certeza não estão nem chegam à
+        busca no índice; os que passam e não estão contam em `falsos_positivos`.
+
+        """
+        if self.filtro is not None and limpar_cpf(cpf) not in self.filtro:
+            return False
+        encontrado = self.offset_cpf(cpf) is not None
+        if self.filtro is not None:
+            self.falsos_positivos += not encontrado
+        return encontrado
+
+    def offsets_ano(self, ano: int) -> List[int]:
+        """Offsets das linhas com o ano de nascimento informado"""
+        chaves = self._secao('ano_chav')
+        i = bisect_left(chaves, ano)
+        offsets = []
+        if i < len(chaves) and chaves[i] == ano:
+            inicios = self._secao('ano_inic')
+            offsets = self._secao('ano_offs')[inicios[i]:inicios[i + 1]].tolist()
+        return offsets + self._dados_delta()[1].get(ano, [])
+
+    def offsets_nome(self, termo: str) -> List[int]:
+        """
+        Candidatos a conter `termo` no nome, em ordem de arquivo
+
+        Todo nome que contém o termo tem um token que contém o maior trecho
+        sem espaços do termo; o chamador ainda confere o nome completo. Os
+        tokens do base que contêm o trecho são os que têm um sufixo começando
+        por ele: uma faixa contígua dos sufixos ordenados, achada com bisect.
+
+        """
+        trechos = dobrar(termo).split()
+        if not trechos:
+            return []
+        trecho = max(trechos, key=len)
+        alvo = trecho.encode('utf-8')
+        texto, deslocamentos = self._secao('tok_text'), self._secao('tok_desl')
+        posicoes, tokens_sufixo = self._secao('suf_posi'), self._secao('suf_toke')
+        inicios, offsets = self._secao('tok_inic'), self._secao('tok_offs')
+
+        def prefixo(j: int) -> bytes:
+            """Começo do j-ésimo sufixo, do tamanho do trecho"""
+            posicao = posicoes[j]
+            return texto[posicao:min(posicao + len(alvo), deslocamentos[tokens_sufixo[j] + 1])].tobytes()
+
+        primeiro, ultimo = _faixa(len(posicoes), alvo, prefixo)
+        tokens = {tokens_sufixo[j] for j in range(primeiro, ultimo)}
+        candidatos = set()
+        for i in tokens:
+            candidatos.update(offsets[inicios[i]:inicios[i + 1]].tolist())
+        resultado = sorted(candidatos)
+
+        #delta: pequeno (ver FRACAO_DELTA), percorre os tokens
+        do_delta = set()
+        for token, offsets_token in self._dados_delta()[2].items():
+            if trecho in token:
+                do_delta.update(offsets_token)
+        return resultado + sorted(do_delta)
+
+    def fechar(self) -> None:
+        """Libera o mapeamento em memória"""
+        for secao in self._cache.values():
+            secao.release()
+        self._cache = {}
+        self._buffer.release()
+        self._mapa.close()
+
+    def __len__(self) -> int:
+        return self.linhas
+
+    def __enter__(self) -> 'IndicePersistido':
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.fechar()
+
+
+def ler_linha(arquivo, offset: int) -> Dict[str, Any]:
+    """Lê o registro que começa em `offset` de um arquivo de dados aberto em modo binário"""
+    arquivo.seek(offset)
+    return json.loads(arquivo.readline())
@@ -14,7 +14,17 @@ GitHub: https://github.com/viniciussandradee
 
 import sys
 import os
+
+#Com argumentos, roda a linha de comando não interativa antes de importar o menu
+if __name__ == '__main__' and len(sys.argv) > 1:
+    from cadastro.cli import main as main_cli
+    sys.exit(main_cli(sys.argv[1:]))
+
 import time
+try:
+    import readline #TAB completa nomes na busca (não existe no Windows)
+except ImportError:
+    readline = None
 if 'TERM' not in os.environ:
     os.environ['TERM'] = 'xterm-256color'
 from datetime import datetime
@@ -25,13 +35,27 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models.pessoa import Pessoa, CadastroPessoas, criar_pessoa_interativo
 from validacao.sexo import ValidadorGenero, formatar_sexo
+from validacao.cpf import REGIOES_FISCAIS
+from models.metricas import METRICAS, habilitar_metricas, desabilitar_metricas
+from models.consultas_lentas import LogConsultasLentas
 
 class SistemaCadastro:
     """Classe principal do sistema de Ficha Cadastral"""
 
     def __init__(self):
         """Inicializa o sistema"""
-        self.cadastro = CadastroPessoas()
+        #Log de consultas lentas com FICHA_CONSULTAS_LENTAS=<limite em ms>
+        limite = os.environ.get('FICHA_CONSULTAS_LENTAS')
+        log_consultas = None
+        if limite:
+            try:
+                log_consultas = LogConsultasLentas(limite_ms=float(limite))
+            except ValueError:
+                print(f'[AVISO] FICHA_CONSULTAS_LENTAS inválido ({limite!r}): log de consultas lentas desativado')
+        self.cadastro = CadastroPessoas(log_consultas=log_consultas)
+        #Métricas de latência desde o início com FICHA_METRICAS=1
+        if os.environ.get('FICHA_METRICAS') == '1':
+            habilitar_metricas()
         self.carregar_dados()
 
     def carregar_dados(self):
@@ -105,6 +129,7 @@ class SistemaCadastro:
         print('6. [INFO] Opções de Gêneros Disponíveis')
         print('7. [EXPORTAR] Exportar Dados')
         print('8. [AJUDA] Ajuda /Sobre o Sistema')
+        print('9. [MÉTRICAS] Métricas de Desempenho')
         print('0. [SAIR] Sair do Sistema')
         print('\n' + '-' * 60)
 
@@ -149,7 +174,8 @@ class SistemaCadastro:
         if ver_detalhes == 's':
             try:
                 #Pede o número que o usuario viu na lista (1, 2, 3, ...)
-                total = len(self.cadastro.pessoas)
+                pessoas = self.cadastro.pessoas
+                total = len(pessoas)
                 numero_str = input(f'Digite o número da pessoa (Entre 1 - {total}): ')
                 numero = int(numero_str)
 
@@ -163,7 +189,7 @@ class SistemaCadastro:
 
                 #Mostra todos os detalhes
                 print('\n' + '-' * 50)
-                print(self.cadastro.pessoas[indice])
+                print(pessoas[indice])
 
             except ValueError:
                 print('[ERRO] Por favor, digite um número válido!')
@@ -197,7 +223,7 @@ class SistemaCadastro:
         print('BUSCAR POR NOME')
         print('-' * 50)
 
-        nome = input('Digite o nome (ou parte dele): ').strip()
+        nome = self._ler_nome_com_sugestoes('Digite o nome (ou parte dele): ').strip()
 
         if not nome:
             print('[ERRO] Nome não pode ser vazio!')
@@ -227,6 +253,30 @@ class SistemaCadastro:
                 except ValueError:
                     print('[ERRO] Por favor, digite um número válido')
 
+    def _ler_nome_com_sugestoes(self, mensagem: str) -> str:
+        """input() com TAB completando a palavra atual com os nomes mais comuns do cadastro"""
+        if readline is None:
+            return input(mensagem)
+
+        sugestoes: List[str] = []
+
+        def completar(texto: str, estado: int) -> Optional[str]:
+            if estado == 0:
+                sugestoes[:] = [palavra for palavra, _ in self.cadastro.sugerir_nomes(texto)]
+            return sugestoes[estado] if estado < len(sugestoes) else None
+
+        anterior = readline.get_completer()
+        readline.set_completer(completar)
+        #o readline do macOS (libedit) usa outra sintaxe de atalhos
+        if 'libedit' in (readline.__doc__ or ''):
+            readline.parse_and_bind('bind ^I rl_complete')
+        else:
+            readline.parse_and_bind('tab: complete')
+        try:
+            return input(mensagem.replace(': ', ' [TAB sugere]: ', 1))
+        finally:
+            readline.set_completer(anterior)
+
     def mostrar_estatisticas(self):
         """Mostra Estatísticas do Cadastro"""
         print('\n' + '-' * 50)
@@ -237,16 +287,40 @@ class SistemaCadastro:
 
         print(f'Total de Pessoas: {estatisticas["total_pessoas"]}')
         print(f'Media de Idade: {estatisticas["media_idade"]} anos')
+        print(f'Mediana de Idade: {estatisticas["mediana_idade"]} anos')
+        for percentil, idade in estatisticas['percentis_idade'].items():
+            print(f'  Idade {percentil}: {idade} anos')
         print(f'Pessoas com Email: {estatisticas["pessoas_com_email"]}')
         print(f'Pessoas com Telefone: {estatisticas["pessoas_com_telefone"]}')
 
+        if estatisticas['distribuicao_uf']:
+            print('\nDistribuição por Estado (DDD do telefone)')
+            print('-' * 30)
+            for uf, quantidade in estatisticas['distribuicao_uf'].items():
+                print(f'* {uf}: {quantidade} pessoa(s)')
+
+        if estatisticas['distribuicao_regiao_fiscal']:
+            print('\nDistribuição por Região Fiscal (CPF)')
+            print('-' * 30)
+            for regiao, quantidade in estatisticas['distribuicao_regiao_fiscal'].items():
+                ufs = ', '.join(REGIOES_FISCAIS[regiao]['ufs'])
+                print(f'* {regiao}ª Região ({ufs}): {quantidade} pessoa(s)')
+
+        print('\nValores Distintos (aproximados)')
+        print('-' * 30)
+        distintos = estatisticas['distintos_aproximados']
+        print(f'Domínios de Email: ~{distintos["dominios_email"]}')
+        print(f'Telefones: ~{distintos["telefones"]}')
+        print(f'Sobrenomes: ~{distintos["sobrenomes"]}')
+
         print('\nDistribuição por Gênero')
         print('-' * 30)
 
         distribuicao = estatisticas['distribuicao_sexo']
         if distribuicao:
+            pessoas = self.cadastro.pessoas
             for codigo, quantidade in distribuicao.items():
-                exemplo = next((p for p in self.cadastro.pessoas if p.sexo == codigo), None)
+                exemplo = next((p for p in pessoas if p.sexo == codigo), None)
                 if exemplo:
                     display = exemplo.sexo_display
                 else:
@@ -289,37 +363,12 @@ class SistemaCadastro:
             print('[ERRO] Nenhum dado para exportar')
             return
 
-        timestamp = datetime.now().strftime('%Y/%m/%d %H:%M:%S')
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         nome_arquivo = f'Cadastro_pessoas_{timestamp}.txt'
 
         try:
-            with open(nome_arquivo, 'w', encoding = 'utf-8') as arquivo:
-                arquivo.write('-' * 60 + '\n')
-                arquivo.write('EXPORTAÇÃO DO SISTEMA DE FICHA CADASTRAL\n')
-                arquivo.write(f'Data: {datetime.now().strftime("%d/%m/%Y %H:%M:%S")}')
-                arquivo.write(f'Total de Pessoas: {len(self.cadastro)}\n')
-                arquivo.write('-' * 60 + '\n\n')
-
-                for i, pessoa in enumerate(self.cadastro.pessoas, 1):
-                    arquivo.write(str(pessoa))
-                    arquivo.write('\n\n')
-
-                #Estatisticas
-                estat = self.cadastro.estatisticas()
-                arquivo.write('-' * 60 + '\n')
-                arquivo.write('ESTATÍSTICAS DO CADASTRO\n')
-                arquivo.write('-' * 60 + '\n')
-                arquivo.write(f'Total: {estat["total_pessoas"]} pessoas\n')
-                arquivo.write(f'Media de Idade: {estat["media_idade"]} anos\n')
-                arquivo.write(f'Pessoas com Email: {estat["pessoas_com_email"]}\n')
-                arquivo.write(f'Pessoas com Telefone: {estat["pessoas_com_telefone"]}\n')
-
-                if estat['distribuicao_sexo']:
-                    arquivo.write("\nDistribuição Por Gênero:\n")
-                    for codigo, quantidade in estat['distribuicao_sexo'].items():
-                        exemplo = next((p for p in self.cadastro.pessoas if p.sexo == codigo), None)
-                        display = exemplo.sexo_display if exemplo else codigo
-                        arquivo.write(f'   {display}: {quantidade}\n')
+            #Snapshot: exporta uma visão consistente mesmo com novos cadastros
+            self.cadastro.snapshot().exportar_dados(nome_arquivo)
 
             print(f'[SUCESSO] Dados exportados com sucesso para: {nome_arquivo}')
             print(f'[ARQUIVO] Local: {os.path.abspath(nome_arquivo)}')
@@ -345,6 +394,7 @@ class SistemaCadastro:
         * Validação Inclusiva de gênero com múltiplas opções
         * Busca por CPF e Nome
         * Estatísticas detalhadas
+        * Métricas de desempenho (latência por operação)
         * Exportação de Dados
         * Interface amigável
         
@@ -397,6 +447,40 @@ class SistemaCadastro:
 
         print(comandos)
 
+    def mostrar_metricas(self):
+        """Mostra as métricas de latência e permite ativar, zerar e exportar"""
+        print('\n' + '-' * 50)
+        print('MÉTRICAS DE DESEMPENHO')
+        print('-' * 50)
+        print(f"Coleta: {'ATIVA' if METRICAS.habilitado else 'DESATIVADA'}")
+
+        resumo = METRICAS.resumo()
+        if resumo:
+            print(f"\n{'Operação':<36} {'Chamadas':>9} {'Média µs':>10} {'p50 µs':>9} {'p99 µs':>9} {'Máx µs':>10}")
+            print('-' * 88)
+            for operacao, dados in resumo.items():
+                print(f"{operacao:<36} {dados['chamadas']:>9} {dados['media_us']:>10} "
+                      f"{dados['p50_us']:>9} {dados['p99_us']:>9} {dados['max_us']:>10}")
+        else:
+            print('[VAZIO] Nenhuma medição ainda')
+
+        acao = input('\n[A] Ativar/Desativar  [Z] Zerar  [P] Exportar (Prometheus)  [ENTER] Voltar: ').strip().lower()
+        if acao == 'a':
+            if METRICAS.habilitado:
+                desabilitar_metricas()
+                print('[OK] Coleta de métricas desativada')
+            else:
+                habilitar_metricas()
+                print('[OK] Coleta de métricas ativada')
+        elif acao == 'z':
+            METRICAS.zerar()
+            print('[OK] Métricas zeradas')
+        elif acao == 'p':
+            nome_arquivo = f"metricas_{datetime.now().strftime('%Y%m%d_%H%M%S')}.prom"
+            with open(nome_arquivo, 'w', encoding='utf-8') as arquivo:
+                arquivo.write(METRICAS.prometheus())
+            print(f'[SUCESSO] Métricas exportadas para: {os.path.abspath(nome_arquivo)}')
+
     def sair_sistema(self):
         """Encerra o Sistema"""
         print('\n' + '-' * 50)
@@ -420,8 +504,9 @@ class SistemaCadastro:
     def executar(self):
         """Metódo Principal que executa o sistema"""
         try:
-            #Limpa a tela (funciona em Windows, Linux e Mac)
-            os.system('cls' if os.name == 'nt' else 'clear')
+            #Limpa a tela com sequência ANSI, sem abrir um shell
+            if sys.stdout.isatty():
+                print('\033[2J\033[H', end='', flush=True)
 
             #Exibe Logo:
             self.exibir_logo()
@@ -431,7 +516,7 @@ class SistemaCadastro:
                 self.exibir_menu_principal()
 
                 try:
-                    opcao = input('\nEscolha uma opção [0 - 8]: ').strip()
+                    opcao = input('\nEscolha uma opção [0 - 9]: ').strip()
                     if opcao == '0':
                         self.sair_sistema()
                         break
@@ -451,8 +536,10 @@ class SistemaCadastro:
                         self.exportar_dados()
                     elif opcao == '8':
                         self.mostrar_ajuda()
+                    elif opcao == '9':
+                        self.mostrar_metricas()
                     else:
-                        print('[ERRO] Opção Inválida! Por favor, digite um número de 0 a 8: ')
+                        print('[ERRO] Opção Inválida! Por favor, digite um número de 0 a 9: ')
 
                     if opcao not in ["0", "8"]:
                         time.sleep(0.5)
@@ -0,0 +1,267 @@
+"""
+Agregados parciais mescláveis das estatísticas do cadastro.
+Base de `CadastroPessoas.estatisticas` e da combinação de resultados de partições.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from models.sketches import HistogramaQuantis, HyperLogLog
+from validacao.contato import analisar_telefone
+from validacao.cpf import limpar_cpf, obter_regiao_fiscal
+from validacao.nome import extrair_sobrenome
+
+#Percentis de idade reportados em CadastroPessoas.estatisticas
+PERCENTIS_IDADE = (0.5, 0.9, 0.99)
+
+#Contadores de valores distintos aproximados (HyperLogLog)
+CONTADORES_DISTINTOS = ('dominios_email', 'telefones', 'sobrenomes')
+
+#Faixas etárias das tabelas cruzadas: (rótulo, idade mínima)
+FAIXAS_ETARIAS = (('0-17', 0), ('18-29', 18), ('30-44', 30), ('45-59', 45), ('60+', 60))
+
+
+def faixa_etaria(idade: int) -> str:
+    """Rótulo da faixa etária de uma idade"""
+    rotulo = FAIXAS_ETARIAS[0][0]
+    for nome, minimo in FAIXAS_ETARIAS:
+        if idade >= minimo:
+            rotulo = nome
+    return rotulo
+
+
+def valores_distintos(nome: str, email: Optional[str], telefone: Optional[str],
+                      telefone_dados: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Valores de uma pessoa que alimentam os contadores de distintos
+
+    Args:
+        nome: Nome completo
+        email: Email (opcional)
+        telefone: Telefone em texto livre (opcional)
+        telefone_dados: Resultado de `analisar_telefone`, se já calculado
+
+    Returns:
+        dict: {contador: valor normalizado}, só com os valores presentes
+
+    """
+    valores = {}
+    if email and '@' in email:
+        valores['dominios_email'] = email.rsplit('@', 1)[1].lower()
+    if telefone:
+        if telefone_dados is None:
+            telefone_dados = analisar_telefone(telefone)
+        telefone_limpo = telefone_dados['e164'] if telefone_dados else ''.join(filter(str.isdigit, telefone))
+        if telefone_limpo:
+            valores['telefones'] = telefone_limpo
+    sobrenome = extrair_sobrenome(nome)
+    if sobrenome:
+        valores['sobrenomes'] = sobrenome.lower()
+    return valores
+
+
+class AgregadosCadastro:
+    """
+    Agregados de um conjunto de pessoas, mescláveis entre partições.
+
+    Contagens e histogramas são somados e os HyperLogLog combinados por
+    máximo, então mesclar partições na mesma ordem sempre dá o mesmo resultado.
+
+    """
+
+    def __init__(self, precisao_hll: int = 12):
+        """Inicializa agregados vazios"""
+        self.total = 0
+        self.anos = HistogramaQuantis()
+        self.sexo: Dict[str, int] = {}
+        self.com_email = 0
+        self.com_telefone = 0
+        self.uf: Dict[str, int] = {}
+        self.regiao: Dict[int, int] = {}
+        self.distintos = {nome: HyperLogLog(precisao_hll) for nome in CONTADORES_DISTINTOS}
+
+    def registrar(self, nome: str, cpf: str, ano_nascimento: int, sexo: str,
+                  email: Optional[str] = None, telefone: Optional[str] = None) -> None:
+        """
+        Registra uma pessoa a partir dos seus campos
+
+        Args:
+            nome: Nome completo
+            cpf: CPF em qualquer formato
+            ano_nascimento: Ano de nascimento
+            sexo: Código simplificado do sexo/gênero (M, F, NB, O, X ou vazio)
+            email: Email (opcional)
+            telefone: Telefone em texto livre (opcional)
+
+        """
+        self.total += 1
+        self.anos.adicionar(ano_nascimento)
+        self.sexo[sexo] = self.sexo.get(sexo, 0) + 1
+
+        cpf_limpo = limpar_cpf(cpf)
+        if len(cpf_limpo) == 11:
+            regiao = obter_regiao_fiscal(cpf_limpo)
+            self.regiao[regiao] = self.regiao.get(regiao, 0) + 1
+
+        telefone_dados = analisar_telefone(telefone)
+        if telefone_dados:
+            uf = telefone_dados['uf']
+            self.uf[uf] = self.uf.get(uf, 0) + 1
+        if telefone:
+            self.com_telefone += 1
+        if email:
+            self.com_email += 1
+
+        for contador, valor in valores_distintos(nome, email, telefone, telefone_dados).items():
+            self.distintos[contador].adicionar(valor)
+
+    def mesclar(self, outro: 'AgregadosCadastro') -> 'AgregadosCadastro':
+        """
+        Mescla os agregados de outra partição nestes
+
+        Returns:
+            AgregadosCadastro: os próprios agregados, para encadeamento
+
+        """
+        self.total += outro.total
+        self.anos.mesclar(outro.anos)
+        self.com_email += outro.com_email
+        self.com_telefone += outro.com_telefone
+        for destino, origem in ((self.sexo, outro.sexo), (self.uf, outro.uf), (self.regiao, outro.regiao)):
+            for chave, quantidade in origem.items():
+                destino[chave] = destino.get(chave, 0) + quantidade
+        for contador, hll in outro.distintos.items():
+            self.distintos[contador].mesclar(hll)
+        return self
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Monta o dicionário no formato de `CadastroPessoas.estatisticas`"""
+        distintos = {contador: hll.contar() for contador, hll in self.distintos.items()}
+
+        if self.total == 0:
+            return {
+                'total_pessoas': 0,
+                'media_idade': 0,
+                'mediana_idade': 0,
+                'percentis_idade': {},
+                'distribuicao_sexo': {},
+                'pessoas_com_email': 0,
+                'pessoas_com_telefone': 0,
+                'distribuicao_uf': {},
+                'distribuicao_regiao_fiscal': {},
+                'distintos_aproximados': distintos,
+            }
+
+        #Media e percentis de idade a partir do histograma (sem ordenar registros)
+        ano_atual = datetime.now().year
+        idades = self.anos.transformar(lambda ano: ano_atual - ano)
+        media_idade = idades.soma() / self.total
+        percentis = idades.quantis(PERCENTIS_IDADE)
+
+        return {
+            'total_pessoas': self.total,
+            'media_idade': round(media_idade, 1),
+            'mediana_idade': percentis[0.5],
+            'percentis_idade': {f'p{round(q * 100)}': v for q, v in percentis.items()},
+            'distribuicao_sexo': dict(self.sexo),
+            'pessoas_com_email': self.com_email,
+            'pessoas_com_telefone': self.com_telefone,
+            'distribuicao_uf': dict(sorted(self.uf.items())),
+            'distribuicao_regiao_fiscal': dict(sorted(self.regiao.items())),
+            'distintos_aproximados': distintos,
+        }
+
+    def __repr__(self) -> str:
+        return f'AgregadosCadastro(total={self.total})'
+
+
+class TabelasCruzadas:
+    """
+    Tabelas cruzadas de sexo por ano de nascimento, UF e região fiscal.
+
+    Guarda contagens por par de chaves (o ano bruto, não a idade), então
+    mesclar partições é só somar e as faixas etárias são calculadas no fim.
+
+    """
+
+    def __init__(self):
+        """Inicializa tabelas vazias"""
+        self.sexo_ano: Dict[Tuple[str, int], int] = {}
+        self.uf_sexo: Dict[Tuple[str, str], int] = {}
+        self.regiao_sexo: Dict[Tuple[int, str], int] = {}
+
+    def registrar(self, cpf: str, ano_nascimento: int, sexo: str,
+                  telefone: Optional[str] = None) -> None:
+        """
+        Registra uma pessoa a partir dos seus campos
+
+        Args:
+            cpf: CPF em qualquer formato
+            ano_nascimento: Ano de nascimento
+            sexo: Código simplificado do sexo/gênero
+            telefone: Telefone em texto livre (opcional)
+
+        """
+        chave = (sexo, ano_nascimento)
+        self.sexo_ano[chave] = self.sexo_ano.get(chave, 0) + 1
+
+        telefone_dados = analisar_telefone(telefone)
+        if telefone_dados:
+            chave = (telefone_dados['uf'], sexo)
+            self.uf_sexo[chave] = self.uf_sexo.get(chave, 0) + 1
+
+        cpf_limpo = limpar_cpf(cpf)
+        if len(cpf_limpo) == 11:
+            chave = (obter_regiao_fiscal(cpf_limpo), sexo)
+            self.regiao_sexo[chave] = self.regiao_sexo.get(chave, 0) + 1
+
+    def mesclar(self, outro: 'TabelasCruzadas') -> 'TabelasCruzadas':
+        """Soma as tabelas de outra partição nestas"""
+        for destino, origem in ((self.sexo_ano, outro.sexo_ano), (self.uf_sexo, outro.uf_sexo),
+                                (self.regiao_sexo, outro.regiao_sexo)):
+            for chave, quantidade in origem.items():
+                destino[chave] = destino.get(chave, 0) + quantidade
+        return self
+
+    def tabelas(self) -> Dict[str, Dict[Any, Dict[str, int]]]:
+        """
+        Monta as tabelas aninhadas, com chaves ordenadas
+
+        Returns:
+            dict: sexo_por_faixa_etaria {faixa: {sexo: n}}, sexo_por_uf {uf: {sexo: n}}
+            e sexo_por_regiao_fiscal {regiao: {sexo: n}}
+
+        """
+        ano_atual = datetime.now().year
+        faixas: Dict[Tuple[str, str], int] = {}
+        for (sexo, ano), quantidade in self.sexo_ano.items():
+            chave = (faixa_etaria(ano_atual - ano), sexo)
+            faixas[chave] = faixas.get(chave, 0) + quantidade
+
+        def aninhar(pares: Dict[Tuple[Any, str], int]) -> Dict[Any, Dict[str, int]]:
+            resultado: Dict[Any, Dict[str, int]] = {}
+            for (linha, sexo), quantidade in sorted(pares.items()):
+                resultado.setdefault(linha, {})[sexo] = quantidade
+            return resultado
+
+        return {
+            'sexo_por_faixa_etaria': aninhar(faixas),
+            'sexo_por_uf': aninhar(self.uf_sexo),
+            'sexo_por_regiao_fiscal': aninhar(self.regiao_sexo),
+        }
+
+
+if __name__ == '__main__':
+    print('TESTANDO AGREGADOS MESCLÁVEIS...')
+    print('-' * 50)
+
+    particao_a = AgregadosCadastro()
+    particao_a.registrar('Ana Lima', '12345678909', 1990, 'F', 'ana@email.com', '(27) 98866-4060')
+    particao_a.registrar('Bruno Costa', '11144477735', 1985, 'M')
+
+    particao_b = AgregadosCadastro()
+    particao_b.registrar('Carla Lima', '52998224725', 2000, 'NB', 'carla@gmail.com', '(21) 99876-5432')
+
+    total = AgregadosCadastro().mesclar(particao_a).mesclar(particao_b)
+    for chave, valor in total.estatisticas().items():
+        print(f'{chave}: {valor}')
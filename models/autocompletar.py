@@ -0,0 +1,302 @@
+"""
+Sugestões de nomes enquanto o operador digita (autocompletar).
+
+As palavras dos nomes ficam em uma árvore de prefixos compactada (radix
+tree), já em minúsculas e sem acentos. Cada nó guarda as palavras mais
+frequentes da sua subárvore, atualizadas a cada inclusão/remoção, então
+as sugestões para um prefixo custam O(tamanho do prefixo + k),
+independentemente do tamanho do cadastro.
+
+Uso:
+    sugestoes = TrieSugestoes()
+    sugestoes.adicionar('Silva')
+    sugestoes.sugerir('sil')  #[('Silva', 1)]
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from models.tokens_nome import dobrar
+
+
+class _No:
+    """Nó da árvore: trecho da aresta, filhos pelo primeiro caractere e ranking da subárvore"""
+
+    __slots__ = ('rotulo', 'filhos', 'chave', 'contagem', 'melhores')
+
+    def __init__(self, rotulo: str):
+        self.rotulo = rotulo
+        self.filhos: Dict[str, '_No'] = {}
+        #Palavra (dobrada) que termina neste nó, se houver
+        self.chave: Optional[str] = None
+        #Quantas vezes a palavra que termina neste nó foi incluída (0 se nenhuma)
+        self.contagem = 0
+        #(-contagem, palavra) das palavras mais frequentes da subárvore, em ordem
+        self.melhores: List[Tuple[int, str]] = []
+
+
+class TrieSugestoes:
+    """
+    Árvore de prefixos compactada com as palavras mais frequentes por nó.
+
+    As palavras são comparadas em minúsculas e sem acentos; cada sugestão
+    é mostrada na grafia mais incluída (ex.: 'João' e não 'joao').
+
+    """
+
+    def __init__(self, max_sugestoes: int = 10):
+        """
+        Inicializa uma árvore vazia
+
+        Args:
+            max_sugestoes: Tamanho do ranking guardado em cada nó (maior k
+                aceito por `sugerir`)
+
+        Raises:
+            ValueError: Se max_sugestoes for menor que 1
+
+        """
+        if max_sugestoes < 1:
+            raise ValueError('max_sugestoes deve ser pelo menos 1')
+        self.max_sugestoes = max_sugestoes
+        self._raiz = _No('')
+        #palavra dobrada -> grafia original -> quantidade
+        self._grafias: Dict[str, Dict[str, int]] = {}
+        #palavra dobrada -> nós da raiz até ela (descartado quando a árvore muda de forma)
+        self._caminhos: Dict[str, List[_No]] = {}
+
+    def adicionar(self, palavra: str, chave: Optional[str] = None) -> None:
+        """
+        Conta mais uma ocorrência da palavra
+
+        Args:
+            palavra: Palavra como foi escrita
+            chave: A palavra já dobrada (minúsculas, sem acentos), se disponível
+
+        """
+        chave = dobrar(palavra) if chave is None else chave
+        if not chave:
+            return
+        caminho = self._caminhos.get(chave)
+        if caminho is None:
+            caminho = self._caminhos[chave] = self._criar_caminho(chave)
+
+        terminal = caminho[-1]
+        terminal.chave = chave
+        terminal.contagem += 1
+        grafias = self._grafias.setdefault(chave, {})
+        grafias[palavra] = grafias.get(palavra, 0) + 1
+
+        #A contagem só subiu: a palavra entra (ou sobe) no ranking de cada nó,
+        #do fundo para a raiz; se não entra em um nó, não entra nos de cima
+        entrada = (-terminal.contagem, chave)
+        anterior = (1 - terminal.contagem, chave)
+        for no in reversed(caminho):
+            melhores = no.melhores
+            if melhores and anterior <= melhores[-1]:
+                #já estava no ranking (que guarda os melhores em ordem)
+                i = melhores.index(anterior)
+            elif len(melhores) < self.max_sugestoes:
+                melhores.append(entrada)
+                i = len(melhores) - 1
+            elif entrada < melhores[-1]:
+                i = len(melhores) - 1
+            else:
+                break
+            while i and entrada < melhores[i - 1]:
+                melhores[i] = melhores[i - 1]
+                i -= 1
+            melhores[i] = entrada
+
+    def _criar_caminho(self, chave: str) -> List[_No]:
+        """Nós da raiz até o nó da palavra, criando/dividindo arestas se preciso"""
+        caminho = [self._raiz]
+        no = self._raiz
+        resto = chave
+        while resto:
+            filho = no.filhos.get(resto[0])
+            if filho is None:
+                filho = no.filhos[resto[0]] = _No(resto)
+                caminho.append(filho)
+                break
+            rotulo = filho.rotulo
+            comum = 1
+            limite = min(len(rotulo), len(resto))
+            while comum < limite and rotulo[comum] == resto[comum]:
+                comum += 1
+            if comum < len(rotulo):
+                #divide a aresta: o nó do meio tem a mesma subárvore (e o mesmo ranking)
+                meio = _No(rotulo[:comum])
+                filho.rotulo = rotulo[comum:]
+                meio.filhos[filho.rotulo[0]] = filho
+                meio.melhores = list(filho.melhores)
+                filho = no.filhos[resto[0]] = meio
+                self._caminhos.clear()
+            caminho.append(filho)
+            no = filho
+            resto = resto[comum:]
+        return caminho
+
+    def remover(self, palavra: str, chave: Optional[str] = None) -> bool:
+        """
+        Desconta uma ocorrência da palavra
+
+        Returns:
+            bool: True se descontou, False se a palavra não estava na árvore
+
+        """
+        chave = dobrar(palavra) if chave is None else chave
+        caminho = self._caminhos.get(chave) or self._procurar_caminho(chave)
+        if caminho is None:
+            return False
+        no = caminho[-1]
+
+        no.contagem -= 1
+        grafias = self._grafias[chave]
+        if grafias.get(palavra, 0) > 1:
+            grafias[palavra] -= 1
+        else:
+            grafias.pop(palavra, None)
+            if not no.contagem:
+                del self._grafias[chave]
+
+        #Do fundo para a raiz: se a palavra estava em um ranking cheio, outra
+        #palavra de fora pode ter passado à frente, então o ranking é refeito
+        #a partir dos filhos (já atualizados)
+        entrada = (-no.contagem, chave)
+        for atual in reversed(caminho):
+            melhores = atual.melhores
+            for i, (_, existente) in enumerate(melhores):
+                if existente == chave:
+                    break
+            else:
+                break
+            if len(melhores) == self.max_sugestoes:
+                self._refazer_ranking(atual)
+            elif no.contagem:
+                melhores[i] = entrada
+                melhores.sort()
+            else:
+                del melhores[i]
+
+        self._podar(caminho)
+        return True
+
+    def _procurar_caminho(self, chave: str) -> Optional[List[_No]]:
+        """Nós da raiz até o nó da palavra, ou None se ela não estiver na árvore"""
+        caminho = [self._raiz]
+        no = self._raiz
+        resto = chave
+        while resto:
+            filho = no.filhos.get(resto[0])
+            if filho is None or not resto.startswith(filho.rotulo):
+                return None
+            caminho.append(filho)
+            no = filho
+            resto = resto[len(filho.rotulo):]
+        if not no.contagem:
+            return None
+        self._caminhos[chave] = caminho
+        return caminho
+
+    def _refazer_ranking(self, no: _No) -> None:
+        """Recalcula o ranking de um nó a partir do próprio nó e dos rankings dos filhos"""
+        candidatos = [entrada for filho in no.filhos.values() for entrada in filho.melhores]
+        if no.contagem:
+            candidatos.append((-no.contagem, no.chave))
+        candidatos.sort()
+        no.melhores = candidatos[:self.max_sugestoes]
+
+    def _podar(self, caminho: List[_No]) -> None:
+        """Remove folhas vazias e junta nós sem palavra com um único filho"""
+        for profundidade in range(len(caminho) - 1, 0, -1):
+            no = caminho[profundidade]
+            pai = caminho[profundidade - 1]
+            if no.contagem:
+                return
+            no.chave = None
+            self._caminhos.clear()
+            if not no.filhos:
+                del pai.filhos[no.rotulo[0]]
+            elif len(no.filhos) == 1:
+                (filho,) = no.filhos.values()
+                no.rotulo += filho.rotulo
+                no.filhos = filho.filhos
+                no.chave = filho.chave
+                no.contagem = filho.contagem
+                no.melhores = filho.melhores
+                return
+            else:
+                return
+
+    def _no_do_prefixo(self, chave: str) -> Optional[_No]:
+        """Nó cuja subárvore tem exatamente as palavras que começam com `chave`"""
+        no = self._raiz
+        resto = chave
+        while resto:
+            filho = no.filhos.get(resto[0])
+            if filho is None:
+                return None
+            rotulo = filho.rotulo
+            if resto.startswith(rotulo):
+                resto = resto[len(rotulo):]
+            elif rotulo.startswith(resto):
+                resto = ''
+            else:
+                return None
+            no = filho
+        return no
+
+    def sugerir(self, prefixo: str, k: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Palavras mais frequentes que começam com o prefixo
+
+        Args:
+            prefixo: Início da palavra (sem diferenciar maiúsculas nem acentos)
+            k: Quantas sugestões devolver (no máximo `max_sugestoes`)
+
+        Returns:
+            list: (palavra na grafia mais comum, ocorrências), da mais frequente
+                para a menos (empates em ordem alfabética)
+
+        """
+        no = self._no_do_prefixo(dobrar(prefixo))
+        if no is None:
+            return []
+        k = self.max_sugestoes if k is None else k
+        sugestoes = []
+        for contagem, chave in no.melhores[:k]:
+            grafias = self._grafias[chave]
+            sugestoes.append((max(grafias, key=grafias.get), -contagem))
+        return sugestoes
+
+    def contar(self, palavra: str) -> int:
+        """Ocorrências de uma palavra (sem diferenciar maiúsculas nem acentos)"""
+        chave = dobrar(palavra)
+        return sum(self._grafias.get(chave, {}).values())
+
+    def __len__(self) -> int:
+        """Número de palavras distintas (já dobradas)"""
+        return len(self._grafias)
+
+    def __repr__(self) -> str:
+        return f'TrieSugestoes(palavras={len(self._grafias)}, max_sugestoes={self.max_sugestoes})'
+
+
+if __name__ == '__main__':
+    print('TESTANDO SUGESTÕES DE NOMES...')
+    print('-' * 50)
+
+    sugestoes = TrieSugestoes(max_sugestoes=5)
+    nomes = ['João da Silva', 'Maria Silva Santos', 'José Silveira', 'Joana Souza',
+             'João Santos', 'Silvana Lima', 'Sílvia Souza', 'Joao Pedro Santos']
+    for nome in nomes:
+        for palavra in nome.split():
+            sugestoes.adicionar(palavra)
+    print(sugestoes)
+
+    for prefixo in ['', 'jo', 'sil', 'silv', 'SA', 'x']:
+        print(f"'{prefixo}': {sugestoes.sugerir(prefixo)}")
+
+    sugestoes.remover('Silva')
+    sugestoes.remover('Silva')
+    print(f"\nSem 'Silva': 'sil' -> {sugestoes.sugerir('sil')}")
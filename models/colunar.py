@@ -0,0 +1,409 @@
+"""
+Armazenamento colunar do cadastro em memória compartilhada.
+Um processo escritor publica versões; vários processos leitores anexam sem cópia.
+
+Layout de cada versão (um segmento `multiprocessing.shared_memory`):
+
+    cabeçalho   magic 'FCOL', versão do formato, nº de colunas, linhas, versão dos dados
+    descritores (offset, bytes) de cada coluna, na ordem de COLUNAS
+    colunas     alinhadas em 8 bytes; linhas ordenadas por CPF
+
+Colunas numéricas: cpf (int64, -1 se inválido), ano (int16), sexo (uint8,
+posição na tabela de códigos da versão). Colunas de texto (nome, email,
+telefone e a própria tabela de códigos de sexo) usam um buffer UTF-8 e um
+vetor de offsets int64 com linhas+1 posições.
+
+Um segmento de controle pequeno (`nome_base`) guarda a versão atual; cada
+versão vive em `nome_base_v<versao>`. O escritor mantém a versão atual e a
+anterior, para um leitor que leu o controle antes de uma publicação ainda
+conseguir anexar.
+"""
+
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from models.sketches import HistogramaQuantis
+from models.agregados import AgregadosCadastro
+from validacao.cpf import limpar_cpf, formatar_cpf
+
+MAGIC = b'FCOL'
+MAGIC_CONTROLE = b'FCCT'
+VERSAO_FORMATO = 2
+
+CABECALHO = struct.Struct('<4sHHQQ') #magic, formato, colunas, linhas, versão dos dados
+DESCRITOR = struct.Struct('<QQ') #offset, bytes
+CONTROLE = struct.Struct('<4sQ') #magic, versão atual
+
+TEXTOS = ('nome', 'email', 'telefone')
+COLUNAS: Tuple[Tuple[str, str], ...] = (
+    ('cpf', 'q'),
+    ('ano', 'h'),
+    ('sexo', 'B'),
+) + tuple(
+    coluna for texto in TEXTOS + ('sexo_codigos',)
+    for coluna in ((f'{texto}_offsets', 'q'), (f'{texto}_dados', 'B'))
+)
+
+#Início da tabela de códigos de sexo/gênero de cada versão; códigos fora
+#dela entram em seguida, na ordem em que aparecem (até 256 no total)
+CODIGOS_SEXO = ('', 'M', 'F', 'NB', 'O', 'X')
+
+#Tentativas de anexar quando a versão lida no controle some antes do anexo
+TENTATIVAS_ANEXAR = 5
+
+
+def _alinhar(valor: int, alinhamento: int = 8) -> int:
+    return (valor + alinhamento - 1) // alinhamento * alinhamento
+
+
+def _anexar_segmento(nome: str) -> shared_memory.SharedMemory:
+    """
+    Anexa um segmento existente sem registrá-lo no resource_tracker
+
+    Antes do Python 3.13, anexar registra o segmento e o processo leitor o
+    apagaria ao terminar; só o escritor deve apagar segmentos.
+
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=nome, track=False)
+    segmento = shared_memory.SharedMemory(name=nome)
+    from multiprocessing import resource_tracker
+    resource_tracker.unregister(segmento._name, 'shared_memory') # type: ignore[attr-defined]
+    return segmento
+
+
+def _apagar_segmento(segmento: shared_memory.SharedMemory) -> None:
+    """
+    Fecha e apaga um segmento criado pelo escritor
+
+    Leitores na mesma árvore de processos compartilham o resource_tracker e
+    podem ter removido o registro em `_anexar_segmento`; registra de novo
+    antes de apagar para o tracker não acusar um nome desconhecido.
+
+    """
+    if sys.version_info < (3, 13):
+        from multiprocessing import resource_tracker
+        resource_tracker.register(segmento._name, 'shared_memory') # type: ignore[attr-defined]
+    segmento.close()
+    segmento.unlink()
+
+
+def _coluna_texto(valores: List[Optional[str]]) -> Tuple[array, bytes]:
+    """Codifica uma coluna de texto em (offsets, buffer UTF-8)"""
+    offsets = array('q', [0])
+    partes = []
+    posicao = 0
+    for valor in valores:
+        codificado = (valor or '').encode('utf-8')
+        partes.append(codificado)
+        posicao += len(codificado)
+        offsets.append(posicao)
+    return offsets, b''.join(partes)
+
+
+class PublicadorColunar:
+    """
+    Escritor único: publica versões colunares do cadastro em memória compartilhada.
+
+    Cada `publicar` cria um segmento novo, atualiza o controle e apaga a
+    penúltima versão (leitores já anexados continuam com ela até `fechar`).
+
+    """
+
+    def __init__(self, nome_base: str):
+        """
+        Cria o segmento de controle
+
+        Args:
+            nome_base: Nome usado pelos leitores para anexar (ex.: 'cadastro')
+
+        """
+        self.nome_base = nome_base
+        self.versao = 0
+        self._controle = shared_memory.SharedMemory(name=nome_base, create=True, size=CONTROLE.size)
+        CONTROLE.pack_into(self._controle.buf, 0, MAGIC_CONTROLE, 0)
+        self._atual: Optional[shared_memory.SharedMemory] = None
+        self._anterior: Optional[shared_memory.SharedMemory] = None
+
+    def publicar(self, pessoas: Iterable[Any]) -> int:
+        """
+        Publica uma nova versão com as pessoas informadas
+
+        Args:
+            pessoas: Pessoas a publicar (ex.: um CadastroPessoas ou um snapshot)
+
+        Returns:
+            int: Número da versão publicada
+
+        Raises:
+            ValueError: Se houver mais de 256 códigos de sexo distintos
+
+        """
+        if hasattr(pessoas, 'snapshot'):
+            pessoas = pessoas.snapshot()
+
+        codigos = {codigo: i for i, codigo in enumerate(CODIGOS_SEXO)}
+        linhas = []
+        for pessoa in pessoas:
+            cpf_limpo = limpar_cpf(pessoa.cpf)
+            cpf = int(cpf_limpo) if len(cpf_limpo) == 11 else -1
+            sexo = codigos.setdefault(pessoa.sexo, len(codigos))
+            linhas.append((cpf, pessoa.ano_nascimento, sexo, pessoa.nome, pessoa.email, pessoa.telefone))
+        if len(codigos) > 256:
+            raise ValueError(f'Códigos de sexo demais para a coluna uint8: {len(codigos)}')
+        linhas.sort(key=lambda linha: linha[0])
+
+        colunas: Dict[str, Any] = {
+            'cpf': array('q', (linha[0] for linha in linhas)),
+            'ano': array('h', (linha[1] for linha in linhas)),
+            'sexo': array('B', (linha[2] for linha in linhas)),
+        }
+        for posicao, texto in enumerate(TEXTOS, start=3):
+            offsets, dados = _coluna_texto([linha[posicao] for linha in linhas])
+            colunas[f'{texto}_offsets'] = offsets
+            colunas[f'{texto}_dados'] = dados
+        colunas['sexo_codigos_offsets'], colunas['sexo_codigos_dados'] = _coluna_texto(list(codigos))
+
+        #calcula posições de cada coluna
+        inicio = _alinhar(CABECALHO.size + DESCRITOR.size * len(COLUNAS))
+        descritores = []
+        for nome, _ in COLUNAS:
+            tamanho = len(memoryview(colunas[nome]).cast('B'))
+            descritores.append((inicio, tamanho))
+            inicio = _alinhar(inicio + tamanho)
+
+        versao = self.versao + 1
+        segmento = shared_memory.SharedMemory(
+            name=f'{self.nome_base}_v{versao}', create=True, size=max(inicio, 1)
+        )
+        CABECALHO.pack_into(segmento.buf, 0, MAGIC, VERSAO_FORMATO, len(COLUNAS), len(linhas), versao)
+        for i, ((nome, _), (offset, tamanho)) in enumerate(zip(COLUNAS, descritores)):
+            DESCRITOR.pack_into(segmento.buf, CABECALHO.size + i * DESCRITOR.size, offset, tamanho)
+            segmento.buf[offset:offset + tamanho] = memoryview(colunas[nome]).cast('B')
+
+        #troca a versão atual; a anterior fica para quem já leu o controle
+        CONTROLE.pack_into(self._controle.buf, 0, MAGIC_CONTROLE, versao)
+        penultima = self._anterior
+        self._anterior, self._atual, self.versao = self._atual, segmento, versao
+        if penultima is not None:
+            _apagar_segmento(penultima)
+        return versao
+
+    def fechar(self) -> None:
+        """Apaga o controle e as versões mantidas"""
+        for segmento in (self._anterior, self._atual, self._controle):
+            if segmento is not None:
+                _apagar_segmento(segmento)
+        self._anterior = self._atual = None
+
+    def __enter__(self) -> 'PublicadorColunar':
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.fechar()
+
+
+class LeitorColunar:
+    """
+    Leitor de uma versão colunar publicada, sem cópia dos dados.
+
+    As colunas são `memoryview`s sobre a memória compartilhada; buscas por
+    CPF usam busca binária e agregações percorrem só as colunas necessárias.
+
+    """
+
+    def __init__(self, nome_base: str):
+        """
+        Anexa à versão atual publicada em `nome_base`
+
+        Raises:
+            FileNotFoundError: Se não houver publicador com esse nome
+            ValueError: Se o segmento não estiver no formato esperado
+
+        """
+        self.nome_base = nome_base
+        self._controle = _anexar_segmento(nome_base)
+        self._segmento: Optional[shared_memory.SharedMemory] = None
+        self.colunas: Dict[str, memoryview] = {}
+        #tabela da versão anexada: código uint8 da coluna sexo -> código de sexo
+        self.codigos_sexo: Tuple[str, ...] = ()
+        self.versao = 0
+        self.linhas = 0
+        self.atualizar()
+
+    def versao_publicada(self) -> int:
+        """Versão mais recente anunciada pelo escritor"""
+        magic, versao = CONTROLE.unpack_from(self._controle.buf, 0)
+        if magic != MAGIC_CONTROLE:
+            raise ValueError('Segmento de controle inválido')
+        return versao
+
+    def atualizar(self) -> bool:
+        """
+        Passa para a versão mais recente, se houver uma nova
+
+        Returns:
+            bool: True se trocou de versão
+
+        Raises:
+            FileNotFoundError: Se as versões sumirem mais rápido do que o
+                leitor consegue anexar (TENTATIVAS_ANEXAR vezes)
+
+        """
+        for tentativa in range(TENTATIVAS_ANEXAR):
+            versao = self.versao_publicada()
+            if versao == self.versao:
+                return False
+            if versao == 0:
+                raise ValueError('Nenhuma versão publicada ainda')
+            try:
+                segmento = _anexar_segmento(f'{self.nome_base}_v{versao}')
+                break
+            except FileNotFoundError:
+                #o escritor publicou duas vezes entre a leitura do controle e o anexo
+                if tentativa == TENTATIVAS_ANEXAR - 1:
+                    raise
+
+        magic, formato, quantidade, linhas, versao_dados = CABECALHO.unpack_from(segmento.buf, 0)
+        if magic != MAGIC or formato != VERSAO_FORMATO or quantidade != len(COLUNAS):
+            segmento.close()
+            raise ValueError('Formato colunar incompatível')
+
+        colunas = {}
+        for i, (nome, formato_coluna) in enumerate(COLUNAS):
+            offset, tamanho = DESCRITOR.unpack_from(segmento.buf, CABECALHO.size + i * DESCRITOR.size)
+            colunas[nome] = segmento.buf[offset:offset + tamanho].cast(formato_coluna)
+
+        self._liberar()
+        self._segmento, self.colunas = segmento, colunas
+        self.versao, self.linhas = versao_dados, linhas
+        self.codigos_sexo = tuple(
+            self._texto('sexo_codigos', i) or '' for i in range(len(colunas['sexo_codigos_offsets']) - 1)
+        )
+        return True
+
+    def _texto(self, coluna: str, i: int) -> Optional[str]:
+        offsets = self.colunas[f'{coluna}_offsets']
+        inicio, fim = offsets[i], offsets[i + 1]
+        if inicio == fim:
+            return None
+        return bytes(self.colunas[f'{coluna}_dados'][inicio:fim]).decode('utf-8')
+
+    def sexo(self, i: int) -> str:
+        """Código de sexo da linha `i`"""
+        return self.codigos_sexo[self.colunas['sexo'][i]]
+
+    def linha(self, i: int) -> Dict[str, Any]:
+        """Monta um dicionário com os dados da linha `i`"""
+        cpf = self.colunas['cpf'][i]
+        return {
+            'nome': self._texto('nome', i) or '',
+            'cpf': formatar_cpf(f'{cpf:011d}') if cpf >= 0 else '',
+            'ano_nascimento': self.colunas['ano'][i],
+            'sexo': self.sexo(i),
+            'email': self._texto('email', i),
+            'telefone': self._texto('telefone', i),
+        }
+
+    def buscar_por_cpf(self, cpf: str) -> Optional[Dict[str, Any]]:
+        """Busca binária pelo CPF na coluna ordenada"""
+        cpf_limpo = limpar_cpf(cpf)
+        if len(cpf_limpo) != 11:
+            return None
+        alvo = int(cpf_limpo)
+        coluna = self.colunas['cpf']
+        i = bisect_left(coluna, alvo)
+        if i < self.linhas and coluna[i] == alvo:
+            return self.linha(i)
+        return None
+
+    def distribuicao_sexo(self) -> Dict[str, int]:
+        """Contagem por código de sexo (só lê a coluna de sexo)"""
+        return {self.codigos_sexo[codigo]: n for codigo, n in sorted(Counter(self.colunas['sexo']).items())}
+
+    def histograma_anos(self, inicio: int = 0, fim: Optional[int] = None) -> HistogramaQuantis:
+        """Histograma de anos de nascimento de um intervalo de linhas"""
+        return HistogramaQuantis(Counter(self.colunas['ano'][inicio:fim]))
+
+    def agregados(self, inicio: int = 0, fim: Optional[int] = None,
+                  precisao_hll: int = 12) -> AgregadosCadastro:
+        """
+        Agregados completos (os de `CadastroPessoas.estatisticas`) de um intervalo de linhas
+
+        Args:
+            inicio: Primeira linha (inclusive)
+            fim: Última linha (exclusive); padrão: até o fim
+
+        """
+        fim = self.linhas if fim is None else min(fim, self.linhas)
+        agregados = AgregadosCadastro(precisao_hll)
+        cpfs, anos, sexos = self.colunas['cpf'], self.colunas['ano'], self.colunas['sexo']
+        codigos_sexo = self.codigos_sexo
+        for i in range(inicio, fim):
+            cpf = cpfs[i]
+            agregados.registrar(
+                nome = self._texto('nome', i) or '',
+                cpf = f'{cpf:011d}' if cpf >= 0 else '',
+                ano_nascimento = anos[i],
+                sexo = codigos_sexo[sexos[i]],
+                email = self._texto('email', i),
+                telefone = self._texto('telefone', i),
+            )
+        return agregados
+
+    def _liberar(self) -> None:
+        for coluna in self.colunas.values():
+            coluna.release()
+        self.colunas = {}
+        if self._segmento is not None:
+            self._segmento.close()
+            self._segmento = None
+
+    def fechar(self) -> None:
+        """Desanexa dos segmentos (não os apaga)"""
+        self._liberar()
+        self._controle.close()
+
+    def __len__(self) -> int:
+        return self.linhas
+
+    def __enter__(self) -> 'LeitorColunar':
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.fechar()
+
+
+if __name__ == '__main__':
+    import multiprocessing
+    from models.pessoa import Pessoa, CadastroPessoas
+
+    print('TESTANDO ARMAZENAMENTO COLUNAR COMPARTILHADO...')
+    print('-' * 50)
+
+    def leitor_filho(nome: str) -> None:
+        with LeitorColunar(nome) as leitor:
+            print(f'\n[filho] versão {leitor.versao}, {len(leitor)} linhas')
+            print(f"[filho] CPF 111.444.777-35: {leitor.buscar_por_cpf('111.444.777-35')}")
+            print(f'[filho] Sexo: {leitor.distribuicao_sexo()}')
+
+    cadastro = CadastroPessoas()
+    cadastro.adicionar(Pessoa('Ana Lima', '12345678909', 1990, 'F', 'ana@email.com'))
+    cadastro.adicionar(Pessoa('Bruno Costa', '11144477735', 1985, 'M', telefone='(27) 98866-4060'))
+
+    with PublicadorColunar('ficha_cadastral_demo') as publicador:
+        publicador.publicar(cadastro)
+        processo = multiprocessing.Process(target=leitor_filho, args=('ficha_cadastral_demo',))
+        processo.start()
+        processo.join()
+
+        cadastro.adicionar(Pessoa('Carla Souza', '52998224725', 2000, 'NB'))
+        publicador.publicar(cadastro)
+        processo = multiprocessing.Process(target=leitor_filho, args=('ficha_cadastral_demo',))
+        processo.start()
+        processo.join()
@@ -0,0 +1,177 @@
+"""
+Controle de concorrência para o cadastro de pessoas.
+Lock leitor-escritor: várias leituras em paralelo, escritas serializadas.
+"""
+
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Iterator, TypeVar
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+
+class LockLeituraEscrita:
+    """
+    Lock leitor-escritor com preferência para escritores.
+
+    * Vários leitores podem segurar o lock ao mesmo tempo
+    * Escritores têm acesso exclusivo
+    * Quando há escritor esperando, novos leitores aguardam (evita starvation)
+    * Reentrante: a thread que já segura o lock (leitura ou escrita) pode
+      adquiri-lo de novo, e quem segura a escrita também pode ler
+
+    """
+
+    def __init__(self):
+        """Inicializa o lock sem nenhum dono"""
+        self._condicao = threading.Condition(threading.Lock())
+        self._leitores = 0
+        self._escritor = None #ident da thread escritora
+        self._escritores_esperando = 0
+        self._local = threading.local()
+
+    def _profundidade(self, tipo: str) -> int:
+        return getattr(self._local, tipo, 0)
+
+    def _ajustar(self, tipo: str, delta: int) -> None:
+        setattr(self._local, tipo, self._profundidade(tipo) + delta)
+
+    def adquirir_leitura(self) -> None:
+        """Adquire o lock para leitura (compartilhada)"""
+        if self._profundidade('leitura') or self._escritor == threading.get_ident():
+            self._ajustar('leitura', 1)
+            return
+        with self._condicao:
+            while self._escritor is not None or self._escritores_esperando:
+                self._condicao.wait()
+            self._leitores += 1
+        self._ajustar('leitura', 1)
+
+    def liberar_leitura(self) -> None:
+        """Libera o lock de leitura"""
+        self._ajustar('leitura', -1)
+        if self._profundidade('leitura') or self._escritor == threading.get_ident():
+            return
+        with self._condicao:
+            self._leitores -= 1
+            if self._leitores == 0:
+                self._condicao.notify_all()
+
+    def adquirir_escrita(self) -> None:
+        """
+        Adquire o lock para escrita (exclusiva)
+
+        Raises:
+            RuntimeError: Se a thread segura apenas a leitura (upgrade causaria deadlock)
+
+        """
+        eu = threading.get_ident()
+        if self._escritor == eu:
+            self._ajustar('escrita', 1)
+            return
+        if self._profundidade('leitura'):
+            raise RuntimeError('Não é possível promover leitura para escrita')
+        with self._condicao:
+            self._escritores_esperando += 1
+            while self._escritor is not None or self._leitores:
+                self._condicao.wait()
+            self._escritores_esperando -= 1
+            self._escritor = eu
+        self._ajustar('escrita', 1)
+
+    def liberar_escrita(self) -> None:
+        """Libera o lock de escrita"""
+        self._ajustar('escrita', -1)
+        if self._profundidade('escrita'):
+            return
+        with self._condicao:
+            self._escritor = None
+            self._condicao.notify_all()
+
+    @contextmanager
+    def leitura(self) -> Iterator[None]:
+        """Context manager para leitura: `with lock.leitura(): ...`"""
+        self.adquirir_leitura()
+        try:
+            yield
+        finally:
+            self.liberar_leitura()
+
+    @contextmanager
+    def escrita(self) -> Iterator[None]:
+        """Context manager para escrita: `with lock.escrita(): ...`"""
+        self.adquirir_escrita()
+        try:
+            yield
+        finally:
+            self.liberar_escrita()
+
+
+def com_leitura(metodo: F) -> F:
+    """
+    Decorador para métodos de leitura de objetos com atributo `_lock`
+
+    Quando `_lock` é None (modo sem threads), chama o método diretamente.
+
+    """
+    @wraps(metodo)
+    def envoltorio(self, *args, **kwargs):
+        lock = self._lock
+        if lock is None:
+            return metodo(self, *args, **kwargs)
+        lock.adquirir_leitura()
+        try:
+            return metodo(self, *args, **kwargs)
+        finally:
+            lock.liberar_leitura()
+    return envoltorio  # type: ignore[return-value]
+
+
+def com_escrita(metodo: F) -> F:
+    """Decorador para métodos de escrita (ver `com_leitura`)"""
+    @wraps(metodo)
+    def envoltorio(self, *args, **kwargs):
+        lock = self._lock
+        if lock is None:
+            return metodo(self, *args, **kwargs)
+        lock.adquirir_escrita()
+        try:
+            return metodo(self, *args, **kwargs)
+        finally:
+            lock.liberar_escrita()
+    return envoltorio  # type: ignore[return-value]
+
+
+if __name__ == '__main__':
+    import time
+
+    print('TESTANDO LOCK LEITOR-ESCRITOR...')
+    print('-' * 50)
+
+    lock = LockLeituraEscrita()
+    eventos = []
+
+    def leitor(n: int) -> None:
+        with lock.leitura():
+            eventos.append(f'leitor {n} entrou')
+            time.sleep(0.1)
+            eventos.append(f'leitor {n} saiu')
+
+    def escritor() -> None:
+        with lock.escrita():
+            eventos.append('escritor entrou')
+            time.sleep(0.05)
+            eventos.append('escritor saiu')
+
+    inicio = time.perf_counter()
+    threads = [threading.Thread(target=leitor, args=(i,)) for i in range(4)]
+    threads.append(threading.Thread(target=escritor))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print('\n'.join(eventos))
+    print(f'\nTempo total: {time.perf_counter() - inicio:.2f}s '
+          f'(4 leitores em paralelo ~0.10s + escritor ~0.05s)')
@@ -0,0 +1,147 @@
+"""
+Log de consultas lentas do cadastro de pessoas.
+
+As buscas e filtros de CadastroPessoas que passam do limite de latência
+são gravadas em um arquivo de log rotativo, uma por linha em JSON, com os
+parâmetros, quantos registros foram examinados, quantos foram devolvidos e
+o tempo gasto. Serve para decidir quais índices faltam com base no uso real.
+
+Uso:
+    from models.consultas_lentas import LogConsultasLentas
+
+    cadastro = CadastroPessoas(log_consultas=LogConsultasLentas('lentas.log', limite_ms=20))
+"""
+
+import inspect
+import json
+import logging
+import time
+from functools import wraps
+from logging.handlers import RotatingFileHandler
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+ARQUIVO_PADRAO = 'consultas_lentas.log'
+
+
+class LogConsultasLentas:
+    """Grava em arquivo rotativo as consultas acima de um limite de latência"""
+
+    def __init__(self, caminho: str = ARQUIVO_PADRAO, limite_ms: float = 50.0,
+                 max_bytes: int = 5 * 2**20, backups: int = 3):
+        """
+        Abre (ou cria) o arquivo de log
+
+        Args:
+            caminho: Arquivo de log
+            limite_ms: Consultas que levarem pelo menos isso são gravadas
+            max_bytes: Tamanho a partir do qual o arquivo é rotacionado
+            backups: Quantos arquivos antigos (`.1`, `.2`, ...) manter
+
+        Raises:
+            ValueError: Se o limite for negativo
+
+        """
+        if limite_ms < 0:
+            raise ValueError('O limite de latência não pode ser negativo')
+        self.caminho = caminho
+        self.limite_ns = int(limite_ms * 1e6)
+        self.registradas = 0
+        self._handler = RotatingFileHandler(caminho, maxBytes=max_bytes, backupCount=backups,
+                                            encoding='utf-8', delay=True)
+        self._handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        #logger avulso (fora da hierarquia do logging), um por instância
+        self._logger = logging.Logger('ficha_cadastral.consultas_lentas')
+        self._logger.addHandler(self._handler)
+
+    def registrar(self, operacao: str, parametros: Dict[str, Any], candidatos: int,
+                  resultados: int, nanossegundos: int) -> None:
+        """Grava uma consulta lenta"""
+        self.registradas += 1
+        self._logger.warning(json.dumps({
+            'operacao': operacao,
+            'parametros': parametros,
+            'candidatos': candidatos,
+            'resultados': resultados,
+            'ms': round(nanossegundos / 1e6, 3),
+        }, ensure_ascii=False, default=str))
+
+    def fechar(self) -> None:
+        """Fecha o arquivo de log"""
+        self._logger.removeHandler(self._handler)
+        self._handler.close()
+
+    def __enter__(self) -> 'LogConsultasLentas':
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.fechar()
+
+
+def _quantidade(resultado: Any) -> int:
+    """Número de registros devolvidos por uma consulta (lista ou registro/None)"""
+    if resultado is None:
+        return 0
+    return len(resultado) if isinstance(resultado, list) else 1
+
+
+def com_log_consulta(candidatos: Optional[Callable[..., int]] = None) -> Callable[[F], F]:
+    """
+    Decorador para consultas de objetos com atributo `log_consultas`
+
+    Quando `log_consultas` é None, chama o método diretamente.
+
+    Args:
+        candidatos: `candidatos(self, *args, **kwargs)` devolve quantos
+            registros a consulta examinou; por padrão, o número de resultados
+            (consultas por índice só tocam os registros da chave)
+
+    """
+    def decorador(metodo: F) -> F:
+        assinatura = inspect.signature(metodo)
+        relogio = time.perf_counter_ns
+
+        @wraps(metodo)
+        def envoltorio(self, *args, **kwargs):
+            log = self.log_consultas
+            if log is None:
+                return metodo(self, *args, **kwargs)
+            inicio = relogio()
+            resultado = metodo(self, *args, **kwargs)
+            decorrido = relogio() - inicio
+            if decorrido >= log.limite_ns:
+                parametros = dict(assinatura.bind(self, *args, **kwargs).arguments)
+                del parametros['self']
+                resultados = _quantidade(resultado)
+                examinados = candidatos(self, *args, **kwargs) if candidatos else resultados
+                log.registrar(metodo.__name__, parametros, examinados, resultados, decorrido)
+            return resultado
+        return envoltorio  # type: ignore[return-value]
+    return decorador
+
+
+if __name__ == '__main__':
+    import os
+    import tempfile
+    from benchmarks.gerador import GeradorPessoas
+    from models.pessoa import CadastroPessoas
+
+    print('TESTANDO LOG DE CONSULTAS LENTAS...')
+    print('-' * 50)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, 'lentas.log')
+        with LogConsultasLentas(caminho, limite_ms=1) as log:
+            cadastro = CadastroPessoas(log_consultas=log)
+            for pessoa in GeradorPessoas(semente=42).pessoas(50_000):
+                cadastro.adicionar(pessoa)
+
+            cadastro.buscar_por_cpf(cadastro.pessoas[0].cpf) #rápida, não é gravada
+            cadastro.buscar_por_nome('ana sil') #termo com espaço: confere os nomes candidatos
+            cadastro.filtrar_por_sexo('F')
+            print(f'Consultas gravadas: {log.registradas}')
+
+        if os.path.exists(caminho):
+            with open(caminho, encoding='utf-8') as arquivo:
+                print(arquivo.read())
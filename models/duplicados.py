@@ -0,0 +1,395 @@
+"""
+Detecção de pessoas duplicadas e quase duplicadas no cadastro.
+
+Duplicados entram pelo `adicionar` de várias formas: o mesmo CPF digitado
+com outra pontuação, ou a mesma pessoa com variações no nome ("Souza" e
+"Sousa", nome do meio omitido) e o mesmo ano de nascimento.
+
+Para não comparar todos com todos (O(n²)), os registros são agrupados em
+blocos por chaves baratas e só são comparados dentro de cada bloco:
+
+    cpf        9 primeiros dígitos do CPF limpo (pega pontuação e dígito errados)
+    sobrenome  chave fonética do último sobrenome + ano de nascimento
+    email      email normalizado
+    telefone   telefone normalizado
+
+Blocos maiores que a janela são ordenados pela chave fonética do nome e
+cada registro só é comparado com os vizinhos dentro da janela, então o
+número de comparações fica em O(n · janela). Um par que cai em mais de um
+bloco só é comparado no primeiro deles (na ordem acima) em que os dois
+ficam dentro da janela, sem guardar os pares já vistos. Os pares com
+pontuação acima do limiar são unidos em grupos (union-find) e os grupos
+saem ordenados da maior pontuação para a menor.
+
+Uso:
+    grupos = detectar_duplicados(cadastro)
+    print(relatorio_duplicados(grupos))
+"""
+
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+from models.tokens_nome import dobrar
+from validacao.contato import normalizar_email, normalizar_telefone
+from validacao.cpf import limpar_cpf
+
+if TYPE_CHECKING:
+    from models.pessoa import Pessoa, CadastroPessoas
+
+#Tipos de chave de bloco, na ordem canônica (um par é comparado no primeiro bloco em comum)
+TIPOS_BLOCO = ('cpf', 'sobrenome', 'email', 'telefone')
+
+#Partículas ignoradas na comparação de nomes
+PREPOSICOES = frozenset({'de', 'da', 'do', 'das', 'dos', 'e'})
+
+#Pesos da pontuação de um par (CPF igual vale 1.0 direto)
+PESO_NOME = 0.6
+PESO_ANO = 0.2
+PESO_CONTATO = 0.2
+#Bônus para CPFs com os mesmos 9 primeiros dígitos (dígito verificador errado)
+BONUS_CPF_BASE = 0.2
+
+#Substituições fonéticas, aplicadas em ordem sobre o texto em minúsculas sem acentos
+_REGRAS_FONETICAS = (
+    (re.compile(r'[^a-z]'), ''),
+    (re.compile(r'ph'), 'f'),
+    (re.compile(r'[cs]h'), 'x'),
+    (re.compile(r'lh'), 'l'),
+    (re.compile(r'nh'), 'n'),
+    (re.compile(r'qu?'), 'k'),
+    (re.compile(r'c(?=[ei])'), 's'),
+    (re.compile(r'c'), 'k'),
+    (re.compile(r'gu(?=[ei])'), 'g'),
+    (re.compile(r'g(?=[ei])'), 'j'),
+    (re.compile(r'z'), 's'),
+    (re.compile(r'y'), 'i'),
+    (re.compile(r'w'), 'v'),
+    (re.compile(r'h'), ''),
+)
+_VOGAIS = frozenset('aeiou')
+
+
+def chave_fonetica(palavra: str) -> str:
+    """
+    Chave fonética simplificada para o português
+
+    Grafias que soam igual caem na mesma chave: a primeira letra seguida das
+    consoantes, sem repetições (ex.: 'Souza' e 'Sousa' -> 'ss';
+    'Thiago' e 'Tiago' -> 'tg'; 'Conceição' e 'Conseisão' -> 'knss').
+
+    """
+    texto = dobrar(palavra.lower().replace('ç', 's'))
+    for padrao, troca in _REGRAS_FONETICAS:
+        texto = padrao.sub(troca, texto)
+    if not texto:
+        return ''
+    chave = [texto[0]]
+    for anterior, letra in zip(texto, texto[1:]):
+        if letra not in _VOGAIS and letra != anterior:
+            chave.append(letra)
+    return ''.join(chave)
+
+
+class _UniaoBusca:
+    """Union-find com compressão de caminho e união por tamanho"""
+
+    def __init__(self, tamanho: int):
+        self.pai = list(range(tamanho))
+        self.tamanho = [1] * tamanho
+
+    def raiz(self, i: int) -> int:
+        pai = self.pai
+        while pai[i] != i:
+            pai[i] = pai[pai[i]]
+            i = pai[i]
+        return i
+
+    def unir(self, a: int, b: int) -> None:
+        a, b = self.raiz(a), self.raiz(b)
+        if a == b:
+            return
+        if self.tamanho[a] < self.tamanho[b]:
+            a, b = b, a
+        self.pai[b] = a
+        self.tamanho[a] += self.tamanho[b]
+
+
+class DetectorDuplicados:
+    """
+    Detector de duplicados por blocos, pontuação de pares e agrupamento.
+
+    A pontuação de um par vai de 0 a 1: CPF igual vale 1.0; senão,
+    0.6 × semelhança dos nomes (coeficiente de Dice das chaves fonéticas)
+    + 0.2 × ano (1 igual, 0.5 com um ano de diferença) + 0.2 se o email ou
+    o telefone forem iguais, com +0.2 se os 9 primeiros dígitos do CPF
+    coincidirem. Nome e ano iguais sem mais nada somam 0.8: homônimos são
+    comuns, então o limiar padrão exige mais uma evidência.
+
+    """
+
+    def __init__(self, limiar: float = 0.85, janela: int = 10):
+        """
+        Inicializa o detector
+
+        Args:
+            limiar: Pontuação mínima para um par ser considerado duplicado
+            janela: Vizinhos comparados por registro nos blocos grandes
+                (blocos até esse tamanho são comparados par a par)
+
+        Raises:
+            ValueError: Se o limiar não estiver entre 0 e 1 ou a janela for menor que 2
+
+        """
+        if not 0 < limiar <= 1:
+            raise ValueError('O limiar deve estar entre 0 (exclusive) e 1')
+        if janela < 2:
+            raise ValueError('A janela deve ser de pelo menos 2 registros')
+        self.limiar = limiar
+        self.janela = janela
+        self.estatisticas: Dict[str, Any] = {}
+        #palavra -> chave fonética (nomes repetem muito as mesmas palavras)
+        self._foneticas: Dict[str, str] = {}
+
+    def _caracteristicas(self, pessoa: 'Pessoa') -> Tuple[str, frozenset, str, int, str, str]:
+        """(cpf limpo, chaves fonéticas do nome, chave do nome ordenável, ano, email, telefone)"""
+        foneticas = self._foneticas
+        chaves = []
+        for palavra in pessoa.nome.split():
+            chave = foneticas.get(palavra)
+            if chave is None:
+                chave = foneticas[palavra] = '' if dobrar(palavra) in PREPOSICOES else chave_fonetica(palavra)
+            if chave:
+                chaves.append(chave)
+        return (limpar_cpf(pessoa.cpf), frozenset(chaves), ' '.join(chaves), pessoa.ano_nascimento,
+                normalizar_email(pessoa.email), normalizar_telefone(pessoa.telefone))
+
+    def pontuar(self, a: Tuple, b: Tuple, minimo: float = 0.0) -> Tuple[float, List[str]]:
+        """
+        Pontuação de um par a partir das características dos dois registros
+
+        Args:
+            a, b: Características (ver `_caracteristicas`)
+            minimo: Se nem com os nomes iguais o par chegaria a esse valor,
+                devolve (0.0, []) sem comparar os nomes
+
+        Returns:
+            tuple: (pontuação de 0 a 1, campos que coincidiram)
+
+        """
+        cpf_a, nome_a, _, ano_a, email_a, telefone_a = a
+        cpf_b, nome_b, _, ano_b, email_b, telefone_b = b
+        if cpf_a and cpf_a == cpf_b:
+            return 1.0, ['cpf']
+
+        #primeiro os campos baratos, para descartar o par antes de comparar nomes
+        diferenca_ano = abs(ano_a - ano_b)
+        pontuacao = PESO_ANO if diferenca_ano == 0 else PESO_ANO / 2 if diferenca_ano == 1 else 0.0
+        email = bool(email_a) and email_a == email_b
+        telefone = not email and bool(telefone_a) and telefone_a == telefone_b
+        if email or telefone:
+            pontuacao += PESO_CONTATO
+        cpf_base = len(cpf_a) >= 9 and cpf_a[:9] == cpf_b[:9]
+        if cpf_base:
+            pontuacao += BONUS_CPF_BASE
+        if pontuacao + PESO_NOME < minimo:
+            return 0.0, []
+
+        semelhanca = 0.0
+        if nome_a and nome_b:
+            semelhanca = 2 * len(nome_a & nome_b) / (len(nome_a) + len(nome_b))
+            pontuacao += PESO_NOME * semelhanca
+        pontuacao = min(round(pontuacao, 4), 1.0)
+        if pontuacao < minimo:
+            return pontuacao, []
+
+        motivos = []
+        if semelhanca:
+            motivos.append('nome' if semelhanca == 1 else f'nome~{semelhanca:.2f}')
+        if diferenca_ano <= 1:
+            motivos.append('ano' if diferenca_ano == 0 else 'ano~1')
+        if email:
+            motivos.append('email')
+        if telefone:
+            motivos.append('telefone')
+        if cpf_base:
+            motivos.append('cpf_base')
+        return pontuacao, motivos
+
+    @staticmethod
+    def _chaves(dados: Tuple) -> Tuple[Optional[Tuple], ...]:
+        """Chaves de bloco de um registro, uma por tipo de TIPOS_BLOCO (None se faltar o campo)"""
+        cpf, _, nome, ano, email, telefone = dados
+        return (
+            ('cpf', cpf[:9]) if cpf else None,
+            ('sobrenome', nome.rsplit(' ', 1)[-1], ano) if nome else None,
+            ('email', email) if email else None,
+            ('telefone', telefone) if telefone else None,
+        )
+
+    def _blocos(self, chaves: Sequence[Tuple[Optional[Tuple], ...]]) -> Dict[Tuple, List[int]]:
+        """Chave de bloco -> posições dos registros que a têm"""
+        blocos: Dict[Tuple, List[int]] = {}
+        for i, chaves_registro in enumerate(chaves):
+            for chave in chaves_registro:
+                if chave is not None:
+                    blocos.setdefault(chave, []).append(i)
+        return blocos
+
+    def detectar(self, pessoas: Iterable['Pessoa']) -> List[Dict[str, Any]]:
+        """
+        Encontra grupos de registros duplicados
+
+        Args:
+            pessoas: Registros a verificar
+
+        Returns:
+            list: Grupos da maior pontuação para a menor, cada um um dict com
+                'pontuacao' (maior pontuação de um par do grupo), 'pessoas'
+                (na ordem de entrada) e 'pares' ((pessoa, pessoa, pontuação,
+                motivos) acima do limiar)
+
+        """
+        inicio = time.perf_counter()
+        pessoas = list(pessoas)
+        caracteristicas = [self._caracteristicas(pessoa) for pessoa in pessoas]
+        chaves = [self._chaves(dados) for dados in caracteristicas]
+        blocos = self._blocos(chaves)
+
+        #bloco grande: vizinhos na ordem do nome (sorted neighborhood);
+        #posicoes[tipo][i] guarda a posição do registro i no seu bloco grande do tipo
+        total = len(pessoas)
+        janela = self.janela
+        posicoes = [[0] * total for _ in TIPOS_BLOCO]
+        for chave, bloco in blocos.items():
+            if len(bloco) > janela:
+                bloco.sort(key=lambda i: caracteristicas[i][2])
+                posicoes_tipo = posicoes[TIPOS_BLOCO.index(chave[0])]
+                for posicao, i in enumerate(bloco):
+                    posicoes_tipo[i] = posicao
+
+        def comparado_antes(i: int, j: int, tipo: int) -> bool:
+            """Se o par já é comparado em um bloco de tipo anterior"""
+            for anterior in range(tipo):
+                chave = chaves[i][anterior]
+                if chave is not None and chave == chaves[j][anterior] and (
+                        len(blocos[chave]) <= janela
+                        or abs(posicoes[anterior][i] - posicoes[anterior][j]) < janela):
+                    return True
+            return False
+
+        uniao = _UniaoBusca(total)
+        pares: List[Tuple[int, int, float, List[str]]] = []
+        comparacoes = 0
+        limiar = self.limiar
+        for chave, bloco in blocos.items():
+            tamanho = len(bloco)
+            if tamanho < 2:
+                continue
+            tipo = TIPOS_BLOCO.index(chave[0])
+            for posicao in range(tamanho - 1):
+                i = bloco[posicao]
+                dados_i = caracteristicas[i]
+                for j in bloco[posicao + 1:posicao + janela]:
+                    if tipo and comparado_antes(i, j, tipo):
+                        continue
+                    comparacoes += 1
+                    pontuacao, motivos = self.pontuar(dados_i, caracteristicas[j], limiar)
+                    if pontuacao >= limiar:
+                        pares.append((min(i, j), max(i, j), pontuacao, motivos))
+                        uniao.unir(i, j)
+
+        #raiz -> índices do grupo; raiz -> pares do grupo
+        membros: Dict[int, List[int]] = {}
+        pares_grupo: Dict[int, List[Tuple[int, int, float, List[str]]]] = {}
+        for par in pares:
+            pares_grupo.setdefault(uniao.raiz(par[0]), []).append(par)
+        for raiz in pares_grupo:
+            membros[raiz] = []
+        for i in range(total):
+            raiz = uniao.raiz(i)
+            if raiz in membros:
+                membros[raiz].append(i)
+
+        grupos = []
+        for raiz, indices in membros.items():
+            pares_ordenados = sorted(pares_grupo[raiz], key=lambda par: -par[2])
+            grupos.append({
+                'pontuacao': pares_ordenados[0][2],
+                'pessoas': [pessoas[i] for i in indices],
+                'pares': [(pessoas[i], pessoas[j], pontuacao, motivos)
+                          for i, j, pontuacao, motivos in pares_ordenados],
+                '_primeiro': indices[0],
+            })
+        grupos.sort(key=lambda grupo: (-grupo['pontuacao'], -len(grupo['pessoas']), grupo['_primeiro']))
+        for grupo in grupos:
+            del grupo['_primeiro']
+
+        self.estatisticas = {
+            'registros': total,
+            'blocos': len(blocos),
+            'comparacoes': comparacoes,
+            'pares_duplicados': len(pares),
+            'grupos': len(grupos),
+            'segundos': round(time.perf_counter() - inicio, 3),
+        }
+        return grupos
+
+
+def detectar_duplicados(cadastro: 'CadastroPessoas', limiar: float = 0.85,
+                        janela: int = 10) -> List[Dict[str, Any]]:
+    """
+    Grupos de duplicados de um cadastro (ver DetectorDuplicados.detectar)
+
+    Trabalha sobre um snapshot, então não bloqueia o cadastro enquanto roda.
+
+    """
+    return DetectorDuplicados(limiar, janela).detectar(cadastro.snapshot())
+
+
+def relatorio_duplicados(grupos: List[Dict[str, Any]], limite: Optional[int] = 20) -> str:
+    """Relatório em texto dos grupos (os `limite` primeiros; None para todos)"""
+    if not grupos:
+        return 'Nenhum duplicado encontrado.'
+    linhas = [f'{len(grupos)} grupo(s) de possíveis duplicados', '-' * 72]
+    for numero, grupo in enumerate(grupos[:limite], 1):
+        linhas.append(f"{numero}. pontuação {grupo['pontuacao']:.2f} - {len(grupo['pessoas'])} registros")
+        for pessoa in grupo['pessoas']:
+            linhas.append(f'     {pessoa.nome:<40} {pessoa.cpf_formatado:<16} {pessoa.ano_nascimento}')
+        a, b, pontuacao, motivos = grupo['pares'][0]
+        linhas.append(f"     melhor par: {pontuacao:.2f} ({', '.join(motivos)})")
+    if limite is not None and len(grupos) > limite:
+        linhas.append(f'... e mais {len(grupos) - limite} grupo(s)')
+    return '\n'.join(linhas)
+
+
+if __name__ == '__main__':
+    from benchmarks.gerador import GeradorPessoas
+    from models.pessoa import Pessoa, CadastroPessoas
+
+    print('TESTANDO DETECÇÃO DE DUPLICADOS...')
+    print('-' * 50)
+
+    for palavra in ['Souza', 'Sousa', 'Thiago', 'Tiago', 'Conceição', 'Felipe', 'Phelipe']:
+        print(f'{palavra:<10} -> {chave_fonetica(palavra)}')
+
+    cadastro = CadastroPessoas()
+    pessoas = list(GeradorPessoas(semente=42).pessoas(100_000))
+    for pessoa in pessoas:
+        cadastro.adicionar(pessoa)
+    #Duplicados plantados: CPF com pontuação, variação de nome com mesmo email e ano
+    original = pessoas[10]
+    cadastro.adicionar(Pessoa(original.nome.upper(), original.cpf_formatado, original.ano_nascimento))
+    outra = next(p for p in pessoas if p.email and len(p.nome.split()) == 3)
+    palavras = outra.nome.split()
+    cadastro.adicionar(Pessoa(f'{palavras[0]} de {palavras[2]}', '52998224725', outra.ano_nascimento,
+                              email=outra.email.upper()))
+
+    detector = DetectorDuplicados()
+    grupos = detector.detectar(cadastro.snapshot())
+    print(f'\n{detector.estatisticas}\n')
+    print(relatorio_duplicados(grupos, limite=3))
+
+    plantados = [grupo for grupo in grupos if any(pessoa in (original, outra) for pessoa in grupo['pessoas'])]
+    print('\nGrupos dos duplicados plantados:')
+    print(relatorio_duplicados(plantados))
@@ -0,0 +1,153 @@
+"""
+Estatísticas do cadastro calculadas em paralelo (map-reduce).
+
+O cadastro é publicado no armazenamento colunar em memória compartilhada;
+um pool de processos anexa sem cópia, calcula agregados parciais de blocos
+de linhas (map) e o processo principal os mescla na ordem dos blocos
+(reduce), então o resultado não depende de qual processo terminou antes.
+"""
+
+import multiprocessing
+import os
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from models.agregados import AgregadosCadastro, TabelasCruzadas
+from models.colunar import LeitorColunar, PublicadorColunar
+
+#Blocos por processo: mais blocos equilibram melhor a carga entre processos
+BLOCOS_POR_PROCESSO = 4
+
+_leitor: Optional[LeitorColunar] = None
+
+
+def _iniciar_trabalhador(nome_base: str) -> None:
+    """Anexa o processo do pool ao armazenamento colunar"""
+    global _leitor
+    _leitor = LeitorColunar(nome_base)
+
+
+def _agregar_bloco(tarefa: Tuple[int, int, int, bool]) -> Tuple[AgregadosCadastro, Optional[TabelasCruzadas]]:
+    """
+    Map: agregados parciais de um bloco de linhas
+
+    Args:
+        tarefa: (início, fim, precisão do HyperLogLog, calcular cruzamentos)
+
+    """
+    inicio, fim, precisao_hll, cruzamentos = tarefa
+    assert _leitor is not None
+    agregados = _leitor.agregados(inicio, fim, precisao_hll)
+    tabelas = None
+    if cruzamentos:
+        tabelas = TabelasCruzadas()
+        cpfs, anos, sexos = _leitor.colunas['cpf'], _leitor.colunas['ano'], _leitor.colunas['sexo']
+        codigos_sexo = _leitor.codigos_sexo
+        for i in range(inicio, fim):
+            cpf = cpfs[i]
+            tabelas.registrar(
+                cpf = f'{cpf:011d}' if cpf >= 0 else '',
+                ano_nascimento = anos[i],
+                sexo = codigos_sexo[sexos[i]],
+                telefone = _leitor._texto('telefone', i),
+            )
+    return agregados, tabelas
+
+
+def dividir_blocos(linhas: int, processos: int, tamanho_bloco: Optional[int] = None) -> List[Tuple[int, int]]:
+    """
+    Divide `linhas` em intervalos [início, fim) contíguos
+
+    Args:
+        linhas: Número total de linhas
+        processos: Número de processos do pool
+        tamanho_bloco: Linhas por bloco (padrão: BLOCOS_POR_PROCESSO blocos por processo)
+
+    """
+    if tamanho_bloco is None:
+        tamanho_bloco = max(1, -(-linhas // (processos * BLOCOS_POR_PROCESSO)))
+    return [(inicio, min(inicio + tamanho_bloco, linhas)) for inicio in range(0, linhas, tamanho_bloco)]
+
+
+def estatisticas_paralelas(fonte: Union[str, Iterable[Any]], processos: Optional[int] = None,
+                           tamanho_bloco: Optional[int] = None, cruzamentos: bool = False,
+                           precisao_hll: int = 12) -> Dict[str, Any]:
+    """
+    Calcula as estatísticas do cadastro em um pool de processos
+
+    Args:
+        fonte: Um CadastroPessoas (ou iterável de pessoas), publicado em um
+            armazenamento colunar temporário, ou o nome de um já publicado
+        processos: Tamanho do pool (padrão: número de CPUs)
+        tamanho_bloco: Linhas por tarefa do pool
+        cruzamentos: Se True, inclui a chave 'tabelas_cruzadas'
+        precisao_hll: Precisão dos HyperLogLog
+
+    Returns:
+        dict: Mesmo formato de `CadastroPessoas.estatisticas`, mais
+        'tabelas_cruzadas' quando `cruzamentos` é True
+
+    """
+    processos = processos or multiprocessing.cpu_count()
+    publicador = None
+    if isinstance(fonte, str):
+        nome_base = fonte
+    else:
+        nome_base = f'ficha_mr_{os.getpid()}_{uuid.uuid4().hex[:8]}'
+        publicador = PublicadorColunar(nome_base)
+        publicador.publicar(fonte)
+
+    try:
+        with LeitorColunar(nome_base) as leitor:
+            blocos = dividir_blocos(len(leitor), processos, tamanho_bloco)
+        tarefas = [(inicio, fim, precisao_hll, cruzamentos) for inicio, fim in blocos]
+        with multiprocessing.Pool(processos, _iniciar_trabalhador, (nome_base,)) as pool:
+            parciais = pool.map(_agregar_bloco, tarefas)
+    finally:
+        if publicador is not None:
+            publicador.fechar()
+
+    #Reduce na ordem dos blocos
+    agregados = AgregadosCadastro(precisao_hll)
+    tabelas = TabelasCruzadas()
+    for parcial, tabelas_parcial in parciais:
+        agregados.mesclar(parcial)
+        if tabelas_parcial is not None:
+            tabelas.mesclar(tabelas_parcial)
+
+    resultado = agregados.estatisticas()
+    if cruzamentos:
+        resultado['tabelas_cruzadas'] = tabelas.tabelas()
+    return resultado
+
+
+if __name__ == '__main__':
+    import time
+    from benchmarks.gerador import GeradorPessoas
+    from models.pessoa import CadastroPessoas
+
+    print('TESTANDO ESTATÍSTICAS PARALELAS...')
+    print('-' * 50)
+
+    cadastro = CadastroPessoas()
+    for pessoa in GeradorPessoas(semente=42).pessoas(20_000):
+        cadastro.adicionar(pessoa)
+
+    #recálculo completo em um processo (CadastroPessoas mantém os seus incrementalmente)
+    inicio = time.perf_counter()
+    agregados = AgregadosCadastro()
+    for pessoa in cadastro.pessoas:
+        agregados.registrar(pessoa.nome, pessoa.cpf, pessoa.ano_nascimento, pessoa.sexo,
+                            pessoa.email, pessoa.telefone)
+    serial = agregados.estatisticas()
+    print(f'\nSerial: {time.perf_counter() - inicio:.2f}s')
+
+    inicio = time.perf_counter()
+    paralelo = estatisticas_paralelas(cadastro, processos=2, cruzamentos=True)
+    print(f'Paralelo (2 processos): {time.perf_counter() - inicio:.2f}s')
+
+    tabelas = paralelo.pop('tabelas_cruzadas')
+    print(f'Mesmo resultado do serial: {paralelo == serial}')
+    print('\nSexo por faixa etária:')
+    for faixa, contagens in tabelas['sexo_por_faixa_etaria'].items():
+        print(f'  {faixa}: {contagens}')
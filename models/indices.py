@@ -0,0 +1,213 @@
+"""
+Índices em memória para o cadastro de pessoas.
+Evitam varrer todos os registros em buscas e filtros por chave.
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+
+
+class IndiceMultiplo:
+    """
+    Índice chave -> registros, mantido incrementalmente.
+
+    Cada chave aponta para um conjunto ordenado (ordem de inclusão) de
+    registros, então inclusão, remoção e consulta de uma chave são O(1).
+
+    """
+
+    def __init__(self):
+        """Inicializa um índice vazio"""
+        self._entradas: Dict[Hashable, Dict[Any, None]] = {}
+
+    def adicionar(self, chave: Hashable, registro: Any) -> None:
+        """Associa um registro à chave"""
+        self._entradas.setdefault(chave, {})[registro] = None
+
+    def remover(self, chave: Hashable, registro: Any) -> bool:
+        """
+        Remove a associação entre chave e registro
+
+        Returns:
+            bool: True se removeu, False se a associação não existia
+
+        """
+        registros = self._entradas.get(chave)
+        if registros is None or registro not in registros:
+            return False
+        del registros[registro]
+        if not registros:
+            del self._entradas[chave]
+        return True
+
+    def obter(self, chave: Hashable) -> List[Any]:
+        """Retorna os registros da chave, na ordem de inclusão"""
+        return list(self._entradas.get(chave, ()))
+
+    def obter_varias(self, chaves: Iterable[Hashable]) -> List[Any]:
+        """Retorna os registros de várias chaves (sem repetição)"""
+        resultado: Dict[Any, None] = {}
+        for chave in chaves:
+            resultado.update(self._entradas.get(chave, {}))
+        return list(resultado)
+
+    def primeiro(self, chave: Hashable) -> Optional[Any]:
+        """Retorna o primeiro registro incluído na chave, ou None"""
+        registros = self._entradas.get(chave)
+        if not registros:
+            return None
+        return next(iter(registros))
+
+    def renumerar(self, mapa: Dict[Any, Any]) -> None:
+        """
+        Troca cada registro por `mapa[registro]`, mantendo a ordem de cada chave
+
+        Usado quando os registros são ids (posições) que mudam de uma vez,
+        como na compactação do cadastro.
+
+        Raises:
+            KeyError: Se algum registro do índice não estiver no mapa
+
+        """
+        for chave, registros in self._entradas.items():
+            self._entradas[chave] = {mapa[registro]: None for registro in registros}
+
+    def contar(self, chave: Hashable) -> int:
+        """Número de registros associados à chave"""
+        return len(self._entradas.get(chave, ()))
+
+    def contagens(self) -> Dict[Hashable, int]:
+        """Número de registros por chave"""
+        return {chave: len(registros) for chave, registros in self._entradas.items()}
+
+    def chaves(self) -> List[Hashable]:
+        """Chaves presentes no índice"""
+        return list(self._entradas)
+
+    def __contains__(self, chave: Hashable) -> bool:
+        return chave in self._entradas
+
+    def __len__(self) -> int:
+        """Número de chaves distintas"""
+        return len(self._entradas)
+
+    def __repr__(self) -> str:
+        return f'IndiceMultiplo(chaves={len(self._entradas)})'
+
+
+class IndiceIds:
+    """
+    Índice chave -> ids de registro (inteiros), em arrays compactos.
+
+    Guarda 8 bytes por associação, contra as dezenas de um IndiceMultiplo,
+    para chaves com muitos registros (ex.: palavras dos nomes). Os ids de
+    cada chave ficam em ordem crescente, que é a ordem de inclusão quando os
+    ids são posições: incluir no fim é O(1); remover ou incluir fora de
+    ordem usa busca binária e desloca o resto do array.
+
+    """
+
+    def __init__(self):
+        """Inicializa um índice vazio"""
+        self._entradas: Dict[Hashable, array] = {}
+
+    def adicionar(self, chave: Hashable, registro: int) -> None:
+        """Associa um id à chave"""
+        ids = self._entradas.get(chave)
+        if ids is None:
+            self._entradas[chave] = array('q', (registro,))
+        elif ids[-1] < registro:
+            ids.append(registro)
+        else:
+            posicao = bisect_left(ids, registro)
+            if ids[posicao] != registro:
+                ids.insert(posicao, registro)
+
+    def remover(self, chave: Hashable, registro: int) -> bool:
+        """
+        Remove a associação entre chave e id
+
+        Returns:
+            bool: True se removeu, False se a associação não existia
+
+        """
+        ids = self._entradas.get(chave)
+        if ids is None:
+            return False
+        posicao = bisect_left(ids, registro)
+        if posicao == len(ids) or ids[posicao] != registro:
+            return False
+        del ids[posicao]
+        if not ids:
+            del self._entradas[chave]
+        return True
+
+    def obter(self, chave: Hashable) -> List[int]:
+        """Ids da chave, em ordem crescente"""
+        return list(self._entradas.get(chave, ()))
+
+    def obter_varias(self, chaves: Iterable[Hashable]) -> List[int]:
+        """Ids de várias chaves, sem repetição e em ordem crescente"""
+        listas = [self._entradas[chave] for chave in chaves if chave in self._entradas]
+        if len(listas) == 1:
+            return list(listas[0])
+        return sorted(set().union(*listas))
+
+    def renumerar(self, mapa: Dict[int, int]) -> None:
+        """
+        Troca cada id por `mapa[id]`
+
+        O mapa deve preservar a ordem dos ids, como na compactação do cadastro.
+
+        Raises:
+            KeyError: Se algum id do índice não estiver no mapa
+
+        """
+        for chave, ids in self._entradas.items():
+            self._entradas[chave] = array('q', map(mapa.__getitem__, ids))
+
+    def contar(self, chave: Hashable) -> int:
+        """Número de ids associados à chave"""
+        return len(self._entradas.get(chave, ()))
+
+    def contagens(self) -> Dict[Hashable, int]:
+        """Número de ids por chave"""
+        return {chave: len(ids) for chave, ids in self._entradas.items()}
+
+    def chaves(self) -> List[Hashable]:
+        """Chaves presentes no índice"""
+        return list(self._entradas)
+
+    def __contains__(self, chave: Hashable) -> bool:
+        return chave in self._entradas
+
+    def __len__(self) -> int:
+        """Número de chaves distintas"""
+        return len(self._entradas)
+
+    def __repr__(self) -> str:
+        return f'IndiceIds(chaves={len(self._entradas)})'
+
+
+if __name__ == '__main__':
+    print('TESTANDO ÍNDICE MÚLTIPLO...')
+    print('-' * 50)
+
+    indice = IndiceMultiplo()
+    for ddd, nome in [('27', 'Ana'), ('21', 'Bruno'), ('27', 'Carla'), ('11', 'Davi')]:
+        indice.adicionar(ddd, nome)
+
+    print(f'\nDDD 27: {indice.obter("27")}')
+    print(f'DDD 27 ou 21: {indice.obter_varias(["27", "21"])}')
+    print(f'Contagens: {indice.contagens()}')
+
+    indice.remover('27', 'Ana')
+    print(f'\nApós remover Ana -> DDD 27: {indice.obter("27")}')
+
+    ids = IndiceIds()
+    for registro, palavra in enumerate(['silva', 'souza', 'silva', 'lima', 'souza']):
+        ids.adicionar(palavra, registro)
+    ids.adicionar('silva', 1)
+    ids.remover('souza', 4)
+    print(f"\nIds 'silva': {ids.obter('silva')} | 'silva' ou 'lima': {ids.obter_varias(['silva', 'lima'])}")
@@ -0,0 +1,248 @@
+"""
+Perfil de memória do cadastro de pessoas.
+
+Percorre o cadastro com `sys.getsizeof` (contando cada objeto uma única
+vez) e divide os bytes por atributo de Pessoa, dicionários `sexo_dados`,
+tipo de objeto (strings, datetime, ...) e cada índice. Opcionalmente mede
+com `tracemalloc` o que a construção do cadastro realmente alocou, e
+projeta o consumo para outro número de registros.
+
+Uso:
+    from models.memoria import perfil_memoria, projetar_memoria, relatorio_memoria
+
+    perfil = perfil_memoria(cadastro)
+    print(relatorio_memoria(perfil, registros_alvo=10_000_000))
+"""
+
+import sys
+import tracemalloc
+from types import BuiltinFunctionType, FunctionType, ModuleType
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+#Objetos compartilhados com o resto do programa, que não entram na conta
+_NAO_PERCORRER = (type, ModuleType, FunctionType, BuiltinFunctionType)
+
+#Componentes do cadastro de tamanho fixo (não crescem com o número de registros)
+#(o dicionário e as sugestões de nomes crescem com o vocabulário, não com os registros)
+COMPONENTES_FIXOS = ('_anos', '_distintos', 'outros', 'DICIONARIO_NOMES', '_sugestoes_nome')
+#Atributos do cadastro medidos como componentes próprios; o resto vai para 'outros'
+COMPONENTES_CADASTRO = ('_anos', '_distintos', '_sugestoes_nome')
+
+
+def tamanho_profundo(obj: Any, vistos: Optional[Set[int]] = None,
+                     por_tipo: Optional[Dict[str, int]] = None) -> int:
+    """
+    Bytes de um objeto e de tudo o que ele alcança, segundo `sys.getsizeof`
+
+    Args:
+        obj: Objeto a medir
+        vistos: ids já contados; objetos neles são ignorados e os novos são
+            acrescentados (permite dividir um grafo compartilhado em partes)
+        por_tipo: Se informado, acumula os bytes por nome de tipo
+
+    Returns:
+        int: Bytes dos objetos ainda não vistos
+
+    """
+    vistos = set() if vistos is None else vistos
+    total = 0
+    pilha = [obj]
+    while pilha:
+        atual = pilha.pop()
+        if id(atual) in vistos or isinstance(atual, _NAO_PERCORRER):
+            continue
+        vistos.add(id(atual))
+        tamanho = sys.getsizeof(atual)
+        total += tamanho
+        if por_tipo is not None:
+            nome = type(atual).__name__
+            por_tipo[nome] = por_tipo.get(nome, 0) + tamanho
+
+        if isinstance(atual, dict):
+            pilha.extend(atual.keys())
+            pilha.extend(atual.values())
+        elif isinstance(atual, (list, tuple, set, frozenset)):
+            pilha.extend(atual)
+        if hasattr(atual, '__dict__'):
+            pilha.append(atual.__dict__)
+        for slot in getattr(type(atual), '__slots__', ()):
+            if hasattr(atual, slot):
+                pilha.append(getattr(atual, slot))
+    return total
+
+
+def perfil_memoria(cadastro: Any) -> Dict[str, Any]:
+    """
+    Divide a memória de um CadastroPessoas por componente e por tipo
+
+    As pessoas são medidas primeiro, então objetos compartilhados com os
+    índices (as próprias pessoas) contam para os registros, e cada índice
+    fica só com suas chaves e estruturas.
+
+    Args:
+        cadastro: CadastroPessoas (ou objeto com `pessoas` e atributos de índice)
+
+    Returns:
+        dict: 'registros', 'total', 'bytes_por_registro', 'componentes'
+        {nome: bytes}, 'por_tipo' {tipo: bytes} e 'fixos' (componentes que
+        não crescem com o cadastro)
+
+    """
+    vistos: Set[int] = {id(cadastro), id(cadastro.__dict__)}
+    por_tipo: Dict[str, int] = {}
+    componentes: Dict[str, int] = {}
+
+    def somar(nome: str, obj: Any) -> None:
+        componentes[nome] = componentes.get(nome, 0) + tamanho_profundo(obj, vistos, por_tipo)
+
+    pessoas = cadastro.pessoas
+    #estrutura que guarda os registros (`pessoas` de CadastroPessoas é uma visão dela)
+    lista = getattr(cadastro, '_registros', pessoas)
+    vistos.add(id(lista))
+    componentes['lista pessoas'] = sys.getsizeof(lista)
+    por_tipo[type(lista).__name__] = sys.getsizeof(lista)
+    for pessoa in pessoas:
+        if id(pessoa) in vistos:
+            continue
+        vistos.add(id(pessoa))
+        vistos.add(id(pessoa.__dict__))
+        objeto = sys.getsizeof(pessoa) + sys.getsizeof(pessoa.__dict__)
+        componentes['Pessoa (objeto)'] = componentes.get('Pessoa (objeto)', 0) + objeto
+        por_tipo[type(pessoa).__name__] = por_tipo.get(type(pessoa).__name__, 0) + sys.getsizeof(pessoa)
+        por_tipo['dict'] = por_tipo.get('dict', 0) + sys.getsizeof(pessoa.__dict__)
+        for atributo, valor in pessoa.__dict__.items():
+            somar('sexo_dados' if atributo == 'sexo_dados' else f'Pessoa.{atributo}', valor)
+
+    #Dicionário compartilhado pelos nomes codificados (ver models.tokens_nome)
+    from models.tokens_nome import DICIONARIO_NOMES
+    somar('DICIONARIO_NOMES', DICIONARIO_NOMES)
+
+    for atributo, valor in vars(cadastro).items():
+        if atributo.startswith('_indice') or atributo in COMPONENTES_CADASTRO:
+            somar(atributo, valor)
+        elif atributo not in ('pessoas', '_registros'):
+            somar('outros', valor)
+
+    total = sum(componentes.values())
+    registros = len(pessoas)
+    fixos = {nome: componentes[nome] for nome in COMPONENTES_FIXOS if nome in componentes}
+    variavel = total - sum(fixos.values())
+    return {
+        'registros': registros,
+        'total': total,
+        'bytes_por_registro': round(variavel / registros, 1) if registros else 0.0,
+        'componentes': {nome: bytes_ for nome, bytes_ in sorted(componentes.items(), key=lambda item: -item[1])
+                        if bytes_},
+        'por_tipo': dict(sorted(por_tipo.items(), key=lambda item: -item[1])),
+        'fixos': fixos,
+    }
+
+
+def medir_alocacoes(construir: Callable[[], Any], top: int = 10) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Executa `construir` sob o tracemalloc
+
+    Args:
+        construir: Função que monta e devolve o objeto a medir
+        top: Quantas linhas de código que mais alocaram listar
+
+    Returns:
+        tuple: (retorno de `construir`, {'alocado', 'pico', 'por_linha'}), em bytes;
+        'alocado' é o que continuava alocado ao final
+
+    """
+    ja_rastreando = tracemalloc.is_tracing()
+    if not ja_rastreando:
+        tracemalloc.start()
+    try:
+        inicio = tracemalloc.take_snapshot()
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        resultado = construir()
+        atual, pico = tracemalloc.get_traced_memory()
+        diferencas = tracemalloc.take_snapshot().compare_to(inicio, 'lineno')
+    finally:
+        if not ja_rastreando:
+            tracemalloc.stop()
+
+    por_linha = [{'linha': str(diferenca.traceback[0]), 'bytes': diferenca.size_diff}
+                 for diferenca in diferencas[:top] if diferenca.size_diff > 0]
+    return resultado, {'alocado': atual - base, 'pico': pico - base, 'por_linha': por_linha}
+
+
+def projetar_memoria(perfil: Dict[str, Any], registros_alvo: int) -> Dict[str, Any]:
+    """
+    Projeta a memória para outro número de registros
+
+    Componentes fixos são mantidos e os demais crescem linearmente. É uma
+    estimativa: tabelas de hash crescem em degraus, e chaves de índices com
+    poucos valores (sexo, região) crescem menos que linearmente.
+
+    Raises:
+        ValueError: Se o perfil não tiver registros
+
+    """
+    if perfil['registros'] == 0:
+        raise ValueError('Perfil sem registros; não há como projetar')
+    fator = registros_alvo / perfil['registros']
+    componentes = {nome: bytes_ if nome in perfil['fixos'] else round(bytes_ * fator)
+                   for nome, bytes_ in perfil['componentes'].items()}
+    return {
+        'registros': registros_alvo,
+        'total': sum(componentes.values()),
+        'componentes': componentes,
+    }
+
+
+def _mib(valor: float) -> str:
+    return f'{valor / 2**20:>10.1f} MiB'
+
+
+def relatorio_memoria(perfil: Dict[str, Any], registros_alvo: Optional[int] = None,
+                      alocacoes: Optional[Dict[str, Any]] = None) -> str:
+    """Relatório de texto de um perfil (e, se informados, projeção e tracemalloc)"""
+    total = perfil['total'] or 1
+    linhas = [
+        f"MEMÓRIA DO CADASTRO: {perfil['registros']:,} registros, "
+        f"{_mib(perfil['total']).strip()} ({perfil['bytes_por_registro']:,.0f} bytes/registro)",
+        '',
+        f"{'COMPONENTE':<28}{'BYTES':>14}{'%':>7}{'B/REG':>9}",
+    ]
+    registros = perfil['registros'] or 1
+    for nome, bytes_ in perfil['componentes'].items():
+        por_registro = '-' if nome in perfil['fixos'] else f'{bytes_ / registros:.0f}'
+        linhas.append(f'{nome:<28}{bytes_:>14,}{100 * bytes_ / total:>6.1f}%{por_registro:>9}')
+
+    linhas += ['', f"{'TIPO':<28}{'BYTES':>14}{'%':>7}"]
+    for nome, bytes_ in perfil['por_tipo'].items():
+        linhas.append(f'{nome:<28}{bytes_:>14,}{100 * bytes_ / total:>6.1f}%')
+
+    if alocacoes:
+        linhas += ['', f"TRACEMALLOC: {_mib(alocacoes['alocado']).strip()} alocados "
+                       f"(pico {_mib(alocacoes['pico']).strip()})"]
+        for linha in alocacoes['por_linha']:
+            linhas.append(f"  {linha['bytes']:>14,}  {linha['linha']}")
+
+    if registros_alvo:
+        projecao = projetar_memoria(perfil, registros_alvo)
+        linhas += ['', f"PROJEÇÃO PARA {registros_alvo:,} REGISTROS: {_mib(projecao['total']).strip()}"]
+        for nome, bytes_ in projecao['componentes'].items():
+            linhas.append(f'{nome:<28}{_mib(bytes_)}')
+    return '\n'.join(linhas)
+
+
+if __name__ == '__main__':
+    from benchmarks.gerador import GeradorPessoas
+    from models.pessoa import CadastroPessoas
+
+    print('TESTANDO PERFIL DE MEMÓRIA...')
+    print('-' * 50)
+
+    def construir() -> CadastroPessoas:
+        cadastro = CadastroPessoas()
+        for pessoa in GeradorPessoas(semente=42).pessoas(20_000):
+            cadastro.adicionar(pessoa)
+        return cadastro
+
+    cadastro, alocacoes = medir_alocacoes(construir, top=5)
+    print(relatorio_memoria(perfil_memoria(cadastro), registros_alvo=10_000_000, alocacoes=alocacoes))
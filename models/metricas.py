@@ -0,0 +1,269 @@
+"""
+Métricas de latência por operação (opcionais).
+
+Quando habilitadas, os métodos públicos de CadastroPessoas e as funções de
+entrada de `validacao` são trocados por versões que medem cada chamada em
+histogramas no estilo HDR. Desabilitadas, as funções originais voltam ao
+lugar, então não há custo nenhum por chamada.
+
+Uso:
+    from models.metricas import METRICAS, habilitar_metricas
+
+    habilitar_metricas()
+    ...
+    METRICAS.resumo()       #dicionário por operação
+    METRICAS.prometheus()   #texto no formato de exposição do Prometheus
+"""
+
+import sys
+import threading
+import time
+from functools import wraps
+from types import FunctionType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+#Bits de precisão do histograma: 2^3 = 8 baldes por potência de 2 (erro <= 6,25%)
+BITS_PRECISAO = 3
+
+#Limites dos baldes na exposição do Prometheus: potências de 2 de ~1 µs a ~17 s
+EXPOENTES_PROMETHEUS = range(10, 35)
+NOME_PROMETHEUS = 'ficha_cadastral_operacao_segundos'
+
+#Funções de entrada de `validacao` instrumentadas: módulo -> nomes
+FUNCOES_VALIDACAO = {
+    'validacao.cpf': ('validar_cpf',),
+    'validacao.nome': ('validar_nome',),
+    'validacao.idade': ('validar_ano_nascimento',),
+    'validacao.sexo': ('validar_sexo',),
+    'validacao.contato': ('validar_telefone',),
+}
+
+
+def _balde(valor: int) -> Tuple[int, int]:
+    """
+    Balde HDR de um valor: (limite inferior, largura)
+
+    Valores menores que 2^BITS_PRECISAO têm balde exato; acima disso cada
+    potência de 2 é dividida em 2^BITS_PRECISAO baldes de mesma largura.
+
+    """
+    deslocamento = valor.bit_length() - 1 - BITS_PRECISAO
+    if deslocamento <= 0:
+        return valor, 1
+    return (valor >> deslocamento) << deslocamento, 1 << deslocamento
+
+
+class HistogramaLatencia:
+    """
+    Histograma de latências em nanossegundos, com baldes log-lineares (HDR).
+
+    Guarda só os baldes usados; percentis têm erro relativo de no máximo
+    1 / 2^(BITS_PRECISAO + 1).
+
+    """
+
+    def __init__(self):
+        """Inicializa um histograma vazio"""
+        self.baldes: Dict[int, int] = {}
+        self.contagem = 0
+        self.soma = 0
+        self.maximo = 0
+
+    def registrar(self, nanossegundos: int) -> None:
+        """Registra uma latência"""
+        limite, _ = _balde(nanossegundos)
+        self.baldes[limite] = self.baldes.get(limite, 0) + 1
+        self.contagem += 1
+        self.soma += nanossegundos
+        if nanossegundos > self.maximo:
+            self.maximo = nanossegundos
+
+    def mesclar(self, outro: 'HistogramaLatencia') -> 'HistogramaLatencia':
+        """Soma outro histograma a este"""
+        for limite, quantidade in outro.baldes.items():
+            self.baldes[limite] = self.baldes.get(limite, 0) + quantidade
+        self.contagem += outro.contagem
+        self.soma += outro.soma
+        self.maximo = max(self.maximo, outro.maximo)
+        return self
+
+    def percentil(self, q: float) -> float:
+        """
+        Latência do percentil `q` (0 a 1), pelo ponto médio do balde
+
+        Raises:
+            ValueError: Se o histograma estiver vazio
+
+        """
+        if self.contagem == 0:
+            raise ValueError('Histograma vazio')
+        alvo = max(1, round(q * self.contagem))
+        acumulado = 0
+        for limite in sorted(self.baldes):
+            acumulado += self.baldes[limite]
+            if acumulado >= alvo:
+                _, largura = _balde(limite)
+                return min(limite + largura / 2, self.maximo)
+        return float(self.maximo)
+
+    def acumulado_ate(self, teto: int) -> int:
+        """Quantas latências ficaram em baldes inteiramente abaixo de `teto` (ns)"""
+        return sum(quantidade for limite, quantidade in self.baldes.items()
+                   if limite + _balde(limite)[1] <= teto)
+
+
+class RegistroMetricas:
+    """Histogramas de latência por nome de operação"""
+
+    def __init__(self):
+        """Inicializa o registro vazio e desabilitado"""
+        self.habilitado = False
+        self._histogramas: Dict[str, HistogramaLatencia] = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, operacao: str, nanossegundos: int) -> None:
+        """Registra a latência de uma chamada"""
+        with self._lock:
+            histograma = self._histogramas.get(operacao)
+            if histograma is None:
+                histograma = self._histogramas[operacao] = HistogramaLatencia()
+            histograma.registrar(nanossegundos)
+
+    def histogramas(self) -> Dict[str, HistogramaLatencia]:
+        """Cópia rasa dos histogramas, por operação"""
+        with self._lock:
+            return dict(self._histogramas)
+
+    def zerar(self) -> None:
+        """Descarta tudo o que foi medido"""
+        with self._lock:
+            self._histogramas = {}
+
+    def resumo(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Resumo por operação, ordenado pelo tempo total
+
+        Returns:
+            dict: {operacao: {'chamadas', 'total_ms', 'media_us', 'p50_us',
+            'p99_us', 'max_us'}}
+
+        """
+        resumo = {}
+        for operacao, histograma in self.histogramas().items():
+            resumo[operacao] = {
+                'chamadas': histograma.contagem,
+                'total_ms': round(histograma.soma / 1e6, 3),
+                'media_us': round(histograma.soma / histograma.contagem / 1e3, 2),
+                'p50_us': round(histograma.percentil(0.5) / 1e3, 2),
+                'p99_us': round(histograma.percentil(0.99) / 1e3, 2),
+                'max_us': round(histograma.maximo / 1e3, 2),
+            }
+        return dict(sorted(resumo.items(), key=lambda item: -item[1]['total_ms']))
+
+    def prometheus(self) -> str:
+        """Métricas no formato de exposição de texto do Prometheus (histograma)"""
+        linhas = [
+            f'# HELP {NOME_PROMETHEUS} Latência das operações do cadastro',
+            f'# TYPE {NOME_PROMETHEUS} histogram',
+        ]
+        for operacao, histograma in sorted(self.histogramas().items()):
+            rotulo = operacao.replace('\\', '\\\\').replace('"', '\\"')
+            for expoente in EXPOENTES_PROMETHEUS:
+                teto = 1 << expoente
+                linhas.append(f'{NOME_PROMETHEUS}_bucket{{operacao="{rotulo}",le="{teto / 1e9:.9g}"}} '
+                              f'{histograma.acumulado_ate(teto)}')
+            linhas.append(f'{NOME_PROMETHEUS}_bucket{{operacao="{rotulo}",le="+Inf"}} {histograma.contagem}')
+            linhas.append(f'{NOME_PROMETHEUS}_sum{{operacao="{rotulo}"}} {histograma.soma / 1e9:.9g}')
+            linhas.append(f'{NOME_PROMETHEUS}_count{{operacao="{rotulo}"}} {histograma.contagem}')
+        return '\n'.join(linhas) + '\n'
+
+
+METRICAS = RegistroMetricas()
+
+#(dono, atributo, original) de cada função trocada, para restaurar depois
+_trocas: List[Tuple[Any, str, Any]] = []
+
+
+def medir(operacao: str, funcao: Callable[..., Any], registro: Optional[RegistroMetricas] = None) -> Callable[..., Any]:
+    """Envolve `funcao` para registrar a latência de cada chamada em `operacao`"""
+    registro = registro or METRICAS
+    relogio = time.perf_counter_ns
+
+    @wraps(funcao)
+    def envoltorio(*args, **kwargs):
+        inicio = relogio()
+        try:
+            return funcao(*args, **kwargs)
+        finally:
+            registro.registrar(operacao, relogio() - inicio)
+    return envoltorio
+
+
+def _trocar(dono: Any, atributo: str, novo: Any) -> None:
+    _trocas.append((dono, atributo, dono.__dict__[atributo] if isinstance(dono, type) else getattr(dono, atributo)))
+    setattr(dono, atributo, novo)
+
+
+def habilitar_metricas() -> None:
+    """
+    Passa a medir os métodos públicos de CadastroPessoas e os validadores
+
+    As funções de `validacao` também são trocadas nos módulos que as
+    importaram pelo nome (ex.: `from validacao.cpf import validar_cpf`).
+
+    """
+    if METRICAS.habilitado:
+        return
+    import importlib
+    from models.pessoa import CadastroPessoas
+    from validacao.sexo import ValidadorGenero
+
+    for nome, atributo in list(vars(CadastroPessoas).items()):
+        if not nome.startswith('_') and isinstance(atributo, FunctionType):
+            _trocar(CadastroPessoas, nome, medir(f'CadastroPessoas.{nome}', atributo))
+
+    validar = ValidadorGenero.__dict__['validar'].__func__
+    _trocar(ValidadorGenero, 'validar', classmethod(medir('ValidadorGenero.validar', validar)))
+
+    for nome_modulo, funcoes in FUNCOES_VALIDACAO.items():
+        modulo = importlib.import_module(nome_modulo)
+        for nome in funcoes:
+            original = getattr(modulo, nome)
+            medida = medir(nome, original)
+            for outro in list(sys.modules.values()):
+                if getattr(outro, '__dict__', {}).get(nome) is original:
+                    _trocar(outro, nome, medida)
+
+    METRICAS.habilitado = True
+
+
+def desabilitar_metricas() -> None:
+    """Restaura as funções originais (os histogramas são mantidos)"""
+    while _trocas:
+        dono, atributo, original = _trocas.pop()
+        setattr(dono, atributo, original)
+    METRICAS.habilitado = False
+
+
+if __name__ == '__main__':
+    from models.pessoa import Pessoa, CadastroPessoas
+    from validacao.cpf import validar_cpf
+
+    print('TESTANDO MÉTRICAS DE LATÊNCIA...')
+    print('-' * 50)
+
+    habilitar_metricas()
+    cadastro = CadastroPessoas()
+    cadastro.adicionar(Pessoa('Ana Lima', '12345678909', 1990, 'F', 'ana@email.com'))
+    cadastro.adicionar(Pessoa('Bruno Costa', '11144477735', 1985, 'M'))
+    for _ in range(100):
+        cadastro.buscar_por_cpf('111.444.777-35')
+        validar_cpf('529.982.247-25')
+    cadastro.estatisticas()
+    desabilitar_metricas()
+    cadastro.buscar_por_cpf('111.444.777-35') #não é medido
+
+    for operacao, dados in METRICAS.resumo().items():
+        print(f'{operacao:<32} {dados}')
+    print()
+    print('\n'.join(METRICAS.prometheus().splitlines()[:3]) + '\n...')
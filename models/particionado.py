@@ -0,0 +1,289 @@
+"""
+Cadastro particionado por hash do CPF entre vários processos.
+Cada partição roda em um processo próprio, com seu CadastroPessoas e seus índices.
+"""
+
+import multiprocessing
+import threading
+import zlib
+from typing import Any, Dict, Iterable, List, Optional
+
+from models.pessoa import Pessoa, CadastroPessoas
+from models.agregados import AgregadosCadastro
+from validacao.cpf import limpar_cpf
+
+
+def particao_do_cpf(cpf: str, particoes: int) -> int:
+    """
+    Partição responsável por um CPF
+
+    Usa CRC32 do CPF limpo (estável entre processos e execuções), então o
+    mesmo CPF com ou sem pontuação sempre cai na mesma partição.
+
+    """
+    return zlib.crc32(limpar_cpf(cpf).encode('ascii')) % particoes
+
+
+def _executar_particao(conexao, opcoes: Dict[str, Any]) -> None:
+    """
+    Laço do processo de uma partição
+
+    Recebe (metodo, args, kwargs), executa no CadastroPessoas local e
+    devolve ('ok', resultado) ou ('erro', exceção). `None` encerra.
+
+    """
+    cadastro = CadastroPessoas(**opcoes)
+    while True:
+        try:
+            mensagem = conexao.recv()
+        except EOFError:
+            break
+        if mensagem is None:
+            break
+        metodo, args, kwargs = mensagem
+        try:
+            if metodo == 'adicionar_lote':
+                for pessoa in args[0]:
+                    cadastro.adicionar(pessoa)
+                resultado = len(args[0])
+            else:
+                resultado = getattr(cadastro, metodo)(*args, **kwargs)
+            conexao.send(('ok', resultado))
+        except Exception as e:
+            conexao.send(('erro', e))
+    conexao.close()
+
+
+class CadastroParticionado:
+    """
+    Cadastro distribuído em N processos por hash do CPF.
+
+    * Operações por CPF (adicionar, buscar, remover, atualizar) vão para
+      uma única partição
+    * Buscas e filtros são enviados a todas as partições ao mesmo tempo
+      (scatter) e os resultados concatenados em ordem de partição (gather)
+    * Estatísticas combinam os `AgregadosCadastro` parciais de cada partição
+
+    Restrições de unicidade de email/telefone valem apenas dentro de cada
+    partição, por isso não são oferecidas aqui.
+
+    Uso:
+        with CadastroParticionado(particoes=4) as cadastro:
+            cadastro.adicionar_lote(pessoas)
+            cadastro.estatisticas()
+
+    """
+
+    def __init__(self, particoes: Optional[int] = None, precisao_hll: int = 12):
+        """
+        Inicia os processos das partições
+
+        Args:
+            particoes: Número de partições (padrão: número de CPUs)
+            precisao_hll: Precisão dos HyperLogLog de cada partição
+
+        """
+        self.particoes = particoes or multiprocessing.cpu_count()
+        self._lock = threading.Lock()
+        self._conexoes = []
+        self._processos = []
+        opcoes = {'precisao_hll': precisao_hll}
+        for _ in range(self.particoes):
+            local, remota = multiprocessing.Pipe()
+            processo = multiprocessing.Process(target=_executar_particao, args=(remota, opcoes), daemon=True)
+            processo.start()
+            remota.close()
+            self._conexoes.append(local)
+            self._processos.append(processo)
+
+    #Comunicação com as partições
+
+    @staticmethod
+    def _receber(conexao) -> Any:
+        """Recebe a resposta de uma partição, relançando erros"""
+        status, resultado = conexao.recv()
+        if status == 'erro':
+            raise resultado
+        return resultado
+
+    def _chamar(self, particao: int, metodo: str, *args: Any, **kwargs: Any) -> Any:
+        """Executa um método em uma única partição"""
+        with self._lock:
+            conexao = self._conexoes[particao]
+            conexao.send((metodo, args, kwargs))
+            return self._receber(conexao)
+
+    def _espalhar(self, metodo: str, *args: Any, **kwargs: Any) -> List[Any]:
+        """Executa um método em todas as partições em paralelo"""
+        with self._lock:
+            for conexao in self._conexoes:
+                conexao.send((metodo, args, kwargs))
+            #recebe de todas antes de relançar, para não deixar respostas pendentes
+            respostas = [conexao.recv() for conexao in self._conexoes]
+        for status, resultado in respostas:
+            if status == 'erro':
+                raise resultado
+        return [resultado for _, resultado in respostas]
+
+    def _espalhar_lotes(self, metodo: str, lotes: List[List[Any]]) -> List[Any]:
+        """Executa um método em todas as partições em paralelo, cada uma com o seu lote"""
+        with self._lock:
+            for conexao, lote in zip(self._conexoes, lotes):
+                conexao.send((metodo, (lote,), {}))
+            respostas = [conexao.recv() for conexao in self._conexoes]
+        for status, resultado in respostas:
+            if status == 'erro':
+                raise resultado
+        return [resultado for _, resultado in respostas]
+
+    def _juntar(self, metodo: str, *args: Any) -> List[Pessoa]:
+        """Scatter-gather de um método que retorna lista de pessoas"""
+        return [pessoa for parcial in self._espalhar(metodo, *args) for pessoa in parcial]
+
+    #Operações por CPF (uma partição)
+
+    def particao(self, cpf: str) -> int:
+        """Índice da partição responsável pelo CPF"""
+        return particao_do_cpf(cpf, self.particoes)
+
+    def adicionar(self, pessoa: Pessoa) -> None:
+        """Adiciona uma pessoa na partição do seu CPF"""
+        self._chamar(self.particao(pessoa.cpf), 'adicionar', pessoa)
+
+    def adicionar_lote(self, pessoas: Iterable[Pessoa]) -> int:
+        """
+        Adiciona várias pessoas com uma única mensagem por partição
+
+        Returns:
+            int: Número de pessoas adicionadas
+
+        """
+        lotes: List[List[Pessoa]] = [[] for _ in range(self.particoes)]
+        for pessoa in pessoas:
+            lotes[self.particao(pessoa.cpf)].append(pessoa)
+
+        return sum(self._espalhar_lotes('adicionar_lote', lotes))
+
+    def buscar_por_cpf(self, cpf: str) -> Optional[Pessoa]:
+        """Busca uma pessoa pelo CPF (consulta apenas uma partição)"""
+        return self._chamar(self.particao(cpf), 'buscar_por_cpf', cpf)
+
+    def remover_por_cpf(self, cpf: str) -> bool:
+        """Remove uma pessoa pelo CPF (consulta apenas uma partição)"""
+        return self._chamar(self.particao(cpf), 'remover_por_cpf', cpf)
+
+    def remover_lote(self, cpfs: Iterable[str]) -> int:
+        """
+        Remove várias pessoas pelo CPF com uma única mensagem por partição
+
+        Returns:
+            int: Número de pessoas removidas
+
+        """
+        lotes: List[List[str]] = [[] for _ in range(self.particoes)]
+        for cpf in cpfs:
+            lotes[self.particao(cpf)].append(cpf)
+        return sum(self._espalhar_lotes('remover_lote', lotes))
+
+    def atualizar(self, cpf: str, **campos: Any) -> Optional[Pessoa]:
+        """Atualiza dados de uma pessoa (consulta apenas uma partição)"""
+        return self._chamar(self.particao(cpf), 'atualizar', cpf, **campos)
+
+    #Scatter-gather
+
+    def buscar_por_nome(self, nome: str) -> List[Pessoa]:
+        """Busca por nome em todas as partições"""
+        return self._juntar('buscar_por_nome', nome)
+
+    def buscar_por_email(self, email: str) -> List[Pessoa]:
+        """Busca por email em todas as partições"""
+        return self._juntar('buscar_por_email', email)
+
+    def buscar_por_telefone(self, telefone: str) -> List[Pessoa]:
+        """Busca por telefone em todas as partições"""
+        return self._juntar('buscar_por_telefone', telefone)
+
+    def filtrar_por_sexo(self, codigo_sexo: str) -> List[Pessoa]:
+        """Filtra por código do sexo em todas as partições"""
+        return self._juntar('filtrar_por_sexo', codigo_sexo)
+
+    def filtrar_por_regiao(self, *regioes: int) -> List[Pessoa]:
+        """Filtra por região fiscal do CPF em todas as partições"""
+        return self._juntar('filtrar_por_regiao', *regioes)
+
+    def filtrar_por_ddd(self, ddd: str) -> List[Pessoa]:
+        """Filtra por DDD em todas as partições"""
+        return self._juntar('filtrar_por_ddd', ddd)
+
+    def filtrar_por_uf(self, *ufs: str) -> List[Pessoa]:
+        """Filtra por estado (UF) em todas as partições"""
+        return self._juntar('filtrar_por_uf', *ufs)
+
+    def agregados(self) -> AgregadosCadastro:
+        """Agregados de todas as partições, mesclados em ordem de partição"""
+        parciais = self._espalhar('agregados')
+        total = parciais[0]
+        for parcial in parciais[1:]:
+            total.mesclar(parcial)
+        return total
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Estatísticas globais (mesmo formato de CadastroPessoas.estatisticas)"""
+        return self.agregados().estatisticas()
+
+    def tamanhos(self) -> List[int]:
+        """Número de pessoas em cada partição"""
+        return self._espalhar('__len__')
+
+    def __len__(self) -> int:
+        """Número total de pessoas"""
+        return sum(self.tamanhos())
+
+    #Ciclo de vida
+
+    def fechar(self) -> None:
+        """Encerra os processos das partições"""
+        with self._lock:
+            for conexao in self._conexoes:
+                try:
+                    conexao.send(None)
+                except (BrokenPipeError, OSError):
+                    pass
+                conexao.close()
+            for processo in self._processos:
+                processo.join(timeout=5)
+                if processo.is_alive():
+                    processo.terminate()
+            self._conexoes = []
+            self._processos = []
+
+    def __enter__(self) -> 'CadastroParticionado':
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.fechar()
+
+
+if __name__ == '__main__':
+    print('TESTANDO CADASTRO PARTICIONADO...')
+    print('-' * 50)
+
+    pessoas = [
+        Pessoa('Ana Lima', '12345678909', 1990, 'F', telefone='(27) 98866-4060'),
+        Pessoa('Bruno Costa', '11144477735', 1985, 'M', email='bruno@email.com'),
+        Pessoa('Carla Lima', '52998224725', 2000, 'NB', telefone='(21) 99876-5432'),
+        Pessoa('Davi Souza', '12546460781', 1988, 'M'),
+    ]
+
+    with CadastroParticionado(particoes=3) as cadastro:
+        cadastro.adicionar_lote(pessoas)
+        print(f'\nPessoas por partição: {cadastro.tamanhos()}')
+        print(f"CPF 529.982.247-25 -> partição {cadastro.particao('529.982.247-25')}: "
+              f"{cadastro.buscar_por_cpf('529.982.247-25').nome}")
+        print(f"Busca 'lima': {[p.nome for p in cadastro.buscar_por_nome('lima')]}")
+        print(f"UF ES/RJ: {[p.nome for p in cadastro.filtrar_por_uf('ES', 'RJ')]}")
+        print(f"Remoção em lote: {cadastro.remover_lote(['12345678909', '111.444.777-35'])} "
+              f"-> por partição: {cadastro.tamanhos()}")
+        print('\nEstatísticas globais:')
+        for chave, valor in cadastro.estatisticas().items():
+            print(f'  {chave}: {valor}')
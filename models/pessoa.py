@@ -3,12 +3,38 @@ Módulo Pessoa - Define a classe principal do sistema de ficha cadastral
 Integra com validação inclusive de gênero
 """
 
+import copy
+import weakref
 from datetime import datetime, date
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List, Sequence, Tuple, Union
 from validacao.sexo import validar_sexo, formatar_sexo, obter_sexo_simplificado
+from validacao.cpf import limpar_cpf, obter_regiao_fiscal
+from validacao.contato import (analisar_telefone, ddds_da_uf, DDD_UF,
+                               normalizar_email, normalizar_telefone)
+from models.sketches import HistogramaQuantis, HyperLogLog
+from models.indices import IndiceIds, IndiceMultiplo
+from models.concorrencia import LockLeituraEscrita, com_leitura, com_escrita
+from models.consultas_lentas import LogConsultasLentas, com_log_consulta
+from models.tokens_nome import DICIONARIO_NOMES, codigos_do_termo, dobrar
+from models.autocompletar import TrieSugestoes
+from models.snapshot import CadastroSnapshot
+from models.vetor import VetorBlocos
+from models.agregados import AgregadosCadastro, CONTADORES_DISTINTOS, valores_distintos
 
 class Pessoa:
-    """Classe que representa uma pessoa no sistema"""
+    """
+    Classe que representa uma pessoa no sistema
+
+    Enquanto estiver em algum CadastroPessoas, os campos indexados não podem
+    ser atribuídos direto no objeto (os índices ficariam desatualizados): use
+    `CadastroPessoas.atualizar` (ou `atualizar_sexo`, que passa por ele). A
+    trava acompanha a vida dos cadastros: ela só guarda referências fracas a
+    eles, então um cadastro descartado não deixa suas pessoas travadas.
+
+    """
+
+    #Atributos que alimentam os índices do cadastro
+    CAMPOS_INDEXADOS = frozenset({'_nome', 'cpf', 'ano_nascimento', 'sexo_dados', 'email', 'telefone'})
 
     def __init__(self, nome: str, cpf: str, ano_nascimento: int,
                  sexo: Optional[str] = None,
@@ -23,6 +49,71 @@ class Pessoa:
         self.telefone = telefone.strip() if telefone else None
         self.data_cadastro = datetime.now()
 
+    def __setattr__(self, atributo: str, valor: Any) -> None:
+        """
+        Atribui um atributo, recusando os indexados enquanto a pessoa estiver cadastrada
+
+        Raises:
+            AttributeError: Se o atributo for indexado e a pessoa estiver cadastrada
+
+        """
+        if atributo in Pessoa.CAMPOS_INDEXADOS and self._donos():
+            raise AttributeError(f"{atributo.lstrip('_')} de uma pessoa cadastrada só muda "
+                                 f"por CadastroPessoas.atualizar")
+        object.__setattr__(self, atributo, valor)
+
+    def _donos(self) -> List['CadastroPessoas']:
+        """Cadastros ainda existentes em que a pessoa está (um por inclusão)"""
+        referencias = self.__dict__.get('_cadastros')
+        if not referencias:
+            return []
+        return [cadastro for cadastro in (referencia() for referencia in referencias) if cadastro is not None]
+
+    @property
+    def cadastrada(self) -> bool:
+        """Se a pessoa está em algum CadastroPessoas (e seus campos indexados estão travados)"""
+        return bool(self._donos())
+
+    @property
+    def nome(self) -> str:
+        """Nome completo (guardado como ids de palavras do DICIONARIO_NOMES)"""
+        return DICIONARIO_NOMES.decodificar(self._nome)
+
+    @nome.setter
+    def nome(self, valor: str) -> None:
+        anterior = self.__dict__.get('_nome')
+        codificado = DICIONARIO_NOMES.codificar(valor)
+        try:
+            self._nome = codificado
+        except AttributeError:
+            DICIONARIO_NOMES.liberar(codificado)
+            raise
+        if anterior is not None:
+            DICIONARIO_NOMES.liberar(anterior)
+
+    def __del__(self) -> None:
+        #devolve as palavras do nome ao dicionário compartilhado
+        codificado = self.__dict__.get('_nome')
+        if codificado is not None:
+            DICIONARIO_NOMES.liberar(codificado)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Estado para pickle/cópia, com o nome em texto (o dicionário é do processo)
+
+        A cópia não herda o registro em cadastros, então pode ser alterada.
+
+        """
+        estado = dict(self.__dict__)
+        estado.pop('_cadastros', None)
+        estado['nome'] = DICIONARIO_NOMES.decodificar(estado.pop('_nome'))
+        return estado
+
+    def __setstate__(self, estado: Dict[str, Any]) -> None:
+        estado = dict(estado)
+        self.nome = estado.pop('nome')
+        self.__dict__.update(estado)
+
     @property
     def idade(self) -> int:
         """Calcula Idade Atual"""
@@ -65,10 +156,19 @@ class Pessoa:
         """
         Atualiza o sexo/gênero de cada pessoa
 
+        Se a pessoa estiver em cadastros, a alteração passa por cada um deles
+        (índices em dia): como em `CadastroPessoas.atualizar`, o cadastro
+        passa a guardar uma cópia atualizada, e esta pessoa, já fora dele,
+        recebe o mesmo valor.
+
         Args:
             nova_entrada: Nova entrada de sexo/gênero
+
         """
-        self.sexo_dados = validar_sexo(nova_entrada)
+        sexo_dados = validar_sexo(nova_entrada)
+        for cadastro in self._donos():
+            cadastro._atualizar_pessoa(self, {'sexo': nova_entrada})
+        self.sexo_dados = sexo_dados
 
     def to_dict(self) -> Dict[str, Any]:
         """Converte para dicionário"""
@@ -160,14 +260,284 @@ class Pessoa:
 class CadastroPessoas:
     """Gerencia o cadastro de múltiplas pessoas"""
 
-    def __init__(self):
-        """Inicializa um cadastro vazio"""
-        self.pessoas = []
+    #Campos que podem ser alterados via `atualizar` (o CPF identifica a pessoa)
+    CAMPOS_ATUALIZAVEIS = ('nome', 'ano_nascimento', 'sexo', 'email', 'telefone')
 
+    def __init__(self, precisao_hll: int = 12,
+                 emails_unicos: bool = False,
+                 telefones_unicos: bool = False,
+                 concorrente: bool = False,
+                 log_consultas: Optional[LogConsultasLentas] = None,
+                 limite_compactacao: float = 0.25):
+        """
+        Inicializa um cadastro vazio
+
+        Args:
+            precisao_hll: Precisão dos contadores de distintos (HyperLogLog).
+                Erro padrão ~1.04/sqrt(2^precisao); memória de 2^precisao bytes cada.
+            emails_unicos: Se True, recusa emails já cadastrados
+            telefones_unicos: Se True, recusa telefones já cadastrados
+            concorrente: Se True, protege os métodos públicos com um lock
+                leitor-escritor (leituras em paralelo, escritas serializadas).
+                O acesso direto a `pessoas` continua sem proteção.
+            log_consultas: Se informado, buscas e filtros acima do limite de
+                latência do log são gravados nele (ver models.consultas_lentas)
+            limite_compactacao: Fração de lápides (registros removidos) a
+                partir da qual o cadastro é compactado automaticamente
+
+        Raises:
+            ValueError: Se limite_compactacao não estiver em (0, 1]
+
+        """
+        if not 0 < limite_compactacao <= 1:
+            raise ValueError('limite_compactacao deve estar entre 0 (exclusive) e 1')
+        self._lock = LockLeituraEscrita() if concorrente else None
+        #Referência fraca a este cadastro, dividida pelas pessoas incluídas (ver Pessoa._donos)
+        self._referencia = (weakref.ref(self),)
+        self.log_consultas = log_consultas
+        self.limite_compactacao = limite_compactacao
+        #Registros por id (posição); removidos viram lápides (None) até a compactação.
+        #Em blocos: snapshots dividem os blocos e uma escrita copia só o seu bloco
+        self._registros = VetorBlocos()
+        self._removidos = 0
+        self.emails_unicos = emails_unicos
+        self.telefones_unicos = telefones_unicos
+        #Histograma dos anos de nascimento, mantido a cada inclusão/remoção
+        self._anos = HistogramaQuantis()
+        #Todos os índices guardam ids de registro (posição em `_registros`), que
+        #mudam só na compactação. Código de sexo -> ids, e contadores de
+        #preenchimento de contato
+        self._indice_sexo = IndiceMultiplo()
+        self._com_email = 0
+        self._com_telefone = 0
+        #Contadores aproximados de valores distintos (não decrementam na remoção)
+        self._precisao_hll = precisao_hll
+        self._distintos = {nome: HyperLogLog(precisao_hll) for nome in CONTADORES_DISTINTOS}
+        #CPF limpo -> ids; região fiscal (9º dígito) -> ids
+        self._indice_cpf = IndiceMultiplo()
+        self._indice_regiao = IndiceMultiplo()
+        #DDD -> ids (telefones normalizados uma única vez, na inclusão)
+        self._indice_ddd = IndiceMultiplo()
+        #Busca reversa: email normalizado / telefone normalizado -> ids
+        self._indice_email = IndiceMultiplo()
+        self._indice_telefone = IndiceMultiplo()
+        #Palavra do nome (código no DICIONARIO_NOMES) -> ids, em arrays compactos
+        #(as palavras comuns têm muitos registros cada)
+        self._indice_nome = IndiceIds()
+        #Palavras dos nomes por prefixo, com as mais frequentes (autocompletar)
+        self._sugestoes_nome = TrieSugestoes()
+
+    @com_escrita
     def adicionar(self, pessoa: Pessoa) -> None:
-        """Adiciona uma pessoa ao cadastro"""
-        self.pessoas.append(pessoa)
+        """
+        Adiciona uma pessoa ao cadastro
+
+        Raises:
+            ValueError: Se email/telefone já existirem e a unicidade estiver ativa
+
+        """
+        self._verificar_unicidade(pessoa)
+        self._registros.append(pessoa)
+        self._indexar(pessoa, len(self._registros) - 1)
+
+    @property
+    @com_leitura
+    def pessoas(self) -> Sequence[Pessoa]:
+        """
+        Pessoas do cadastro neste instante, na ordem de inclusão
+
+        Visão imutável tirada sob o lock de leitura (como `snapshot`), sem
+        lápides e sem compactar: pode ser percorrida enquanto outras threads
+        escrevem. Para alterar o cadastro use os métodos dele, que mantêm
+        os índices em dia.
 
+        """
+        return self._registros.congelar(len(self))
+
+    def _indices(self) -> Tuple[Union[IndiceMultiplo, IndiceIds], ...]:
+        """Índices por id de registro (renumerados juntos na compactação)"""
+        return (self._indice_cpf, self._indice_regiao, self._indice_sexo, self._indice_ddd,
+                self._indice_email, self._indice_telefone, self._indice_nome)
+
+    def _pessoas_dos_ids(self, registros: Iterable[int]) -> List[Pessoa]:
+        """Pessoas de uma lista de ids tirada de um índice (índices nunca apontam para lápides)"""
+        return self._registros.obter_varios(registros)
+
+    def _vivas(self) -> Iterable[Pessoa]:
+        """Pessoas do cadastro sem as lápides, sem compactar (para uso sob o lock)"""
+        if not self._removidos:
+            return self._registros
+        return (p for p in self._registros if p is not None)
+
+    @com_leitura
+    def snapshot(self) -> CadastroSnapshot:
+        """
+        Retorna uma visão imutável do cadastro neste instante
+
+        O snapshot divide os blocos de registros com o cadastro (ver
+        models.vetor): custa O(n/TAMANHO_BLOCO), com ou sem lápides, e a
+        primeira escrita posterior em cada bloco copia só aquele bloco.
+        Leituras no snapshot não usam o lock do cadastro, então não bloqueiam
+        nem são bloqueadas por escritas feitas depois.
+
+        """
+        return CadastroSnapshot(self._registros.congelar(len(self)), self._precisao_hll)
+
+    def exportar_dados(self, arquivo: str) -> int:
+        """
+        Exporta o cadastro para um arquivo texto, a partir de um snapshot
+
+        Returns:
+            int: Número de pessoas exportadas
+
+        """
+        return self.snapshot().exportar_dados(arquivo)
+
+    def _verificar_unicidade(self, pessoa: Pessoa) -> None:
+        """
+        Verifica as restrições de email/telefone únicos para uma pessoa
+
+        Raises:
+            ValueError: Se outra pessoa já usar o mesmo email ou telefone
+
+        """
+        if self.emails_unicos and pessoa.email and normalizar_email(pessoa.email) in self._indice_email:
+            raise ValueError(f'Email já cadastrado: {pessoa.email}')
+        if (self.telefones_unicos and pessoa.telefone
+                and normalizar_telefone(pessoa.telefone) in self._indice_telefone):
+            raise ValueError(f'Telefone já cadastrado: {pessoa.telefone}')
+
+    @com_escrita
+    def atualizar(self, cpf: str, **campos: Any) -> Optional[Pessoa]:
+        """
+        Atualiza dados de uma pessoa, mantendo os índices consistentes
+
+        Args:
+            cpf: CPF da pessoa a atualizar
+            campos: Novos valores (nome, ano_nascimento, sexo, email, telefone)
+
+        Returns:
+            Pessoa: Pessoa atualizada (um novo objeto, que substitui o anterior
+                no cadastro), ou None se o CPF não for encontrado
+
+        Raises:
+            ValueError: Se algum campo não puder ser atualizado ou violar unicidade
+
+        """
+        invalidos = set(campos) - set(self.CAMPOS_ATUALIZAVEIS)
+        if invalidos:
+            raise ValueError(f"Campos não atualizáveis: {', '.join(sorted(invalidos))}")
+
+        registro = self._indice_cpf.primeiro(limpar_cpf(cpf))
+        if registro is None:
+            return None
+        return self._atualizar_registro(registro, campos)
+
+    @com_escrita
+    def _atualizar_pessoa(self, pessoa: Pessoa, campos: Dict[str, Any]) -> Optional[Pessoa]:
+        """Como `atualizar`, mas para esta pessoa (e não a primeira com o CPF dela)"""
+        for registro in self._indice_cpf.obter(limpar_cpf(pessoa.cpf)):
+            if self._registros[registro] is pessoa:
+                return self._atualizar_registro(registro, campos)
+        return None
+
+    def _atualizar_registro(self, registro: int, campos: Dict[str, Any]) -> Pessoa:
+        """Substitui a pessoa do id `registro` por uma cópia com os campos novos"""
+        atual = self._registros[registro]
+
+        #Atualiza uma cópia: snapshots já tirados continuam vendo a versão anterior
+        nova = copy.copy(atual)
+        self._aplicar_campos(nova, campos)
+
+        self._desindexar(atual, registro)
+        try:
+            self._verificar_unicidade(nova)
+        except ValueError:
+            self._indexar(atual, registro)
+            raise
+
+        self._registros[registro] = nova
+        self._indexar(nova, registro)
+        return nova
+
+    @staticmethod
+    def _aplicar_campos(pessoa: Pessoa, campos: Dict[str, Any]) -> None:
+        """Atribui os campos à pessoa com a mesma normalização do construtor"""
+        for campo, valor in campos.items():
+            if campo == 'sexo':
+                pessoa.atualizar_sexo(valor)
+            elif campo == 'nome':
+                pessoa.nome = valor.strip()
+            elif campo == 'ano_nascimento':
+                pessoa.ano_nascimento = int(valor)
+            else:
+                setattr(pessoa, campo, valor.strip() if valor else None)
+
+    def _indexar(self, pessoa: Pessoa, registro: int) -> None:
+        """Atualiza índices e sketches com uma pessoa recém-incluída no id `registro`"""
+        #trava os campos indexados enquanto a pessoa estiver em algum cadastro vivo
+        donos = pessoa.__dict__.get('_cadastros')
+        if donos:
+            #descarta referências a cadastros que já não existem
+            pessoa._cadastros = tuple(dono for dono in donos if dono() is not None) + self._referencia
+        else:
+            pessoa._cadastros = self._referencia
+        #CPF normalizado uma única vez, na inclusão
+        cpf_limpo = limpar_cpf(pessoa.cpf)
+        self._indice_cpf.adicionar(cpf_limpo, registro)
+        if len(cpf_limpo) == 11:
+            self._indice_regiao.adicionar(obter_regiao_fiscal(cpf_limpo), registro)
+
+        self._anos.adicionar(pessoa.ano_nascimento)
+        self._indice_sexo.adicionar(pessoa.sexo, registro)
+        for codigo in dict.fromkeys(DICIONARIO_NOMES.codigos(pessoa._nome)):
+            self._indice_nome.adicionar(codigo, registro)
+            self._sugestoes_nome.adicionar(DICIONARIO_NOMES.textos[codigo], DICIONARIO_NOMES.dobrados[codigo])
+
+        telefone = analisar_telefone(pessoa.telefone)
+        if telefone:
+            self._indice_ddd.adicionar(telefone['ddd'], registro)
+        if pessoa.telefone:
+            self._indice_telefone.adicionar(normalizar_telefone(pessoa.telefone), registro)
+            self._com_telefone += 1
+        if pessoa.email:
+            self._indice_email.adicionar(normalizar_email(pessoa.email), registro)
+            self._com_email += 1
+
+        self._registrar_distintos(pessoa, telefone)
+
+    def _desindexar(self, pessoa: Pessoa, registro: int) -> None:
+        """Remove dos índices e sketches a pessoa do id `registro`"""
+        donos = list(pessoa._cadastros)
+        donos.remove(self._referencia[0])
+        pessoa._cadastros = tuple(donos)
+        cpf_limpo = limpar_cpf(pessoa.cpf)
+        self._indice_cpf.remover(cpf_limpo, registro)
+        if len(cpf_limpo) == 11:
+            self._indice_regiao.remover(obter_regiao_fiscal(cpf_limpo), registro)
+
+        self._anos.remover(pessoa.ano_nascimento)
+        self._indice_sexo.remover(pessoa.sexo, registro)
+        for codigo in dict.fromkeys(DICIONARIO_NOMES.codigos(pessoa._nome)):
+            self._indice_nome.remover(codigo, registro)
+            self._sugestoes_nome.remover(DICIONARIO_NOMES.textos[codigo], DICIONARIO_NOMES.dobrados[codigo])
+
+        telefone = analisar_telefone(pessoa.telefone)
+        if telefone:
+            self._indice_ddd.remover(telefone['ddd'], registro)
+        if pessoa.telefone:
+            self._indice_telefone.remover(normalizar_telefone(pessoa.telefone), registro)
+            self._com_telefone -= 1
+        if pessoa.email:
+            self._indice_email.remover(normalizar_email(pessoa.email), registro)
+            self._com_email -= 1
+
+    def _registrar_distintos(self, pessoa: Pessoa, telefone: Optional[Dict[str, str]]) -> None:
+        """Atualiza os contadores de distintos com os dados da pessoa"""
+        for contador, valor in valores_distintos(pessoa.nome, pessoa.email, pessoa.telefone, telefone).items():
+            self._distintos[contador].adicionar(valor)
+
+    @com_escrita
     def remover_por_cpf(self, cpf: str) -> bool:
         """
         Remove uma pessoa pelo CPF
@@ -179,75 +549,258 @@ class CadastroPessoas:
             bool: True se removeu, False se não encontrou
 
         """
-        cpf_limpo = ''.join(filter(str.isdigit, cpf))
-        for i, pessoa in enumerate(self.pessoas):
-            pessoa_cpf_limpo = ''.join(filter(str.isdigit, pessoa.cpf))
-            if pessoa_cpf_limpo == cpf_limpo:
-                del self.pessoas[i]
-                return True
-        return False
-    def buscar_por_cpf(self, cpf:str) -> Optional[Pessoa]:
-        """Busca uma pessoa pelo CPF"""
-        cpf_limpo = ''.join(filter(str.isdigit, cpf))
-        for pessoa in self.pessoas:
-            pessoa_cpf_limpo = ''.join(filter(str.isdigit, pessoa.cpf))
-            if pessoa_cpf_limpo == cpf_limpo:
-                return pessoa
-        return None
+        if not self._remover_registro(cpf):
+            return False
+        self._compactar_se_preciso()
+        return True
+
+    @com_escrita
+    def remover_lote(self, cpfs: Iterable[str]) -> int:
+        """
+        Remove várias pessoas pelo CPF, compactando no máximo uma vez no final
+
+        Args:
+            cpfs: CPFs das pessoas a remover (um registro por CPF informado)
+
+        Returns:
+            int: Número de pessoas removidas (CPFs não encontrados são ignorados)
 
+        """
+        removidas = sum(1 for cpf in cpfs if self._remover_registro(cpf))
+        if removidas:
+            self._compactar_se_preciso()
+        return removidas
+
+    def _remover_registro(self, cpf: str) -> bool:
+        """Troca o registro do CPF por uma lápide, em O(1), e o tira dos índices"""
+        registro = self._indice_cpf.primeiro(limpar_cpf(cpf))
+        if registro is None:
+            return False
+        pessoa = self._registros[registro]
+        self._registros[registro] = None
+        self._removidos += 1
+        self._desindexar(pessoa, registro)
+        return True
+
+    def _compactar_se_preciso(self) -> None:
+        """Compacta quando a fração de lápides passa de `limite_compactacao`"""
+        if self._removidos > self.limite_compactacao * len(self._registros):
+            self._compactar()
+
+    @com_escrita
+    def compactar(self) -> int:
+        """
+        Descarta as lápides, renumerando os registros (ex.: em horários ociosos)
+
+        Returns:
+            int: Número de lápides descartadas
+
+        """
+        return self._compactar()
+
+    def _compactar(self) -> int:
+        """Monta a lista só com as pessoas e renumera os ids em todos os índices"""
+        descartadas = self._removidos
+        if not descartadas:
+            return 0
+        registros = VetorBlocos()
+        novos_ids = {}
+        for antigo, pessoa in enumerate(self._registros):
+            if pessoa is not None:
+                novos_ids[antigo] = len(registros)
+                registros.append(pessoa)
+        for indice in self._indices():
+            indice.renumerar(novos_ids)
+        #vetor novo: snapshots que dividiam blocos do antigo não são afetados
+        self._registros = registros
+        self._removidos = 0
+        return descartadas
+
+    @com_leitura
+    @com_log_consulta()
+    def buscar_por_cpf(self, cpf:str) -> Optional[Pessoa]:
+        """Busca uma pessoa pelo CPF (usa o índice de CPF)"""
+        registro = self._indice_cpf.primeiro(limpar_cpf(cpf))
+        return None if registro is None else self._registros[registro]
+
+    @com_leitura
+    @com_log_consulta()
+    def buscar_por_email(self, email: str) -> List[Pessoa]:
+        """Busca pessoas pelo email (sem diferenciar maiúsculas/espaços)"""
+        return self._pessoas_dos_ids(self._indice_email.obter(normalizar_email(email)))
+
+    @com_leitura
+    @com_log_consulta()
+    def buscar_por_telefone(self, telefone: str) -> List[Pessoa]:
+        """Busca pessoas pelo telefone (em qualquer formato)"""
+        return self._pessoas_dos_ids(self._indice_telefone.obter(normalizar_telefone(telefone)))
+
+    def _codigos_nome(self, termo: str) -> Optional[List[bytes]]:
+        """Palavras que podem levar a um nome com `termo` (ver `codigos_do_termo`)"""
+        return codigos_do_termo(termo, self._indice_nome.contar)
+
+    def _candidatos_nome(self, nome: str) -> int:
+        """Quantas pessoas `buscar_por_nome` examina (para o log de consultas lentas)"""
+        codigos = self._codigos_nome(dobrar(nome))
+        if codigos is None:
+            return len(self)
+        return sum(self._indice_nome.contar(codigo) for codigo in codigos)
+
+    @com_leitura
+    @com_log_consulta(candidatos=_candidatos_nome)
     def buscar_por_nome(self, nome: str) -> list[Pessoa]:
-        """Busca por pessoas por nome (case-insensitive, parcial)"""
-        nome_lower = nome.lower()
-        return [p for p in self.pessoas if nome_lower in p.nome.lower()]
+        """
+        Busca pessoas por nome (parcial, sem diferenciar maiúsculas nem acentos)
+
+        Usa o índice de palavras do nome; os resultados vêm na ordem do
+        cadastro (a de `pessoas`).
+
+        """
+        termo = dobrar(nome)
+        if not termo:
+            return list(self._vivas())
+        codigos = self._codigos_nome(termo)
+        if codigos is None:
+            #termo só com espaços: confere o nome de todos
+            return [p for p in self._vivas() if termo in DICIONARIO_NOMES.dobrado(p._nome)]
+        candidatos = self._pessoas_dos_ids(self._indice_nome.obter_varias(codigos))
+        if termo.split() == [termo]:
+            return candidatos
+        return [p for p in candidatos if termo in DICIONARIO_NOMES.dobrado(p._nome)]
+
+    @com_leitura
+    def sugerir_nomes(self, prefixo: str, k: int = 10) -> List[Tuple[str, int]]:
+        """
+        Sugestões para completar a última palavra digitada de um nome
+
+        Custa O(tamanho do prefixo + k), independentemente do tamanho do cadastro.
+
+        Args:
+            prefixo: O que já foi digitado (ex.: 'maria sil')
+            k: Quantas sugestões devolver (no máximo 10)
 
+        Returns:
+            list: (palavra, quantas pessoas a têm no nome), da mais comum para a menos
+
+        """
+        palavras = prefixo.split()
+        ultima = palavras[-1] if palavras and not prefixo[-1].isspace() else ''
+        return self._sugestoes_nome.sugerir(ultima, k)
+
+    @com_leitura
+    @com_log_consulta()
     def filtrar_por_sexo(self, codigo_sexo: str) -> list[Pessoa]:
-        """Filtrar pessoas por código do sexo"""
-        return [p for p in self.pessoas if p.sexo == codigo_sexo]
+        """Filtrar pessoas por código do sexo (usa o índice de sexo)"""
+        return self._pessoas_dos_ids(self._indice_sexo.obter(codigo_sexo))
+
+    @com_leitura
+    @com_log_consulta()
+    def filtrar_por_regiao(self, *regioes: int) -> List[Pessoa]:
+        """
+        Filtra pessoas pela região fiscal do CPF (usa o índice de regiões)
+
+        Args:
+            regioes: Uma ou mais regiões fiscais (1 a 10, ver REGIOES_FISCAIS)
 
+        Returns:
+            list: Pessoas cujo CPF foi emitido em alguma das regiões
+
+        """
+        return self._pessoas_dos_ids(self._indice_regiao.obter_varias(regioes))
+
+    @com_leitura
+    def distribuicao_por_regiao(self) -> Dict[int, int]:
+        """Quantidade de pessoas por região fiscal do CPF"""
+        return dict(sorted(self._indice_regiao.contagens().items()))
+
+    @com_leitura
+    @com_log_consulta()
+    def filtrar_por_ddd(self, ddd: str) -> List[Pessoa]:
+        """Filtra pessoas pelo DDD do telefone (usa o índice de DDD)"""
+        return self._pessoas_dos_ids(self._indice_ddd.obter(''.join(filter(str.isdigit, ddd))))
+
+    @com_leitura
+    @com_log_consulta()
+    def filtrar_por_uf(self, *ufs: str) -> List[Pessoa]:
+        """
+        Filtra pessoas pelo estado (UF) do DDD do telefone
+
+        Args:
+            ufs: Uma ou mais siglas de estado (ex.: 'ES', 'RJ')
+
+        Returns:
+            list: Pessoas com telefone de algum dos estados, agrupadas por DDD
+
+        """
+        ddds = [ddd for uf in ufs for ddd in ddds_da_uf(uf)]
+        return self._pessoas_dos_ids(self._indice_ddd.obter_varias(ddds))
+
+    @com_leitura
+    def distribuicao_por_uf(self) -> Dict[str, int]:
+        """Quantidade de pessoas por estado (UF), a partir do índice de DDD"""
+        distribuicao: Dict[str, int] = {}
+        for ddd, quantidade in self._indice_ddd.contagens().items():
+            uf = DDD_UF[ddd]
+            distribuicao[uf] = distribuicao.get(uf, 0) + quantidade
+        return dict(sorted(distribuicao.items()))
+
+    @com_leitura
+    def agregados(self) -> AgregadosCadastro:
+        """
+        Agregados parciais do cadastro, a partir dos índices e sketches
+
+        Mescláveis (`AgregadosCadastro.mesclar`) com os de outras partições.
+
+        """
+        agregados = AgregadosCadastro(self._precisao_hll)
+        agregados.total = len(self)
+        agregados.anos = self._anos.copiar()
+        agregados.sexo = self._indice_sexo.contagens()
+        agregados.com_email = self._com_email
+        agregados.com_telefone = self._com_telefone
+        agregados.uf = self.distribuicao_por_uf()
+        agregados.regiao = self.distribuicao_por_regiao()
+        agregados.distintos = self.contadores_distintos()
+        return agregados
+
+    @com_leitura
     def estatisticas(self) -> Dict[str, Any]:
         """Retorna estatísticas do cadastro"""
-        total = len(self.pessoas)
-
-        if total == 0:
-            return {
-                'total_pessoas': 0,
-                'media_idade': 0,
-                'distribuicao_sexo': {},
-                'pessoas_com_email': 0,
-                'pessoas_com_telefone': 0
-            }
-
-        #Contagem por sexo/gênero
-        distribuicao = {}
-        for pessoa in self.pessoas:
-            codigo = pessoa.sexo
-            distribuicao[codigo] = distribuicao.get(codigo, 0) + 1
-
-        #Media de Idade
-        media_idade = sum(p.idade for p in self.pessoas) / total
+        return self.agregados().estatisticas()
 
-        return {
-            'total_pessoas': total,
-            'media_idade': round(media_idade, 1),
-            'distribuicao_sexo': distribuicao,
-            'pessoas_com_email': sum(1 for p in self.pessoas if p.email),
-            'pessoas_com_telefone': sum(1 for p in self.pessoas if p.telefone)
-        }
-    def listar_todos(self) -> str:
-        """Lista todas as pessoas do cadastro"""
-        if not self.pessoas:
-            return 'Cadastro Vazio'
+    @com_leitura
+    def contadores_distintos(self) -> Dict[str, HyperLogLog]:
+        """
+        Retorna cópias dos contadores HyperLogLog de distintos
 
-        resultado = []
+        Os contadores são mescláveis (`HyperLogLog.mesclar`) entre cadastros
+        particionados com a mesma precisão.
 
-        for i, pessoa in enumerate(self.pessoas, 1):
-            resultado.append(f'\n{i}. {pessoa.nome} - CPF: {pessoa.cpf_formatado} - {pessoa.sexo_display}')
-        return '\n'.join(resultado)
+        """
+        return {nome: hll.copiar() for nome, hll in self._distintos.items()}
+
+    @com_leitura
+    def histograma_anos(self) -> HistogramaQuantis:
+        """
+        Retorna uma cópia do histograma de anos de nascimento
 
+        O histograma é mesclável (`HistogramaQuantis.mesclar`), permitindo
+        combinar percentis de cadastros particionados.
+
+        """
+        return self._anos.copiar()
+
+    @com_leitura
+    def listar_todos(self) -> str:
+        """Lista todas as pessoas do cadastro"""
+        return listar_pessoas(self._vivas())
+
+    @com_leitura
     def __len__(self) -> int:
         """Retorna o número de pessoas no cadastro"""
-        return len(self.pessoas)
+        return len(self._registros) - self._removidos
 
+    @com_leitura
     def __str__(self) -> str:
         """Representação do cadastro"""
         estat = self.estatisticas()
@@ -260,18 +813,27 @@ class CadastroPessoas:
             '-' * 40,
             f"Total de pessoas: {estat['total_pessoas']}",
             f"Média de Idade: {estat['media_idade']} anos",
+            f"Mediana de Idade: {estat['mediana_idade']} anos",
             f"Pessoas com email: {estat['pessoas_com_email']}",
             f"Pessoas com telefone: {estat['pessoas_com_telefone']}",
             "\nDistribuição por sexo/gênero: "
         ]
         for codigo, quantidade in estat['distribuicao_sexo'].items():
             #Pega exemplo para mostrar display
-            exemplo = next((p for p in self.pessoas if p.sexo == codigo), None)
+            exemplo = next((p for p in self._registros if p is not None and p.sexo == codigo), None)
             display = exemplo.sexo_display if exemplo else codigo
             resultado.append(f" {display}: {quantidade}")
 
         return "\n".join(resultado)
 
+def listar_pessoas(pessoas: Iterable[Pessoa]) -> str:
+    """Lista numerada de pessoas (nome, CPF e sexo/gênero), ou 'Cadastro Vazio'"""
+    resultado = []
+
+    for i, pessoa in enumerate(pessoas, 1):
+        resultado.append(f'\n{i}. {pessoa.nome} - CPF: {pessoa.cpf_formatado} - {pessoa.sexo_display}')
+    return '\n'.join(resultado) or 'Cadastro Vazio'
+
 #Função para criar pessoas interativamente:
 def criar_pessoa_interativo() -> Pessoa:
     """Cria uma pessao interativamente via terminal
@@ -397,6 +959,9 @@ if __name__ == '__main__':
     cadastro.adicionar(pessoa4)
 
     print(cadastro)
+    print(f"\nPessoas com DDD 11: {[p.nome for p in cadastro.filtrar_por_ddd('11')]}")
+    print(f"Pessoas em SP/RJ: {[p.nome for p in cadastro.filtrar_por_uf('SP', 'RJ')]}")
+    print(f"Pessoas da 7ª região fiscal: {[p.nome for p in cadastro.filtrar_por_regiao(7)]}")
 
     #6. Teste Estatísticas
     print('\n\n6. Estatísticas Detalhadas: ')
@@ -420,11 +985,33 @@ if __name__ == '__main__':
     else:
         print('Não encontrada')
 
-    #9. Teste Atualização de Sexo
+    #8.1 Teste Busca Reversa
+    print('\n\n8.1 TESTE DE BUSCA POR EMAIL/TELEFONE: ')
+    print(f"Email ' TAYLOR@email.com': {[p.nome for p in cadastro.buscar_por_email(' TAYLOR@email.com')]}")
+    print(f"Telefone '+55 11 98765-4321': {[p.nome for p in cadastro.buscar_por_telefone('+55 11 98765-4321')]}")
+
+    cadastro.atualizar('98765432100', email='manu@email.com')
+    print(f"Após atualizar email: {[p.nome for p in cadastro.buscar_por_email('manu@email.com')]}")
+
+    #8.2 Teste Sugestões de Nome
+    print('\n\n8.2 TESTE DE SUGESTÕES DE NOME: ')
+    for prefixo in ['t', 'Maria s', 'a']:
+        print(f"'{prefixo}': {cadastro.sugerir_nomes(prefixo, 3)}")
+
+    #8.3 Teste Remoção em Lote
+    print('\n\n8.3 TESTE DE REMOÇÃO EM LOTE: ')
+    removidas = cadastro.remover_lote(['111.222.333-44', '55566677788', '00000000000'])
+    print(f'Removidas: {removidas} | Restantes: {[p.nome for p in cadastro.pessoas]}')
+
+    #9. Teste Atualização de Sexo (pessoa cadastrada: passa pelo cadastro)
     print('\n\n9. TESTE DE ATUALIZAÇÃO DE SEXO: ')
     print(f'ANTES: {pessoa1.sexo_display}')
+    try:
+        pessoa1.sexo_dados = {}
+    except AttributeError as e:
+        print(f'Atribuição direta: {e}')
     pessoa1.atualizar_sexo('X')
-    print(f'DEPOIS: {pessoa1.sexo_display}')
+    print(f'DEPOIS: {pessoa1.sexo_display} | Filtro X: {[p.nome for p in cadastro.filtrar_por_sexo("X")]}')
 
     #10. Teste de Conversão para/from dicionário
     print('\n\n10. TESTE DE SERIALIZAÇÃO: ')
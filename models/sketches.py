@@ -0,0 +1,435 @@
+"""
+Sketches (estruturas resumidas) para as estatísticas do cadastro.
+Estruturas pequenas, atualizadas incrementalmente e mescláveis entre partições.
+"""
+
+import hashlib
+import struct
+from collections import Counter
+from math import ceil, exp, log, sqrt
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class HistogramaQuantis:
+    """
+    Sketch de quantis para valores inteiros de domínio limitado.
+
+    O ano de nascimento só pode variar entre 1900 e o ano atual, então um
+    histograma de contagens por valor já é um resumo compacto e EXATO:
+
+    * Memória: O(valores distintos) -- no máximo ~130 entradas para idades
+    * Atualização (adicionar/remover): O(1)
+    * Mesclagem entre partições: O(valores distintos), comutativa e associativa
+    * Consulta de quantil: O(d log d), com d = valores distintos
+    * Erro: zero (ao contrário de t-digest/KLL, que têm erro de rank ~1/k)
+
+    Diferente de t-digest e KLL, também aceita remoções.
+
+    Quantis usam a definição "nearest-rank": o menor valor v tal que pelo
+    menos ceil(q * total) elementos são <= v.
+
+    """
+
+    def __init__(self, contagens: Optional[Dict[int, int]] = None):
+        """Inicializa o histograma, opcionalmente a partir de contagens"""
+        self.contagens: Dict[int, int] = {}
+        self.total = 0
+        if contagens:
+            for valor, quantidade in contagens.items():
+                self.adicionar(valor, quantidade)
+
+    def adicionar(self, valor: int, quantidade: int = 1) -> None:
+        """Registra `quantidade` ocorrências de `valor`"""
+        if quantidade <= 0:
+            return
+        self.contagens[valor] = self.contagens.get(valor, 0) + quantidade
+        self.total += quantidade
+
+    def remover(self, valor: int, quantidade: int = 1) -> None:
+        """
+        Remove `quantidade` ocorrências de `valor`
+
+        Raises:
+            ValueError: Se o valor não tiver ocorrências suficientes
+
+        """
+        atual = self.contagens.get(valor, 0)
+        if atual < quantidade:
+            raise ValueError(f'Valor {valor} não está no histograma')
+        if atual == quantidade:
+            del self.contagens[valor]
+        else:
+            self.contagens[valor] = atual - quantidade
+        self.total -= quantidade
+
+    def mesclar(self, outro: 'HistogramaQuantis') -> 'HistogramaQuantis':
+        """
+        Mescla outro histograma neste (ex.: resultados de partições diferentes)
+
+        Returns:
+            HistogramaQuantis: o próprio histograma, para encadeamento
+
+        """
+        for valor, quantidade in outro.contagens.items():
+            self.adicionar(valor, quantidade)
+        return self
+
+    def transformar(self, funcao: Callable[[int], int]) -> 'HistogramaQuantis':
+        """
+        Cria um novo histograma aplicando `funcao` a cada valor
+
+        Útil para converter anos de nascimento em idades sem reprocessar registros.
+
+        """
+        novo = HistogramaQuantis()
+        for valor, quantidade in self.contagens.items():
+            novo.adicionar(funcao(valor), quantidade)
+        return novo
+
+    def quantis(self, qs: Iterable[float]) -> Dict[float, Optional[int]]:
+        """
+        Calcula vários quantis em uma única passada
+
+        Args:
+            qs: Quantis desejados, entre 0 e 1 (ex.: [0.5, 0.9, 0.99])
+
+        Returns:
+            dict: {q: valor} (valor é None se o histograma estiver vazio)
+
+        Raises:
+            ValueError: Se algum quantil estiver fora de [0, 1]
+
+        """
+        qs = list(qs)
+        for q in qs:
+            if not 0 <= q <= 1:
+                raise ValueError('Quantil deve estar entre 0 e 1')
+
+        if self.total == 0:
+            return {q: None for q in qs}
+
+        #rank alvo de cada quantil (nearest-rank, mínimo 1)
+        alvos = sorted((max(1, ceil(q * self.total)), q) for q in qs)
+        resultado: Dict[float, Optional[int]] = {}
+
+        acumulado = 0
+        i = 0
+        for valor in sorted(self.contagens):
+            acumulado += self.contagens[valor]
+            while i < len(alvos) and alvos[i][0] <= acumulado:
+                resultado[alvos[i][1]] = valor
+                i += 1
+            if i == len(alvos):
+                break
+        return resultado
+
+    def quantil(self, q: float) -> Optional[int]:
+        """Retorna um único quantil (ver `quantis`)"""
+        return self.quantis([q])[q]
+
+    def soma(self) -> int:
+        """Soma de todos os valores registrados"""
+        return sum(valor * quantidade for valor, quantidade in self.contagens.items())
+
+    def copiar(self) -> 'HistogramaQuantis':
+        """Retorna uma cópia independente"""
+        return HistogramaQuantis(self.contagens)
+
+    def __len__(self) -> int:
+        """Número total de ocorrências registradas"""
+        return self.total
+
+    def __repr__(self) -> str:
+        return f'HistogramaQuantis(total={self.total}, distintos={len(self.contagens)})'
+
+
+def hash_64(valor: str) -> int:
+    """
+    Hash estável de 64 bits para strings
+
+    Usa blake2b em vez de hash() porque o hash nativo de str muda a cada
+    processo, o que impediria mesclar sketches de partições diferentes.
+
+    """
+    return int.from_bytes(hashlib.blake2b(valor.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class HyperLogLog:
+    """
+    Contador aproximado de valores distintos (HyperLogLog).
+
+    * Memória: 2^precisao bytes (precisao=12 -> 4 KiB), independente do volume
+    * Erro padrão relativo: ~1.04 / sqrt(2^precisao) (precisao=12 -> ~1.6%)
+    * Mesclagem entre partições: máximo registrador a registrador
+
+    Não aceita remoções: a contagem reflete todos os valores já vistos.
+
+    """
+
+    PRECISAO_MIN = 4
+    PRECISAO_MAX = 18
+
+    def __init__(self, precisao: int = 12):
+        """
+        Inicializa o contador
+
+        Args:
+            precisao: Bits usados para escolher o registrador (4 a 18)
+
+        Raises:
+            ValueError: Se a precisão estiver fora do intervalo aceito
+
+        """
+        if not self.PRECISAO_MIN <= precisao <= self.PRECISAO_MAX:
+            raise ValueError(
+                f'Precisão deve estar entre {self.PRECISAO_MIN} e {self.PRECISAO_MAX}'
+            )
+        self.precisao = precisao
+        self.m = 1 << precisao
+        self.registradores = bytearray(self.m)
+
+    @property
+    def erro_padrao(self) -> float:
+        """Erro padrão relativo teórico da estimativa"""
+        return 1.04 / sqrt(self.m)
+
+    def adicionar(self, valor: str) -> None:
+        """Registra um valor (valores repetidos não alteram a contagem)"""
+        h = hash_64(valor)
+        indice = h >> (64 - self.precisao)
+        resto = h & ((1 << (64 - self.precisao)) - 1)
+        #posição do primeiro bit 1 nos bits restantes (1 = bit mais significativo)
+        rank = (64 - self.precisao) - resto.bit_length() + 1
+        if rank > self.registradores[indice]:
+            self.registradores[indice] = rank
+
+    def mesclar(self, outro: 'HyperLogLog') -> 'HyperLogLog':
+        """
+        Mescla outro contador neste
+
+        Raises:
+            ValueError: Se as precisões forem diferentes
+
+        """
+        if outro.precisao != self.precisao:
+            raise ValueError('Só é possível mesclar HyperLogLog de mesma precisão')
+        self.registradores = bytearray(map(max, self.registradores, outro.registradores))
+        return self
+
+    def contar(self) -> int:
+        """Estimativa do número de valores distintos"""
+        m = self.m
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        #agrupa registradores iguais: no máximo ~64 valores distintos para somar
+        frequencias = Counter(self.registradores)
+        estimativa = alpha * m * m / sum(n * 2.0 ** -r for r, n in frequencias.items())
+
+        #correção para cardinalidades pequenas (contagem linear)
+        vazios = frequencias.get(0, 0)
+        if estimativa <= 2.5 * m and vazios:
+            estimativa = m * log(m / vazios)
+        return round(estimativa)
+
+    def copiar(self) -> 'HyperLogLog':
+        """Retorna uma cópia independente"""
+        novo = HyperLogLog(self.precisao)
+        novo.registradores = bytearray(self.registradores)
+        return novo
+
+    def __repr__(self) -> str:
+        return f'HyperLogLog(precisao={self.precisao}, estimativa={self.contar()})'
+
+
+class FiltroBloom:
+    """
+    Filtro de Bloom: "talvez esteja" ou "com certeza não está" em O(k).
+
+    * Memória: ~1.44 · log2(1/taxa) bits por valor (taxa=1% -> ~1.2 bytes)
+    * Falsos positivos: ~taxa enquanto couberem até `capacidade` valores;
+      acima disso a taxa real sobe (ver `taxa_estimada`)
+    * Mesclagem entre partições: OU bit a bit (mesmo tamanho e k)
+
+    Não aceita remoções. Conta as consultas com resposta positiva (talvez
+    esteja) e negativa (com certeza não está).
+
+    """
+
+    #magic, formato, k, bits, capacidade, quantidade, taxa de falsos positivos
+    CABECALHO = struct.Struct('<4sHHQQQd')
+    MAGIC = b'FCBF'
+    VERSAO_FORMATO = 1
+
+    def __init__(self, capacidade: int, taxa_falsos_positivos: float = 0.01):
+        """
+        Inicializa um filtro vazio dimensionado para a capacidade
+
+        Args:
+            capacidade: Número de valores previsto
+            taxa_falsos_positivos: Taxa desejada com `capacidade` valores (entre 0 e 1)
+
+        Raises:
+            ValueError: Se a capacidade não for positiva ou a taxa estiver fora de (0, 1)
+
+        """
+        if capacidade < 1:
+            raise ValueError('A capacidade do filtro deve ser positiva')
+        if not 0 < taxa_falsos_positivos < 1:
+            raise ValueError('A taxa de falsos positivos deve estar entre 0 e 1 (exclusive)')
+        self.capacidade = capacidade
+        self.taxa_falsos_positivos = taxa_falsos_positivos
+        #tamanho e número de hashes ótimos para a capacidade e a taxa
+        self.m = max(8, ceil(-capacidade * log(taxa_falsos_positivos) / log(2) ** 2))
+        self.k = max(1, round(self.m / capacidade * log(2)))
+        self.bits = bytearray((self.m + 7) // 8)
+        self.quantidade = 0
+        self.positivos = 0
+        self.negativos = 0
+
+    def _hashes(self, valor: str) -> Tuple[int, int]:
+        """Par de hashes do valor (hash duplo: a i-ésima posição é h1 + i·h2, módulo m)"""
+        h = int.from_bytes(hashlib.blake2b(valor.encode('utf-8'), digest_size=16).digest(), 'little')
+        return h & 0xFFFFFFFFFFFFFFFF, (h >> 64) | 1
+
+    def adicionar(self, valor: str) -> None:
+        """Registra um valor"""
+        posicao, passo = self._hashes(valor)
+        m, bits = self.m, self.bits
+        for _ in range(self.k):
+            bit = posicao % m
+            bits[bit >> 3] |= 1 << (bit & 7)
+            posicao += passo
+        self.quantidade += 1
+
+    def __contains__(self, valor: str) -> bool:
+        """True se o valor talvez tenha sido registrado; False se com certeza não foi"""
+        posicao, passo = self._hashes(valor)
+        m, bits = self.m, self.bits
+        for _ in range(self.k):
+            bit = posicao % m
+            if not bits[bit >> 3] & (1 << (bit & 7)):
+                self.negativos += 1
+                return False
+            posicao += passo
+        self.positivos += 1
+        return True
+
+    @property
+    def taxa_estimada(self) -> float:
+        """Taxa de falsos positivos esperada com a quantidade atual de valores"""
+        return (1 - exp(-self.k * self.quantidade / self.m)) ** self.k
+
+    def mesclar(self, outro: 'FiltroBloom') -> 'FiltroBloom':
+        """
+        Mescla outro filtro neste
+
+        Raises:
+            ValueError: Se os filtros tiverem tamanhos ou números de hashes diferentes
+
+        """
+        if (outro.m, outro.k) != (self.m, self.k):
+            raise ValueError('Só é possível mesclar filtros de Bloom de mesmo tamanho e k')
+        self.bits = bytearray(a | b for a, b in zip(self.bits, outro.bits))
+        self.quantidade += outro.quantidade
+        return self
+
+    def copiar(self) -> 'FiltroBloom':
+        """Retorna uma cópia independente (com os contadores zerados)"""
+        novo = FiltroBloom(self.capacidade, self.taxa_falsos_positivos)
+        novo.bits = bytearray(self.bits)
+        novo.quantidade = self.quantidade
+        return novo
+
+    def para_bytes(self) -> bytes:
+        """Filtro serializado (cabeçalho + bits), sem os contadores de consultas"""
+        return self.CABECALHO.pack(self.MAGIC, self.VERSAO_FORMATO, self.k, self.m, self.capacidade,
+                                   self.quantidade, self.taxa_falsos_positivos) + bytes(self.bits)
+
+    @classmethod
+    def de_bytes(cls, dados: bytes) -> 'FiltroBloom':
+        """
+        Reconstrói um filtro serializado por `para_bytes`
+
+        Raises:
+            ValueError: Se os dados não estiverem no formato esperado
+
+        """
+        try:
+            magic, formato, k, m, capacidade, quantidade, taxa = cls.CABECALHO.unpack_from(dados, 0)
+        except struct.error:
+            raise ValueError('Filtro de Bloom inválido')
+        if magic != cls.MAGIC or formato != cls.VERSAO_FORMATO:
+            raise ValueError('Filtro de Bloom em formato incompatível')
+        bits = dados[cls.CABECALHO.size:]
+        if len(bits) != (m + 7) // 8 or not k:
+            raise ValueError('Filtro de Bloom truncado')
+        filtro = cls.__new__(cls)
+        filtro.capacidade = capacidade
+        filtro.taxa_falsos_positivos = taxa
+        filtro.m, filtro.k = m, k
+        filtro.bits = bytearray(bits)
+        filtro.quantidade = quantidade
+        filtro.positivos = filtro.negativos = 0
+        return filtro
+
+    def __repr__(self) -> str:
+        return (f'FiltroBloom(quantidade={self.quantidade}, capacidade={self.capacidade}, '
+                f'k={self.k}, bytes={len(self.bits)}, taxa_estimada={self.taxa_estimada:.4f})')
+
+
+if __name__ == '__main__':
+    print('TESTANDO HISTOGRAMA DE QUANTIS...')
+    print('-' * 50)
+
+    idades: List[int] = [18, 25, 25, 30, 37, 41, 52, 60, 75, 90]
+    histograma = HistogramaQuantis()
+    for idade in idades:
+        histograma.adicionar(idade)
+
+    print(f'\n1. Quantis de {idades}:')
+    for q, valor in histograma.quantis([0.5, 0.9, 0.99]).items():
+        print(f'  p{int(q * 100)}: {valor}')
+
+    print('\n2. Removendo 90 e 75:')
+    histograma.remover(90)
+    histograma.remover(75)
+    print(f'  p90: {histograma.quantil(0.9)}')
+
+    print('\n3. Mesclando duas partições:')
+    particao_a = HistogramaQuantis({20: 3, 30: 1})
+    particao_b = HistogramaQuantis({30: 2, 40: 4})
+    mesclado = particao_a.copiar().mesclar(particao_b)
+    print(f'  {mesclado} -> mediana {mesclado.quantil(0.5)}')
+
+    print('\n\nTESTANDO HYPERLOGLOG...')
+    print('-' * 50)
+
+    for precisao in (10, 12, 14):
+        hll = HyperLogLog(precisao)
+        for i in range(100_000):
+            hll.adicionar(f'dominio{i % 50_000}.com.br')
+        estimativa = hll.contar()
+        erro = abs(estimativa - 50_000) / 50_000
+        print(f'\nPrecisão {precisao}: {estimativa} distintos (real: 50000, '
+              f'erro {erro:.2%}, esperado ~{hll.erro_padrao:.2%})')
+
+    print('\nMesclando partições:')
+    parte_a, parte_b = HyperLogLog(), HyperLogLog()
+    for i in range(3000):
+        parte_a.adicionar(f'{i}')
+        parte_b.adicionar(f'{i + 1500}')
+    print(f'  {parte_a.mesclar(parte_b)} (real: 4500)')
+
+    print('\n\nTESTANDO FILTRO DE BLOOM...')
+    print('-' * 50)
+
+    for taxa in (0.1, 0.01, 0.001):
+        filtro = FiltroBloom(50_000, taxa)
+        for i in range(50_000):
+            filtro.adicionar(f'{i:011d}')
+        falsos = sum(f'{i:011d}' in filtro for i in range(50_000, 150_000))
+        print(f'\nTaxa {taxa}: {filtro}')
+        print(f'  falsos positivos: {falsos / 100_000:.4f} (positivos={filtro.positivos}, '
+              f'negativos={filtro.negativos})')
+
+    copia = FiltroBloom.de_bytes(filtro.para_bytes())
+    print(f'\nSerializado e lido de volta: {copia} -> contém 42? {f"{42:011d}" in copia}')
@@ -0,0 +1,173 @@
+"""
+Snapshots (visões imutáveis) do cadastro de pessoas.
+Permitem exportações e estatísticas consistentes enquanto o cadastro recebe escritas.
+"""
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence
+
+from models.agregados import AgregadosCadastro
+from models.indices import IndiceIds
+from models.tokens_nome import DICIONARIO_NOMES, codigos_do_termo, dobrar
+from validacao.cpf import limpar_cpf
+
+if TYPE_CHECKING:
+    from models.pessoa import Pessoa
+
+
+class CadastroSnapshot:
+    """
+    Visão somente-leitura do cadastro em um instante.
+
+    Criada por `CadastroPessoas.snapshot()` dividindo os blocos de registros
+    com o cadastro, que copia um bloco na primeira escrita nele.
+    Estatísticas e exportação percorrem as pessoas uma vez, e as buscas por
+    CPF e nome usam índices próprios e enxutos, criados sob demanda (uma vez
+    por snapshot), sem tocar nos índices do cadastro.
+
+    """
+
+    def __init__(self, pessoas: Sequence['Pessoa'], precisao_hll: int = 12):
+        """
+        Cria o snapshot
+
+        Args:
+            pessoas: Pessoas que não serão mais alteradas pelo cadastro
+            precisao_hll: Precisão dos contadores de distintos das estatísticas
+
+        """
+        self._pessoas = pessoas
+        self.data = datetime.now()
+        self._precisao_hll = precisao_hll
+        self._agregados: Optional[AgregadosCadastro] = None
+        self._indice_cpf: Optional[Dict[str, 'Pessoa']] = None
+        self._indice_nome: Optional[IndiceIds] = None
+
+    @property
+    def pessoas(self) -> Sequence['Pessoa']:
+        """Pessoas do snapshot (não altere esta sequência)"""
+        return self._pessoas
+
+    def buscar_por_cpf(self, cpf: str) -> Optional['Pessoa']:
+        """Busca uma pessoa pelo CPF (a primeira incluída, como no cadastro)"""
+        if self._indice_cpf is None:
+            indice: Dict[str, 'Pessoa'] = {}
+            for pessoa in self._pessoas:
+                indice.setdefault(limpar_cpf(pessoa.cpf), pessoa)
+            self._indice_cpf = indice
+        return self._indice_cpf.get(limpar_cpf(cpf))
+
+    def buscar_por_nome(self, nome: str) -> List['Pessoa']:
+        """Busca por pessoas por nome (parcial, sem diferenciar maiúsculas nem acentos)"""
+        termo = dobrar(nome)
+        if not termo:
+            return list(self._pessoas)
+        if self._indice_nome is None:
+            indice = IndiceIds()
+            for posicao, pessoa in enumerate(self._pessoas):
+                for codigo in dict.fromkeys(DICIONARIO_NOMES.codigos(pessoa._nome)):
+                    indice.adicionar(codigo, posicao)
+            self._indice_nome = indice
+        codigos = codigos_do_termo(termo, self._indice_nome.contar)
+        if codigos is None:
+            #termo só com espaços: confere o nome de todos
+            candidatos = self._pessoas
+        else:
+            candidatos = [self._pessoas[posicao] for posicao in self._indice_nome.obter_varias(codigos)]
+            if termo.split() == [termo]:
+                return candidatos
+        return [p for p in candidatos if termo in DICIONARIO_NOMES.dobrado(p._nome)]
+
+    def filtrar_por_sexo(self, codigo_sexo: str) -> List['Pessoa']:
+        """Filtrar pessoas por código do sexo"""
+        return [p for p in self._pessoas if p.sexo == codigo_sexo]
+
+    def agregados(self) -> AgregadosCadastro:
+        """Agregados do snapshot, calculados em uma passada pelas pessoas (uma vez)"""
+        if self._agregados is None:
+            agregados = AgregadosCadastro(self._precisao_hll)
+            for pessoa in self._pessoas:
+                agregados.registrar(pessoa.nome, pessoa.cpf, pessoa.ano_nascimento, pessoa.sexo,
+                                    pessoa.email, pessoa.telefone)
+            self._agregados = agregados
+        return self._agregados
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Retorna estatísticas do cadastro no instante do snapshot"""
+        return self.agregados().estatisticas()
+
+    def listar_todos(self) -> str:
+        """Lista todas as pessoas do snapshot"""
+        from models.pessoa import listar_pessoas
+        return listar_pessoas(self._pessoas)
+
+    def exportar_dados(self, arquivo: str) -> int:
+        """
+        Exporta o snapshot para um arquivo texto
+
+        Args:
+            arquivo: Caminho do arquivo de saída
+
+        Returns:
+            int: Número de pessoas exportadas
+
+        """
+        with open(arquivo, 'w', encoding = 'utf-8') as saida:
+            saida.write('-' * 60 + '\n')
+            saida.write('EXPORTAÇÃO DO SISTEMA DE FICHA CADASTRAL\n')
+            saida.write(f'Data: {self.data.strftime("%d/%m/%Y %H:%M:%S")}\n')
+            saida.write(f'Total de Pessoas: {len(self._pessoas)}\n')
+            saida.write('-' * 60 + '\n\n')
+
+            for pessoa in self._pessoas:
+                saida.write(str(pessoa))
+                saida.write('\n\n')
+
+            #Estatisticas
+            estat = self.estatisticas()
+            saida.write('-' * 60 + '\n')
+            saida.write('ESTATÍSTICAS DO CADASTRO\n')
+            saida.write('-' * 60 + '\n')
+            saida.write(f'Total: {estat["total_pessoas"]} pessoas\n')
+            saida.write(f'Media de Idade: {estat["media_idade"]} anos\n')
+            saida.write(f'Pessoas com Email: {estat["pessoas_com_email"]}\n')
+            saida.write(f'Pessoas com Telefone: {estat["pessoas_com_telefone"]}\n')
+
+            if estat['distribuicao_sexo']:
+                saida.write("\nDistribuição Por Gênero:\n")
+                for codigo, quantidade in estat['distribuicao_sexo'].items():
+                    exemplo = next((p for p in self._pessoas if p.sexo == codigo), None)
+                    display = exemplo.sexo_display if exemplo else codigo
+                    saida.write(f'   {display}: {quantidade}\n')
+
+        return len(self._pessoas)
+
+    def __iter__(self) -> Iterator['Pessoa']:
+        return iter(self._pessoas)
+
+    def __len__(self) -> int:
+        """Número de pessoas no snapshot"""
+        return len(self._pessoas)
+
+    def __repr__(self) -> str:
+        return f'CadastroSnapshot(pessoas={len(self._pessoas)}, data={self.data:%d/%m/%Y %H:%M:%S})'
+
+
+if __name__ == '__main__':
+    from models.pessoa import Pessoa, CadastroPessoas
+
+    print('TESTANDO SNAPSHOTS...')
+    print('-' * 50)
+
+    cadastro = CadastroPessoas()
+    cadastro.adicionar(Pessoa('Ana Lima', '12345678909', 1990, 'F'))
+    cadastro.adicionar(Pessoa('Bruno Costa', '11144477735', 1985, 'M'))
+
+    foto = cadastro.snapshot()
+    cadastro.adicionar(Pessoa('Carla Souza', '52998224725', 2000, 'NB'))
+    cadastro.atualizar('12345678909', nome='Ana Lima Pereira')
+    cadastro.remover_por_cpf('11144477735')
+
+    print(f'\nCadastro atual: {[p.nome for p in cadastro.pessoas]}')
+    print(f'Snapshot:       {[p.nome for p in foto]}')
+    print(f"Total no snapshot: {foto.estatisticas()['total_pessoas']}")
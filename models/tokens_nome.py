@@ -0,0 +1,248 @@
+"""
+Nomes codificados como sequências de ids de palavras.
+
+Nomes e sobrenomes se repetem muito ("Silva", "Santos", "Maria"...), então
+cada palavra distinta é guardada uma única vez em um dicionário compartilhado,
+junto com sua forma em minúsculas e sem acentos, e cada nome vira uma
+sequência curta de ids. A busca por nome procura o termo nas formas já
+preparadas das palavras (poucos milhares) e chega às pessoas por um índice
+palavra -> pessoas, em vez de converter o nome de cada pessoa a cada consulta.
+
+Codificação: o id de cada palavra vira 1 a 3 bytes (base 255, sem o byte
+zero) e as palavras são separadas por um byte zero, então decodificar é só
+`split` + consulta ao dicionário + `join`.
+
+Cada `codificar` conta uma referência às palavras do nome e cada `liberar`
+a devolve (a Pessoa libera o nome ao ser descartada); palavras sem
+referências saem do dicionário, em lotes, para o vocabulário não crescer
+para sempre com nomes de pessoas removidas.
+"""
+
+import threading
+import unicodedata
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+SEPARADOR = b'\0'
+
+#Trechos buscados lembrados por `codigos_contendo`
+MAX_TRECHOS = 1024
+
+#Nomes liberados acumulados antes de descontar as referências
+LOTE_LIBERACAO = 1024
+
+
+def dobrar(texto: str) -> str:
+    """Texto em minúsculas e sem acentos (ex.: 'João' -> 'joao')"""
+    decomposto = unicodedata.normalize('NFKD', texto.lower())
+    return ''.join(c for c in decomposto if not unicodedata.combining(c))
+
+
+def _id_do_codigo(codigo: bytes) -> int:
+    """Inverso de `_codigo_do_id`"""
+    return sum((byte - 1) * 255 ** i for i, byte in enumerate(codigo))
+
+
+def _codigo_do_id(id_token: int) -> bytes:
+    """Id em base 255, do dígito menos significativo ao mais, com os dígitos somados de 1"""
+    digitos = bytearray()
+    while True:
+        id_token, digito = divmod(id_token, 255)
+        digitos.append(digito + 1)
+        if not id_token:
+            return bytes(digitos)
+
+
+class DicionarioTokens:
+    """
+    Dicionário compartilhado de palavras de nomes.
+
+    Os ids nunca mudam nem são reaproveitados, então um nome codificado
+    continua válido enquanto sua referência não for liberada. Seguro para
+    threads; `liberar` não usa o lock (pode ser chamado de um `__del__`).
+
+    """
+
+    def __init__(self):
+        """Inicializa um dicionário vazio"""
+        self._codigos: Dict[str, bytes] = {}
+        self.textos: Dict[bytes, str] = {}
+        self.dobrados: Dict[bytes, str] = {}
+        #Lista na ordem dos ids (None nas palavras liberadas), para
+        #`codigos_contendo` varrer só o que é novo
+        self._ordem: List[Optional[Tuple[bytes, str]]] = []
+        #trecho -> (geração, quantas palavras já foram varridas, códigos que o contêm)
+        self._trechos: Dict[str, Tuple[int, int, List[bytes]]] = {}
+        #muda a cada coleta que descarta palavras: entradas de outra geração não valem
+        self._geracao = 0
+        #código -> ocorrências em nomes codificados ainda não liberados
+        self._referencias: Dict[bytes, int] = {}
+        self._pendentes: Deque[bytes] = deque()
+        self._lock = threading.Lock()
+
+    def codigo(self, token: str) -> bytes:
+        """Código de uma palavra, criando-o se ela for nova (sem contar referência)"""
+        codigo = self._codigos.get(token)
+        if codigo is None:
+            with self._lock:
+                codigo = self._criar(token)
+        return codigo
+
+    def _criar(self, token: str) -> bytes:
+        """Código de uma palavra, criando-o se ela for nova (com o lock)"""
+        codigo = self._codigos.get(token)
+        if codigo is None:
+            codigo = _codigo_do_id(len(self._ordem))
+            dobrado = dobrar(token)
+            self.textos[codigo] = token
+            self.dobrados[codigo] = dobrado
+            self._ordem.append((codigo, dobrado))
+            self._codigos[token] = codigo
+        return codigo
+
+    def codificar(self, nome: str) -> bytes:
+        """
+        Codifica um nome (as palavras são separadas por espaço, exatamente como estão)
+
+        Conta uma referência a cada palavra; quem guarda o resultado deve
+        devolvê-lo com `liberar` quando não precisar mais dele.
+
+        """
+        with self._lock:
+            codigos = [self._criar(token) for token in nome.split(' ')]
+            referencias = self._referencias
+            for codigo in codigos:
+                referencias[codigo] = referencias.get(codigo, 0) + 1
+            if len(self._pendentes) >= LOTE_LIBERACAO:
+                self._coletar()
+        return SEPARADOR.join(codigos)
+
+    def liberar(self, codificado: bytes) -> None:
+        """Devolve as referências de um nome codificado (descontadas no próximo lote)"""
+        self._pendentes.append(codificado)
+
+    def coletar(self) -> int:
+        """
+        Desconta as referências liberadas até agora
+
+        Returns:
+            int: Número de palavras que saíram do dicionário
+
+        """
+        with self._lock:
+            return self._coletar()
+
+    def _coletar(self) -> int:
+        """Corpo de `coletar` (com o lock)"""
+        referencias = self._referencias
+        descartadas = 0
+        while self._pendentes:
+            for codigo in self._pendentes.popleft().split(SEPARADOR):
+                restantes = referencias[codigo] - 1
+                if restantes:
+                    referencias[codigo] = restantes
+                    continue
+                del referencias[codigo]
+                del self._codigos[self.textos.pop(codigo)]
+                del self.dobrados[codigo]
+                self._ordem[_id_do_codigo(codigo)] = None
+                descartadas += 1
+        if descartadas:
+            #as listas guardadas podem ter códigos descartados
+            self._geracao += 1
+            self._trechos.clear()
+        return descartadas
+
+    def decodificar(self, codificado: bytes) -> str:
+        """Nome original de um nome codificado"""
+        return ' '.join(map(self.textos.__getitem__, codificado.split(SEPARADOR)))
+
+    def dobrado(self, codificado: bytes) -> str:
+        """Nome em minúsculas e sem acentos, a partir das formas já preparadas"""
+        return ' '.join(map(self.dobrados.__getitem__, codificado.split(SEPARADOR)))
+
+    def codigos(self, codificado: bytes) -> List[bytes]:
+        """Códigos das palavras de um nome codificado, em ordem"""
+        return codificado.split(SEPARADOR)
+
+    def ids(self, codificado: bytes) -> List[int]:
+        """Ids das palavras de um nome codificado"""
+        return [_id_do_codigo(codigo) for codigo in codificado.split(SEPARADOR)]
+
+    def codigos_contendo(self, trecho: str) -> List[bytes]:
+        """
+        Códigos das palavras cuja forma dobrada contém `trecho` (já dobrado)
+
+        O resultado fica guardado e, nas próximas vezes, só as palavras
+        novas no dicionário são conferidas. A varredura não usa o lock; o
+        resultado só é guardado (com o lock) se nenhuma coleta descartou
+        palavras enquanto isso.
+
+        """
+        geracao = self._geracao
+        entrada = self._trechos.get(trecho)
+        if entrada is None or entrada[0] != geracao:
+            varridos, codigos = 0, []
+        else:
+            _, varridos, codigos = entrada
+        total = len(self._ordem)
+        if varridos < total:
+            codigos = codigos + [palavra[0] for palavra in self._ordem[varridos:total]
+                                 if palavra is not None and trecho in palavra[1]]
+            with self._lock:
+                if self._geracao == geracao:
+                    if len(self._trechos) >= MAX_TRECHOS:
+                        self._trechos.clear()
+                    self._trechos[trecho] = (geracao, total, codigos)
+        return codigos
+
+    def __len__(self) -> int:
+        """Número de palavras distintas no dicionário"""
+        return len(self._codigos)
+
+    def __repr__(self) -> str:
+        return f'DicionarioTokens(palavras={len(self._codigos)})'
+
+
+#Dicionário usado pelos objetos Pessoa do processo
+DICIONARIO_NOMES = DicionarioTokens()
+
+
+def codigos_do_termo(termo: str, contar: Callable[[bytes], int]) -> Optional[List[bytes]]:
+    """
+    Palavras do DICIONARIO_NOMES que podem levar a um nome com `termo` (já dobrado)
+
+    Todo nome que contém o termo tem, para cada trecho sem espaços do
+    termo, uma palavra que contém o trecho; usa o trecho com menos registros
+    segundo `contar` (ex.: o `contar` de um índice palavra -> registros).
+
+    Returns:
+        list: Códigos das palavras, ou None se o termo não tiver trecho nenhum
+
+    """
+    melhor = None
+    for trecho in set(termo.split()):
+        codigos = DICIONARIO_NOMES.codigos_contendo(trecho)
+        registros = sum(contar(codigo) for codigo in codigos)
+        if melhor is None or registros < melhor[0]:
+            melhor = (registros, codigos)
+    return None if melhor is None else melhor[1]
+
+
+if __name__ == '__main__':
+    print('TESTANDO DICIONÁRIO DE NOMES...')
+    print('-' * 50)
+
+    dicionario = DicionarioTokens()
+    nomes = ['João da Silva', 'Maria Silva Santos', 'José Antônio da Silva', 'Ana Lúcia Souza']
+    codificados = [dicionario.codificar(nome) for nome in nomes]
+    for nome, codificado in zip(nomes, codificados):
+        print(f'{nome:<24} {codificado.hex(" "):<20} ids={dicionario.ids(codificado)}')
+    print(f'\n{dicionario}')
+
+    for trecho in ['silva', 'jo', 'lucia']:
+        palavras = [dicionario.textos[codigo] for codigo in dicionario.codigos_contendo(trecho)]
+        print(f"Palavras com '{trecho}': {palavras}")
+
+    dicionario.liberar(codificados[3])
+    print(f"\nApós liberar 'Ana Lúcia Souza': {dicionario.coletar()} palavra(s) descartada(s), {dicionario}")
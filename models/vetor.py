@@ -0,0 +1,160 @@
+"""
+Vetor de registros em blocos, com cópia na escrita por bloco.
+
+Base da lista de registros do cadastro: um snapshot (`congelar`) copia só a
+lista de blocos (O(n/TAMANHO_BLOCO)) e, depois dele, a primeira escrita em
+cada bloco copia apenas aquele bloco, em vez da lista inteira.
+
+Incluir no fim nunca copia: o snapshot só enxerga as posições que existiam
+quando foi tirado, então pode dividir o último bloco com o vetor.
+"""
+
+import sys
+import threading
+from collections import abc
+from itertools import chain, islice
+from typing import Any, Iterable, Iterator, List, Optional
+
+#Registros por bloco (potência de 2, para achar o bloco com deslocamento de bits)
+BITS_BLOCO = 10
+TAMANHO_BLOCO = 1 << BITS_BLOCO
+MASCARA_BLOCO = TAMANHO_BLOCO - 1
+
+
+class VetorBlocos:
+    """
+    Lista mutável de registros (None marca uma lápide) dividida em blocos.
+
+    Cada bloco lembra a época em que foi criado ou copiado; `congelar` avança
+    a época, então blocos de épocas anteriores podem estar em algum snapshot
+    e são copiados antes da primeira alteração.
+
+    """
+
+    def __init__(self, itens: Iterable[Any] = ()):
+        """Cria o vetor com os itens informados"""
+        self._blocos: List[List[Any]] = []
+        self._epocas: List[int] = []
+        self._epoca = 0
+        self._tamanho = 0
+        #`congelar` roda sob o lock de leitura do cadastro, talvez em paralelo
+        self._trava_epoca = threading.Lock()
+        for item in itens:
+            self.append(item)
+
+    def append(self, item: Any) -> None:
+        """Inclui um item no fim"""
+        if self._tamanho & MASCARA_BLOCO == 0:
+            self._blocos.append([])
+            self._epocas.append(self._epoca)
+        self._blocos[-1].append(item)
+        self._tamanho += 1
+
+    def __getitem__(self, posicao: int) -> Any:
+        if not 0 <= posicao < self._tamanho:
+            if posicao < 0 and posicao + self._tamanho >= 0:
+                posicao += self._tamanho
+            else:
+                raise IndexError('posição fora do vetor')
+        return self._blocos[posicao >> BITS_BLOCO][posicao & MASCARA_BLOCO]
+
+    def __setitem__(self, posicao: int, item: Any) -> None:
+        if not 0 <= posicao < self._tamanho:
+            raise IndexError('posição fora do vetor')
+        bloco = posicao >> BITS_BLOCO
+        if self._epocas[bloco] != self._epoca:
+            #bloco pode estar em um snapshot: escreve em uma cópia dele
+            self._blocos[bloco] = list(self._blocos[bloco])
+            self._epocas[bloco] = self._epoca
+        self._blocos[bloco][posicao & MASCARA_BLOCO] = item
+
+    def obter_varios(self, posicoes: Iterable[int]) -> List[Any]:
+        """Itens de várias posições (sem checar limites, para ids tirados de índices)"""
+        blocos = self._blocos
+        return [blocos[posicao >> BITS_BLOCO][posicao & MASCARA_BLOCO] for posicao in posicoes]
+
+    def congelar(self, vivos: Optional[int] = None) -> 'VistaBlocos':
+        """
+        Visão imutável do vetor neste instante
+
+        Args:
+            vivos: Quantos itens não são lápides (padrão: todos)
+
+        """
+        with self._trava_epoca:
+            self._epoca += 1
+            return VistaBlocos(list(self._blocos), self._tamanho, self._tamanho if vivos is None else vivos)
+
+    def __iter__(self) -> Iterator[Any]:
+        return chain.from_iterable(self._blocos)
+
+    def __len__(self) -> int:
+        """Número de posições (inclusive lápides)"""
+        return self._tamanho
+
+    def __sizeof__(self) -> int:
+        """Bytes da estrutura (listas de blocos), sem os itens"""
+        return (object.__sizeof__(self) + sys.getsizeof(self._blocos) + sys.getsizeof(self._epocas)
+                + sum(sys.getsizeof(bloco) for bloco in self._blocos))
+
+    def __repr__(self) -> str:
+        return f'VetorBlocos(tamanho={self._tamanho}, blocos={len(self._blocos)})'
+
+
+class VistaBlocos(abc.Sequence):
+    """
+    Visão imutável de um VetorBlocos, sem as lápides.
+
+    Iterar e contar não copiam nada; o acesso por posição, se o vetor tinha
+    lápides, monta uma lista só com os itens na primeira vez.
+
+    """
+
+    def __init__(self, blocos: List[List[Any]], tamanho: int, vivos: int):
+        self._blocos = blocos
+        self._tamanho = tamanho
+        self._vivos = vivos
+        self._lista: Optional[List[Any]] = None
+
+    def _itens(self) -> Iterator[Any]:
+        """Itens e lápides, até o tamanho do vetor no instante da visão"""
+        return islice(chain.from_iterable(self._blocos), self._tamanho)
+
+    def __getitem__(self, indice: Any) -> Any:
+        if self._vivos != self._tamanho or isinstance(indice, slice):
+            if self._lista is None:
+                self._lista = list(self)
+            return self._lista[indice]
+        if not 0 <= indice < self._tamanho:
+            if indice < 0 and indice + self._tamanho >= 0:
+                indice += self._tamanho
+            else:
+                raise IndexError('posição fora da visão')
+        return self._blocos[indice >> BITS_BLOCO][indice & MASCARA_BLOCO]
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._vivos == self._tamanho:
+            return self._itens()
+        return (item for item in self._itens() if item is not None)
+
+    def __len__(self) -> int:
+        """Número de itens (sem as lápides)"""
+        return self._vivos
+
+    def __repr__(self) -> str:
+        return f'VistaBlocos(itens={self._vivos})'
+
+
+if __name__ == '__main__':
+    print('TESTANDO VETOR EM BLOCOS...')
+    print('-' * 50)
+
+    vetor = VetorBlocos(range(3000))
+    vista = vetor.congelar()
+    vetor[5] = None
+    vetor.append(3000)
+    print(f'\nVetor: {vetor} | posição 5: {vetor[5]}')
+    print(f'Vista: {vista} | posição 5: {vista[5]} | último: {vista[-1]}')
+
+    vista_sem_lapide = vetor.congelar(vivos=len(vetor) - 1)
+    print(f'Vista sem lápide: {len(vista_sem_lapide)} itens, posição 5: {vista_sem_lapide[5]}')
@@ -0,0 +1,230 @@
+"""
+Validação e normalização de contatos (telefone e email) para o sistema de Ficha Cadastral
+Extrai o DDD, identifica o estado (UF) e normaliza números para o padrão E.164.
+"""
+
+from typing import Dict, List, Optional
+
+#Tabela oficial de DDDs (Anatel) -> UF
+DDD_UF: Dict[str, str] = {
+    '11': 'SP', '12': 'SP', '13': 'SP', '14': 'SP', '15': 'SP',
+    '16': 'SP', '17': 'SP', '18': 'SP', '19': 'SP',
+    '21': 'RJ', '22': 'RJ', '24': 'RJ',
+    '27': 'ES', '28': 'ES',
+    '31': 'MG', '32': 'MG', '33': 'MG', '34': 'MG', '35': 'MG', '37': 'MG', '38': 'MG',
+    '41': 'PR', '42': 'PR', '43': 'PR', '44': 'PR', '45': 'PR', '46': 'PR',
+    '47': 'SC', '48': 'SC', '49': 'SC',
+    '51': 'RS', '53': 'RS', '54': 'RS', '55': 'RS',
+    '61': 'DF',
+    '62': 'GO', '64': 'GO',
+    '63': 'TO',
+    '65': 'MT', '66': 'MT',
+    '67': 'MS',
+    '68': 'AC',
+    '69': 'RO',
+    '71': 'BA', '73': 'BA', '74': 'BA', '75': 'BA', '77': 'BA',
+    '79': 'SE',
+    '81': 'PE', '87': 'PE',
+    '82': 'AL',
+    '83': 'PB',
+    '84': 'RN',
+    '85': 'CE', '88': 'CE',
+    '86': 'PI', '89': 'PI',
+    '91': 'PA', '93': 'PA', '94': 'PA',
+    '92': 'AM', '97': 'AM',
+    '95': 'RR',
+    '96': 'AP',
+    '98': 'MA', '99': 'MA',
+}
+
+CODIGO_PAIS = '55'
+
+def ddds_da_uf(uf: str) -> List[str]:
+    """
+    Retorna os DDDs de um estado
+
+    Args:
+        uf: Sigla do estado (ex.: 'ES', 'rj')
+
+    Returns:
+        list: DDDs do estado (vazio se a UF não existir)
+
+    """
+    uf = uf.strip().upper()
+    return [ddd for ddd, sigla in DDD_UF.items() if sigla == uf]
+
+def validar_telefone(telefone: str) -> Dict[str, str]:
+    """
+    Valida e normaliza um telefone brasileiro
+
+    Aceita texto livre: '(27) 98866-4060', '27988664060', '+55 27 98866-4060',
+    '0 27 98866-4060' (prefixo de discagem interurbana).
+
+    Args:
+        telefone: Telefone em qualquer formato
+
+    Returns:
+        dict: {
+            'ddd': '27',
+            'uf': 'ES',
+            'numero': '988664060', #sem DDD
+            'e164': '+5527988664060',
+            'tipo': 'celular' #ou 'fixo'
+        }
+
+    Raises:
+        ValueError: Se o telefone for inválido
+
+    """
+    if not telefone:
+        raise ValueError('Telefone não pode ser vazio')
+
+    digitos = ''.join(filter(str.isdigit, telefone))
+
+    #remove código do país e prefixo de discagem interurbana
+    if len(digitos) in (12, 13) and digitos.startswith(CODIGO_PAIS):
+        digitos = digitos[2:]
+    elif len(digitos) in (11, 12) and digitos.startswith('0'):
+        digitos = digitos[1:]
+
+    if len(digitos) not in (10, 11):
+        raise ValueError('Telefone deve conter DDD + 8 ou 9 dígitos')
+
+    ddd, numero = digitos[:2], digitos[2:]
+    if ddd not in DDD_UF:
+        raise ValueError(f'DDD inválido: {ddd}')
+
+    if len(numero) == 9:
+        if numero[0] != '9':
+            raise ValueError('Celular com 9 dígitos deve começar com 9')
+        tipo = 'celular'
+    else:
+        if numero[0] in '01':
+            raise ValueError('Número de telefone inválido')
+        tipo = 'fixo'
+
+    return {
+        'ddd': ddd,
+        'uf': DDD_UF[ddd],
+        'numero': numero,
+        'e164': f'+{CODIGO_PAIS}{ddd}{numero}',
+        'tipo': tipo,
+    }
+
+def analisar_telefone(telefone: Optional[str]) -> Optional[Dict[str, str]]:
+    """
+    Versão tolerante de `validar_telefone`: retorna None em vez de erro
+
+    Usada pelo cadastro, que aceita telefones em texto livre.
+
+    """
+    if not telefone:
+        return None
+    try:
+        return validar_telefone(telefone)
+    except ValueError:
+        return None
+
+def normalizar_telefone(telefone: Optional[str]) -> str:
+    """
+    Normaliza telefone para comparação: apenas dígitos
+
+    Telefones válidos viram o E.164 sem o '+' (ex.: '5527988664060'), então
+    '(27) 98866-4060' e '+55 27 98866-4060' têm a mesma forma normalizada.
+
+    Args:
+        telefone: Telefone em qualquer formato
+
+    Returns:
+        str: Apenas dígitos (vazio se não houver telefone)
+
+    """
+    dados = analisar_telefone(telefone)
+    if dados:
+        return dados['e164'][1:]
+    return ''.join(filter(str.isdigit, telefone or ''))
+
+def normalizar_email(email: Optional[str]) -> str:
+    """
+    Normaliza email para comparação: sem espaços nas pontas e em minúsculas
+
+    Args:
+        email: Email informado
+
+    Returns:
+        str: Email normalizado (vazio se não houver email)
+
+    """
+    return (email or '').strip().lower()
+
+def validar_email(email: str) -> str:
+    """
+    Validação mínima de email (precisa ter '@')
+
+    Args:
+        email: Email informado
+
+    Returns:
+        str: Email sem espaços nas pontas
+
+    Raises:
+        ValueError: Se não houver '@'
+
+    """
+    email = email.strip()
+    if '@' not in email:
+        raise ValueError(f'Email inválido: {email}')
+    return email
+
+def formatar_telefone(telefone: str) -> str:
+    """
+    Formata telefone para exibição: (27) 98866-4060 / (27) 3322-1100
+
+    Args:
+        telefone: Telefone em qualquer formato
+
+    Returns:
+        str: Telefone formatado (ou como está, se inválido)
+
+    """
+    dados = analisar_telefone(telefone)
+    if not dados:
+        return telefone
+    numero = dados['numero']
+    return f"({dados['ddd']}) {numero[:-4]}-{numero[-4:]}"
+
+if __name__ == '__main__':
+    print('TESTANDO VALIDAÇÃO DE TELEFONES...')
+    print('-' * 50)
+
+    testes = [
+        '(27) 98866-4060', #celular ES
+        '(21) 99876-5432', #celular RJ
+        '+55 31 91234-5678', #com código do país
+        '0 11 3322-1100', #fixo com prefixo interurbano
+        '27988664060', #apenas números
+        '(20) 98866-4060', #DDD inexistente
+        '(27) 88866-4060', #celular sem 9
+        '98866-4060', #sem DDD
+        '', #vazio
+    ]
+
+    for teste in testes:
+        print(f'\nTestando: "{teste}"')
+        try:
+            dados = validar_telefone(teste)
+            print(f"Válido: {dados['e164']} | DDD {dados['ddd']} ({dados['uf']}) | {dados['tipo']}")
+            print(f'Formatado: {formatar_telefone(teste)}')
+        except ValueError as e:
+            print(f'Inválido: {e}')
+
+    print('\n\nNormalização para busca: ')
+    print('-' * 30)
+    for telefone in ('(27) 98866-4060', '+55 27 98866-4060', '98866-4060'):
+        print(f'"{telefone}" -> "{normalizar_telefone(telefone)}"')
+    print(f'"  Fulano@Email.COM " -> "{normalizar_email("  Fulano@Email.COM ")}"')
+
+    print('\n\nDDDs por estado: ')
+    print('-' * 30)
+    for uf in ('ES', 'RJ', 'SP'):
+        print(f"{uf}: {', '.join(ddds_da_uf(uf))}")
@@ -4,7 +4,13 @@ Implementa algoritmo oficial de validação de CPF brasileiro.
 """
 
 import re
-from typing import Tuple
+from typing import TYPE_CHECKING, Tuple, Dict, Any, Optional
+
+from validacao.telemetria import medir
+
+if TYPE_CHECKING:
+    import random
+    from validacao.telemetria import TelemetriaValidacao
 
 def limpar_cpf(cpf: str) -> str:
     """
@@ -96,12 +102,14 @@ def validar_digitos_verificadores(cpf: str) -> bool:
     #verifica se os dígitos calculados bater com os informados
     return cpf[-2:] == f'{digito1}{digito2}'
 
-def validar_cpf(cpf: str) -> str:
+def validar_cpf(cpf: str, telemetria: Optional['TelemetriaValidacao'] = None) -> str:
     """
     Valida um CPF completo (formato e dígitos verificadores)
 
     Args:
         cpf: CPF em qualquer formato
+        telemetria: Se informada, mede as etapas como as regras
+            'cpf.formato' e 'cpf.digitos'
 
     Returns:
         str: CPF formatado no padrão 000.000.000-00
@@ -110,23 +118,25 @@ def validar_cpf(cpf: str) -> str:
         ValueError: se CPF for inválido
 
     """
+    cpf_limpo = medir(telemetria, 'cpf.formato', _conferir_formato, cpf)
+    medir(telemetria, 'cpf.digitos', _conferir_digitos, cpf_limpo)
+
+    #formata para retorno
+    return formatar_cpf(cpf_limpo)
 
+def _conferir_formato(cpf: str) -> str:
+    """Etapa de formato de `validar_cpf`: CPF limpo, se não for vazio e tiver formato válido"""
     if not cpf:
         raise ValueError('CPF não pode ser vazio')
 
-    #limpa o CPF (remove pontos, traços, espaços)
-    cpf_limpo = limpar_cpf(cpf)
-
-    #valida formato básico
-    cpf_limpo = validar_formato(cpf_limpo)
+    #limpa o CPF (remove pontos, traços, espaços) e valida o formato básico
+    return validar_formato(limpar_cpf(cpf))
 
-    #valida dígitos verificadores
+def _conferir_digitos(cpf_limpo: str) -> None:
+    """Etapa dos dígitos verificadores de `validar_cpf`"""
     if not validar_digitos_verificadores(cpf_limpo):
         raise ValueError('CPF inválido (dígitos verificadores incorretos)')
 
-    #formata para retorno
-    return formatar_cpf(cpf_limpo)
-
 def formatar_cpf(cpf: str) -> str:
     """
     Formata CPF no padrão brasileiro: 000.000.000-00
@@ -145,23 +155,63 @@ def formatar_cpf(cpf: str) -> str:
 
     return f'{cpf_limpo[:3]}.{cpf_limpo[3:6]}.{cpf_limpo[6:9]}-{cpf_limpo[9:]}'
 
-def gerar_cpf_valido() -> str:
+#Regiões fiscais da Receita Federal, codificadas no 9º dígito do CPF
+REGIOES_FISCAIS: Dict[int, Dict[str, Any]] = {
+    1: {'descricao': '1ª Região Fiscal', 'ufs': ['DF', 'GO', 'MS', 'MT', 'TO']},
+    2: {'descricao': '2ª Região Fiscal', 'ufs': ['AC', 'AM', 'AP', 'PA', 'RO', 'RR']},
+    3: {'descricao': '3ª Região Fiscal', 'ufs': ['CE', 'MA', 'PI']},
+    4: {'descricao': '4ª Região Fiscal', 'ufs': ['AL', 'PB', 'PE', 'RN']},
+    5: {'descricao': '5ª Região Fiscal', 'ufs': ['BA', 'SE']},
+    6: {'descricao': '6ª Região Fiscal', 'ufs': ['MG']},
+    7: {'descricao': '7ª Região Fiscal', 'ufs': ['ES', 'RJ']},
+    8: {'descricao': '8ª Região Fiscal', 'ufs': ['SP']},
+    9: {'descricao': '9ª Região Fiscal', 'ufs': ['PR', 'SC']},
+    10: {'descricao': '10ª Região Fiscal', 'ufs': ['RS']},
+}
+
+def obter_regiao_fiscal(cpf: str) -> int:
+    """
+    Obtém a região fiscal de emissão do CPF a partir do 9º dígito
+
+    O dígito 0 corresponde à 10ª Região Fiscal (RS).
+
+    Args:
+        cpf: CPF em qualquer formato
+
+    Returns:
+        int: Região fiscal (1 a 10)
+
+    Raises:
+        ValueError: Se o CPF não tiver 11 dígitos
+
+    """
+    cpf_limpo = limpar_cpf(cpf)
+    if len(cpf_limpo) != 11:
+        raise ValueError('CPF deve conter 11 dígitos')
+    return int(cpf_limpo[8]) or 10
+
+def gerar_cpf_valido(rng: Optional['random.Random'] = None) -> str:
     """
     Gera um cpf válido para testes (não é um cpf real de uma pessoa).
-    
+
+    Args:
+        rng: Gerador aleatório (padrão: módulo random); passe um
+            random.Random com semente para resultados reprodutíveis
+
     Returns:
         str: CPF válido gerado aleatoriamente
         
     """
 
     import random
+    rng = rng or random
 
     #gera os primeiros 9 dígitos aleatórios
-    nove_digitos = ''.join(str(random.randint(0, 9)) for _ in range(9))
+    nove_digitos = ''.join(str(rng.randint(0, 9)) for _ in range(9))
 
     #garante que não são todos iguais
     while nove_digitos == nove_digitos[0] * 9:
-        nove_digitos = ''.join(str(random.randint(0.9) for _ in range(9)))
+        nove_digitos = ''.join(str(rng.randint(0, 9)) for _ in range(9))
 
     #calcula dígitos verificadores
     digito1 = calcular_digito_verificador(nove_digitos, 10)
@@ -256,8 +306,17 @@ if __name__ == '__main__':
         formatado = formatar_cpf(cpf)
         print(f"\n'{cpf}' - > '{formatado}'")
 
+    #teste de região fiscal
+    print('\n\n3. TESTE DE REGIÃO FISCAL: ')
+    print('-' * 40)
+
+    for cpf in ['125.464.607-81', '123.456.789-09', '111.444.777-35']:
+        regiao = obter_regiao_fiscal(cpf)
+        ufs = ', '.join(REGIOES_FISCAIS[regiao]['ufs'])
+        print(f"\n{cpf} -> {REGIOES_FISCAIS[regiao]['descricao']} ({ufs})")
+
     #teste de geração de cpf válido
-    print('\n\n3.GERANDO CPFS VÁLIDOS PARA TESTE: ')
+    print('\n\n4.GERANDO CPFS VÁLIDOS PARA TESTE: ')
     print('-' * 40)
 
     for i in range(3):
@@ -271,25 +330,24 @@ if __name__ == '__main__':
     except ValueError as e:
         print(f'Erro: {e}')
 
-#teste de interação
-print('\n\n4. TESTE DE INTERAÇÃO COM USUARIO')
-print('-' * 60)
-
-# Descomente para testar interação
-# cpf_usuario = obter_cpf_usuario()
-# print(f"\n CPF obtido: {cpf_usuario}")
-# print(f" Apenas números: {extrair_numero_cpf(cpf_usuario)}")
+    #teste de interação
+    print('\n\n5. TESTE DE INTERAÇÃO COM USUARIO')
+    print('-' * 60)
 
-print('\nTESTE ESPECIAL - SEU CPF: ')
-print('-' * 40)
+    # Descomente para testar interação
+    # cpf_usuario = obter_cpf_usuario()
+    # print(f"\n CPF obtido: {cpf_usuario}")
+    # print(f" Apenas números: {extrair_numero_cpf(cpf_usuario)}")
 
-#teste com um cpf específico (substitua pelo seu se quiser):
-seu_cpf_teste = '125.464.607-81' #cpf pessoal de exemplo
+    print('\nTESTE ESPECIAL - SEU CPF: ')
+    print('-' * 40)
 
-print(f'TESTANDO CPF: {seu_cpf_teste}')
-try:
-    resultado = validar_cpf(seu_cpf_teste)
-    print(f'CPF VÁLIDO: {resultado}')
-except ValueError as e:
-    print(f'ERRO: {e}')
+    #teste com um cpf específico (substitua pelo seu se quiser):
+    seu_cpf_teste = '125.464.607-81' #cpf pessoal de exemplo
 
+    print(f'TESTANDO CPF: {seu_cpf_teste}')
+    try:
+        resultado = validar_cpf(seu_cpf_teste)
+        print(f'CPF VÁLIDO: {resultado}')
+    except ValueError as e:
+        print(f'ERRO: {e}')
@@ -3,7 +3,7 @@ Validação de nomes para o sistema de Ficha Cadastral
 """
 
 import re
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 def validar_nome(nome: str) -> str:
     """
@@ -57,6 +57,76 @@ def validar_nome(nome: str) -> str:
     return ' '.join(partes_formatadas)
 
 
+#Caracteres aceitos em cada palavra do nome (mesmo conjunto da regex de validar_nome)
+_PALAVRA_VALIDA = re.compile(r"[A-Za-zÀ-ÿ\-']+")
+_PREPOSICOES = frozenset({'de', 'da', 'do', 'das', 'dos', 'e'})
+#Palavra com caracteres inválidos no cache de palavras
+_INVALIDA = ('', '')
+
+
+def _validar_nome_cache(nome: str, cache: Dict[str, Tuple[str, str]]) -> Tuple[Optional[str], Optional[str]]:
+    """validar_nome consultando o cache de palavras: (nome formatado ou None, erro ou None)"""
+    if not nome:
+        return None, 'Nome não pode ser vazio'
+    nome = nome.strip()
+    if len(nome) < 5:
+        return None, 'Nome deve ter, pelo menos, 5 caracteres'
+    if len(nome) > 100:
+        return None, 'Nome não pode exceder 100 caracteres'
+
+    partes = []
+    for palavra in nome.split():
+        formatos = cache.get(palavra)
+        if formatos is None:
+            if _PALAVRA_VALIDA.fullmatch(palavra):
+                minuscula = palavra.lower()
+                primeira = palavra.capitalize()
+                formatos = (primeira, minuscula if minuscula in _PREPOSICOES else primeira)
+            else:
+                formatos = _INVALIDA
+            cache[palavra] = formatos
+        if formatos is _INVALIDA:
+            return None, "Nome deve conter apenas letras, espaços, hífens (-) ou apóstrofos (')"
+        partes.append(formatos[1] if partes else formatos[0])
+    if ' ' not in nome:
+        return None, 'Informe nome e sobrenome completo'
+    return ' '.join(partes), None
+
+
+def validar_nomes_lote(nomes: Iterable[str],
+                       cache: Optional[Dict[str, Tuple[str, str]]] = None) -> Tuple[List[Optional[str]], Dict[int, str]]:
+    """
+    Valida e formata vários nomes, com as mesmas regras e mensagens de validar_nome
+
+    Cada palavra distinta é conferida e formatada uma única vez (sobrenomes
+    como "Silva" e "Santos" se repetem muito), e nomes repetidos no lote
+    reaproveitam o resultado inteiro.
+
+    Args:
+        nomes: Nomes a validar
+        cache: Cache de palavras (palavra -> formatação como primeira palavra
+            e no meio do nome); passe o mesmo dicionário para reaproveitá-lo
+            entre lotes
+
+    Returns:
+        tuple: (nomes formatados, com None nos inválidos; {índice: mensagem de erro})
+
+    """
+    cache = {} if cache is None else cache
+    resultados: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+    formatados: List[Optional[str]] = []
+    erros: Dict[int, str] = {}
+    for i, nome in enumerate(nomes):
+        resultado = resultados.get(nome)
+        if resultado is None:
+            resultado = resultados[nome] = _validar_nome_cache(nome, cache)
+        formatado, erro = resultado
+        formatados.append(formatado)
+        if erro:
+            erros[i] = erro
+    return formatados, erros
+
+
 def obter_nome_usuario() -> str:
     """
     Interage com o usuario para obter um nome válido
@@ -132,6 +202,13 @@ if __name__ == '__main__':
         except ValueError as e:
             print(f'Erro: {e}')
     print('\n' + "-" * 50)
+    print('Validação em lote: ')
+    print('-' * 50)
+    formatados, erros = validar_nomes_lote(testes)
+    for i, teste in enumerate(testes):
+        print(f'"{teste}" -> {formatados[i] or erros[i]}')
+
+    print('\n' + "-" * 50)
     print('Teste de interação com usuario: ')
     print('-' * 50)
 
@@ -3,7 +3,11 @@ Validação de sexo/gênero para o sistema de ficha cadastral.
 Implementa validação inclusiva com múltiplas opções de gênero.
 """
 
-from typing import Dict, Any, Optional
+import time
+from typing import TYPE_CHECKING, Dict, Any, Optional, Tuple
+
+if TYPE_CHECKING:
+    from validacao.telemetria import TelemetriaValidacao
 
 class ValidadorGenero:
     """
@@ -53,12 +57,16 @@ class ValidadorGenero:
     }
 
     @classmethod
-    def validar(cls, entrada: Optional[str]) -> Dict[str, Any]:
+    def validar(cls, entrada: Optional[str],
+                telemetria: Optional['TelemetriaValidacao'] = None) -> Dict[str, Any]:
         """
         Valida e normaliza entrada de gênero de forma inclusiva
 
         Args:
             entrada: String com gênero informado (ou None/vazio)
+            telemetria: Se informada, mede a chamada como a regra 'sexo'
+                (correspondência exata ou vazio) ou 'sexo.busca_parcial'
+                (caiu na busca por trecho, prefixo ou "Outro")
 
         Returns:
             dict: {
@@ -68,7 +76,17 @@ class ValidadorGenero:
                 'entrada_original': 'M' #Entrada original
             }
         """
+        if telemetria is None:
+            return cls._classificar(entrada)[0]
+
+        inicio = time.perf_counter_ns()
+        dados, exata = cls._classificar(entrada)
+        telemetria.registrar('sexo' if exata else 'sexo.busca_parcial', time.perf_counter_ns() - inicio)
+        return dados
 
+    @classmethod
+    def _classificar(cls, entrada: Optional[str]) -> Tuple[Dict[str, Any], bool]:
+        """Corpo de `validar`: (dados, True se resolveu sem a busca parcial)"""
         #trata valores vazios
         if entrada is None:
             return {
@@ -76,7 +94,7 @@ class ValidadorGenero:
                 'display': 'Prefiro não informar',
                 'categoria': 'nao_informado',
                 'entrada_original': ''
-            }
+            }, True
 
         if isinstance(entrada, str) and entrada.strip() == '':
             return {
@@ -84,7 +102,7 @@ class ValidadorGenero:
                 'display': 'Prefiro não informar',
                 'categoria': 'nao_informado',
                 'entrada_original': entrada
-            }
+            }, True
 
         entrada_original = entrada.strip()
         entrada_upper = entrada_original.upper()
@@ -94,7 +112,7 @@ class ValidadorGenero:
             dados = cls.mapeamento_completo[entrada_upper].copy()
             dados['valor'] = dados['codigo']
             dados['entrada_original'] = entrada_original
-            return dados
+            return dados, True
 
         # 2. Procura correspondência parcial (MAS com prioridade para correspondências exatas)
         #Primeiro, tenta encontrar a correspondência mais específica
@@ -115,7 +133,7 @@ class ValidadorGenero:
             dados = valor.copy()
             dados['valor'] = dados['codigo']
             dados['entrada_original'] = entrada_original
-            return dados
+            return dados, False
 
         # 3. Tenta correspondência por início (apenas para códigos curtos)
         for chave, valor in cls.mapeamento_completo.items():
@@ -125,7 +143,7 @@ class ValidadorGenero:
                 dados = valor.copy()
                 dados['valor'] = dados['codigo']
                 dados['entrada_original'] = entrada_original
-                return dados
+                return dados, False
 
         # 4. Se não encontrou, retorna como "Outro" preservando a entrada
         return {
@@ -133,7 +151,7 @@ class ValidadorGenero:
             'display': entrada_original,  # Mantém como o usuário digitou
             'categoria': 'outro',
             'entrada_original': entrada_original
-        }
+        }, False
 
     @classmethod
     def obter_opcoes_validas(cls) -> Dict[str, str]:
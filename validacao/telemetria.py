@@ -0,0 +1,151 @@
+"""
+Telemetria das regras de validação para cargas em lote.
+
+Conta, por regra, quantas vezes ela rodou, quantas linhas rejeitou (e por
+qual motivo) e o tempo acumulado, para descobrir qual regra custa mais ou
+barra mais linhas em uma importação.
+
+Os validadores com etapas internas (`validar_cpf`, `ValidadorGenero.validar`)
+aceitam uma telemetria opcional e registram cada etapa como uma regra.
+
+Uso:
+    telemetria = TelemetriaValidacao()
+    nome = telemetria.medir('nome', validar_nome, entrada)
+    cpf = validar_cpf(entrada, telemetria)
+    ...
+    print(telemetria.relatorio_texto())
+"""
+
+import time
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+def motivo_rejeicao(mensagem: str) -> str:
+    """
+    Mensagem de erro sem o valor rejeitado, para agrupar as rejeições
+
+    Ex.: 'DDD inválido: 00' -> 'DDD inválido'
+
+    """
+    motivo = mensagem.split(': ')[0]
+    if motivo.count('(') > motivo.count(')'):
+        motivo = motivo[:motivo.rfind('(')]
+    return motivo.rstrip()
+
+
+def medir(telemetria: Optional['TelemetriaValidacao'], regra: str,
+          funcao: Callable[..., T], *args: Any) -> T:
+    """Executa uma regra, com telemetria se houver (ver `TelemetriaValidacao.medir`)"""
+    if telemetria is None:
+        return funcao(*args)
+    return telemetria.medir(regra, funcao, *args)
+
+
+class TelemetriaValidacao:
+    """Contadores, motivos de rejeição e tempo acumulado por regra de validação"""
+
+    def __init__(self):
+        """Inicializa a telemetria zerada"""
+        self.chamadas: Dict[str, int] = {}
+        self.rejeicoes: Dict[str, int] = {}
+        self.tempo_ns: Dict[str, int] = {}
+        #regra -> motivo (mensagem sem o valor) -> quantidade
+        self.motivos: Dict[str, Dict[str, int]] = {}
+
+    def medir(self, regra: str, funcao: Callable[..., T], *args: Any) -> T:
+        """
+        Executa uma regra, medindo o tempo e contando a rejeição (ValueError)
+
+        Raises:
+            ValueError: A mesma levantada pela regra
+
+        """
+        inicio = time.perf_counter_ns()
+        try:
+            return funcao(*args)
+        except ValueError as e:
+            self.rejeitar(regra, str(e))
+            raise
+        finally:
+            self.registrar(regra, time.perf_counter_ns() - inicio)
+
+    def registrar(self, regra: str, nanossegundos: int) -> None:
+        """Conta uma chamada da regra com o tempo informado (para regras medidas fora de `medir`)"""
+        self.tempo_ns[regra] = self.tempo_ns.get(regra, 0) + nanossegundos
+        self.chamadas[regra] = self.chamadas.get(regra, 0) + 1
+
+    def rejeitar(self, regra: str, motivo: str) -> None:
+        """Conta uma rejeição da regra (para regras verificadas fora de `medir`)"""
+        self.rejeicoes[regra] = self.rejeicoes.get(regra, 0) + 1
+        motivo = motivo_rejeicao(motivo)
+        motivos = self.motivos.setdefault(regra, {})
+        motivos[motivo] = motivos.get(motivo, 0) + 1
+
+    def mesclar(self, outra: 'TelemetriaValidacao') -> 'TelemetriaValidacao':
+        """Soma a telemetria de outro lote a esta"""
+        for destino, origem in ((self.chamadas, outra.chamadas), (self.rejeicoes, outra.rejeicoes),
+                                (self.tempo_ns, outra.tempo_ns)):
+            for regra, valor in origem.items():
+                destino[regra] = destino.get(regra, 0) + valor
+        for regra, motivos in outra.motivos.items():
+            for motivo, quantidade in motivos.items():
+                self.motivos.setdefault(regra, {})
+                self.motivos[regra][motivo] = self.motivos[regra].get(motivo, 0) + quantidade
+        return self
+
+    def relatorio(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Resumo por regra, da mais cara para a mais barata
+
+        Returns:
+            dict: {regra: {'chamadas', 'rejeicoes', 'total_ms', 'media_us', 'motivos'}}
+
+        """
+        regras = sorted(set(self.chamadas) | set(self.rejeicoes), key=lambda regra: -self.tempo_ns.get(regra, 0))
+        relatorio = {}
+        for regra in regras:
+            chamadas = self.chamadas.get(regra, 0)
+            tempo = self.tempo_ns.get(regra, 0)
+            motivos = self.motivos.get(regra, {})
+            relatorio[regra] = {
+                'chamadas': chamadas,
+                'rejeicoes': self.rejeicoes.get(regra, 0),
+                'total_ms': round(tempo / 1e6, 3),
+                'media_us': round(tempo / chamadas / 1e3, 2) if chamadas else 0.0,
+                'motivos': dict(sorted(motivos.items(), key=lambda item: -item[1])),
+            }
+        return relatorio
+
+    def relatorio_texto(self, titulo: Optional[str] = 'TELEMETRIA DA VALIDAÇÃO') -> str:
+        """Relatório em tabela de texto (uma linha por regra e por motivo de rejeição)"""
+        linhas = [titulo, '-' * 72] if titulo else []
+        linhas.append(f"{'REGRA':<24}{'CHAMADAS':>10}{'REJEIÇÕES':>11}{'TOTAL MS':>12}{'MÉDIA µs':>11}")
+        for regra, dados in self.relatorio().items():
+            linhas.append(f"{regra:<24}{dados['chamadas']:>10,}{dados['rejeicoes']:>11,}"
+                          f"{dados['total_ms']:>12,.1f}{dados['media_us']:>11,.2f}")
+            for motivo, quantidade in dados['motivos'].items():
+                linhas.append(f'    {quantidade:>8,}  {motivo}')
+        return '\n'.join(linhas)
+
+
+if __name__ == '__main__':
+    from validacao.nome import validar_nome
+    from validacao.cpf import validar_cpf
+
+    print('TESTANDO TELEMETRIA DA VALIDAÇÃO...')
+    print('-' * 50)
+
+    telemetria = TelemetriaValidacao()
+    for nome, cpf in [('Ana Lima', '529.982.247-25'), ('joão', '111.111.111-11'),
+                      ('Bruno 2 Costa', '123.456.789-00'), ('Carla Dias', '123.456.789-09')]:
+        try:
+            telemetria.medir('nome', validar_nome, nome)
+        except ValueError:
+            pass
+        try:
+            validar_cpf(cpf, telemetria)
+        except ValueError:
+            pass
+    print(telemetria.relatorio_texto())